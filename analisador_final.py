@@ -1,12 +1,17 @@
 import numpy as np
 import pickle
-import matplotlib.pyplot as plt
+import json
 import os
 import sys
+from checkpoint import carregar_checkpoint, ler_cabecalho
+from renderizacao import salvar_imagem, salvar_niveis_zoom, LIMITE_MATPLOTLIB
+from estatisticas import ler_estatisticas, arquivo_atividade
 
 # --- CONFIGURAÇÃO ---
-GRID_FILE = "grade_distribuida_final.pickle" 
+GRID_FILE = "grade_distribuida_final.ckpt" 
 TEMPOS_FILE = "tempos_comparacao.txt"
+BENCHMARK_FILE = "resultados_benchmark.json" # Gerado por 'benchmark.py'
+ESTATISTICAS_MODOS = ["sequencial", "paralelo", "processos", "distribuida"] # 'estatisticas_<modo>.csv' ou '.bin'
 
 # --- FUNÇÕES AUXILIARES ---
 
@@ -48,8 +53,11 @@ def carregar_tempos(nome_arquivo):
 
 
 def carregar_grade(nome_arquivo):
-    """Carrega a grade final da simulação distribuída."""
+    """Carrega a grade final da simulação distribuída (.ckpt, ou .pickle de versões antigas)."""
     try:
+        if nome_arquivo.endswith('.ckpt'):
+            grade, _ = carregar_checkpoint(nome_arquivo)
+            return grade
         with open(nome_arquivo, 'rb') as f:
             grade = pickle.load(f)
         return grade
@@ -57,13 +65,17 @@ def carregar_grade(nome_arquivo):
         print(f"❌ ERRO: Arquivo '{nome_arquivo}' (grade distribuída final) não encontrado. Rode o Servidor.")
         return None
     except Exception as e:
-        print(f"❌ ERRO ao carregar grade pickle: {e}")
+        print(f"❌ ERRO ao carregar a grade: {e}")
         return None
 
 def gerar_imagem_grade(grade, titulo, nome_arquivo):
     """Gera e salva uma imagem PNG da grade."""
     if grade is None:
         return
+    if grade.size > LIMITE_MATPLOTLIB:
+        salvar_imagem(grade, nome_arquivo)
+        return
+    import matplotlib.pyplot as plt # Carregado só quando há gráfico a gerar
         
     plt.figure(figsize=(10, 10))
     plt.imshow(grade, cmap='binary') 
@@ -85,7 +97,7 @@ def gerar_grafico_comparacao(tempos):
     valores = []
     
     # Ordem de exibição no gráfico
-    chaves_ordenadas = ['Sequencial', 'Paralela (Threads)', 'Distribuida (1:1 Socket)']
+    chaves_ordenadas = ['Sequencial', 'Paralela (Threads)', 'Paralela (Processos)', 'Distribuida (1:1 Socket)', 'Distribuida (Faixas + Halo)', 'Distribuida (Async)']
     
     for chave in chaves_ordenadas:
         if chave in tempos:
@@ -96,8 +108,9 @@ def gerar_grafico_comparacao(tempos):
          print("❌ Pelo menos dois resultados de tempo são necessários para o gráfico de comparação.")
          return
 
+    import matplotlib.pyplot as plt # Carregado só quando há gráfico a gerar
     plt.figure(figsize=(12, 6))
-    bars = plt.bar(labels, valores, color=['blue', 'green', 'orange'])
+    bars = plt.bar(labels, valores, color=['blue', 'green', 'purple', 'orange', 'red', 'brown'][:len(valores)])
     
     plt.ylabel('Tempo de Execução (segundos)')
     plt.title('Comparação de Desempenho (Tempo Total)')
@@ -114,22 +127,171 @@ def gerar_grafico_comparacao(tempos):
     print(f"GRÁFICO SALVO: Verifique o arquivo '{nome_arquivo_grafico}'.")
 
 
+def carregar_benchmark(nome_arquivo):
+    """Carrega os resultados estruturados do 'benchmark.py'. Retorna None se não existir."""
+    try:
+        with open(nome_arquivo, 'r') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        print(f"❌ ERRO ao carregar o benchmark: {e}")
+        return None
+
+
+def gerar_graficos_escalabilidade(benchmark):
+    """
+    Gera as curvas do benchmark: speedup e eficiência por número de trabalhadores
+    (uma curva por motor e tamanho) e vazão (células/s) por tamanho de grade.
+    """
+    resultados = benchmark['resultados']
+    if not resultados:
+        print("❌ O arquivo de benchmark não tem resultados.")
+        return
+
+    # Agrupa os pontos em curvas: (motor, tamanho, gerações) -> lista de resultados
+    curvas = {}
+    for r in resultados:
+        curvas.setdefault((r['motor'], r['tamanho'], r['geracoes']), []).append(r)
+
+    import matplotlib.pyplot as plt # Carregado só quando há gráfico a gerar
+    fig, (eixo_speedup, eixo_eficiencia, eixo_vazao) = plt.subplots(1, 3, figsize=(18, 6))
+
+    for (motor, tamanho, geracoes), pontos in sorted(curvas.items()):
+        pontos = sorted(pontos, key=lambda r: r['trabalhadores'])
+        if len(pontos) < 2 or pontos[0]['speedup'] is None:
+            continue
+        x = [r['trabalhadores'] for r in pontos]
+        rotulo = f"{motor} {tamanho}x{tamanho}"
+        eixo_speedup.plot(x, [r['speedup'] for r in pontos], marker='o', label=rotulo)
+        eixo_eficiencia.plot(x, [r['eficiencia'] for r in pontos], marker='o', label=rotulo)
+
+    # Speedup ideal (linear) como referência
+    max_trabalhadores = max(r['trabalhadores'] for r in resultados)
+    eixo_speedup.plot([1, max_trabalhadores], [1, max_trabalhadores], 'k--', alpha=0.5, label='ideal')
+    eixo_speedup.set_xlabel('Trabalhadores')
+    eixo_speedup.set_ylabel(f"Speedup (vs. {benchmark['metadados'].get('motor_base', 'base')})")
+    eixo_speedup.set_title('Speedup')
+    eixo_eficiencia.set_xlabel('Trabalhadores')
+    eixo_eficiencia.set_ylabel('Eficiência (speedup / trabalhadores)')
+    eixo_eficiencia.set_title('Eficiência')
+
+    # Vazão por tamanho: melhor número de trabalhadores de cada motor
+    por_motor = {}
+    for r in resultados:
+        melhor = por_motor.setdefault(r['motor'], {})
+        if r['tamanho'] not in melhor or r['celulas_por_s'] > melhor[r['tamanho']]:
+            melhor[r['tamanho']] = r['celulas_por_s']
+    for motor, vazao in sorted(por_motor.items()):
+        tamanhos = sorted(vazao)
+        eixo_vazao.plot(tamanhos, [vazao[t] for t in tamanhos], marker='o', label=motor)
+    eixo_vazao.set_xscale('log')
+    eixo_vazao.set_yscale('log')
+    eixo_vazao.set_xlabel('Tamanho da grade (lado)')
+    eixo_vazao.set_ylabel('Células por segundo (mediana)')
+    eixo_vazao.set_title('Vazão')
+
+    for eixo in (eixo_speedup, eixo_eficiencia, eixo_vazao):
+        eixo.grid(linestyle='--', alpha=0.7)
+        eixo.legend(fontsize='small')
+
+    nome_arquivo_grafico = 'comparacao_desempenho.png'
+    fig.tight_layout()
+    fig.savefig(nome_arquivo_grafico)
+    plt.close(fig)
+    print(f"GRÁFICO SALVO: Verifique o arquivo '{nome_arquivo_grafico}'.")
+
+
+def encontrar_estatisticas():
+    """Séries de estatísticas presentes no diretório: lista de (modo, nome do arquivo)."""
+    encontradas = []
+    for modo in ESTATISTICAS_MODOS:
+        for extensao in (".csv", ".bin"):
+            nome_arquivo = f"estatisticas_{modo}{extensao}"
+            if os.path.exists(nome_arquivo):
+                encontradas.append((modo, nome_arquivo))
+    return encontradas
+
+
+def gerar_graficos_estatisticas(modo, nome_arquivo):
+    """
+    Gera as curvas da série de estatísticas (população, nascimentos/mortes e blocos
+    ativos por geração) e, se existir, o mapa de atividade acumulada por bloco.
+    """
+    try:
+        serie = ler_estatisticas(nome_arquivo)
+    except Exception as e:
+        print(f"❌ ERRO ao carregar '{nome_arquivo}': {e}")
+        return
+    if len(serie['geracao']) == 0:
+        print(f"❌ A série '{nome_arquivo}' está vazia.")
+        return
+
+    nome_mapa = arquivo_atividade(nome_arquivo)
+    atividade = np.load(nome_mapa) if os.path.exists(nome_mapa) else None
+
+    import matplotlib.pyplot as plt # Carregado só quando há gráfico a gerar
+    num_eixos = 4 if atividade is not None else 3
+    fig, eixos = plt.subplots(1, num_eixos, figsize=(6 * num_eixos, 5))
+    geracoes = serie['geracao']
+
+    eixos[0].plot(geracoes, serie['populacao'], color='black')
+    eixos[0].set_title('População')
+    eixos[1].plot(geracoes, serie['nascimentos'], label='nascimentos', color='tab:green')
+    eixos[1].plot(geracoes, serie['mortes'], label='mortes', color='tab:red')
+    eixos[1].set_title('Nascimentos e mortes')
+    eixos[1].legend(fontsize='small')
+    eixos[2].plot(geracoes, serie['blocos_ativos'], color='tab:blue')
+    eixos[2].set_title('Blocos com alguma mudança')
+    for eixo in eixos[:3]:
+        eixo.set_xlabel('Geração')
+        eixo.grid(linestyle='--', alpha=0.7)
+
+    if atividade is not None:
+        imagem = eixos[3].imshow(atividade, cmap='inferno', interpolation='nearest')
+        eixos[3].set_title('Mudanças acumuladas por bloco')
+        eixos[3].axis('off')
+        fig.colorbar(imagem, ax=eixos[3], fraction=0.046)
+
+    nome_arquivo_grafico = f'estatisticas_{modo}.png'
+    fig.suptitle(f'Estatísticas por geração - {modo.capitalize()}')
+    fig.tight_layout()
+    fig.savefig(nome_arquivo_grafico)
+    plt.close(fig)
+    print(f"GRÁFICO SALVO: Verifique o arquivo '{nome_arquivo_grafico}'.")
+
+
 # --- FUNÇÃO PRINCIPAL ---
-if __name__ == "__main__":
+def executar_analise():
+    """Carrega os tempos (ou o benchmark) e a grade final e gera as imagens e gráficos."""
     
-    # 1. Carregar Tempos
-    tempos = carregar_tempos(TEMPOS_FILE)
-    if tempos is None:
-        sys.exit(1)
+    # 1. Carregar Tempos: o benchmark estruturado tem prioridade sobre o arquivo de texto
+    benchmark = carregar_benchmark(BENCHMARK_FILE)
+    tempos = None
+    if benchmark is None:
+        tempos = carregar_tempos(TEMPOS_FILE)
+        if tempos is None:
+            return 1
 
-    print("\n--- Resultados de Tempo Carregados ---")
-    for alg, tempo in tempos.items():
-         print(f"Tempo de execucao {alg}: {tempo:.4f} segundos")
-    print("--------------------------------------\n")
+        print("\n--- Resultados de Tempo Carregados ---")
+        for alg, tempo in tempos.items():
+             print(f"Tempo de execucao {alg}: {tempo:.4f} segundos")
+        print("--------------------------------------\n")
 
 
     # 2. Carregar e Visualizar Grade Distribuída Final
-    grade_distribuida = carregar_grade(GRID_FILE)
+    if GRID_FILE.endswith('.ckpt') and os.path.exists(GRID_FILE):
+        cabecalho = ler_cabecalho(GRID_FILE)
+        grande = cabecalho['linhas'] * cabecalho['colunas'] > LIMITE_MATPLOTLIB
+    else:
+        grande = False
+    if grande:
+        # Renderiza direto do arquivo (memmap, por faixas), sem carregar a grade inteira
+        salvar_imagem(GRID_FILE, 'estado_final_jogo_da_vida_distribuida.png')
+        salvar_niveis_zoom(GRID_FILE, 'estado_final_jogo_da_vida_distribuida')
+        grade_distribuida = None
+    else:
+        grade_distribuida = carregar_grade(GRID_FILE)
     if grade_distribuida is not None:
         gerar_imagem_grade(
             grade_distribuida, 
@@ -137,7 +299,19 @@ if __name__ == "__main__":
             'estado_final_jogo_da_vida_distribuida.png'
         )
 
-    # 3. Gerar Gráfico de Comparação
-    gerar_grafico_comparacao(tempos)
+    # 3. Gerar Gráficos de Comparação
+    if benchmark is not None:
+        gerar_graficos_escalabilidade(benchmark)
+    else:
+        gerar_grafico_comparacao(tempos)
+
+    # 4. Gráficos das Estatísticas por Geração (se alguma simulação as gravou)
+    for modo, nome_arquivo in encontrar_estatisticas():
+        gerar_graficos_estatisticas(modo, nome_arquivo)
 
     print("\n[FIM] Análise concluída.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(executar_analise())
@@ -0,0 +1,203 @@
+import json
+import math
+import os
+import platform
+import time
+import numpy as np
+from motores import MOTORES, MOTORES_COM_REGRA, obter_motor
+from regras import REGRA_PADRAO, normalizar_regra, eh_regra_padrao
+
+
+# --- AUTOAJUSTE: MOTOR, BLOCO E TRABALHADORES POR TAMANHO DE GRADE ---
+# Qual configuração é a mais rápida depende da máquina (núcleos, caches) e do tamanho
+# da grade: em 100² as threads perdem para o sequencial, em 4000² o motor em blocos
+# ganha do vetorizado, e assim por diante. Em vez de adivinhar, o autoajuste roda
+# sondas curtas de cada candidato NESTA máquina, numa sopa aleatória como a de
+# 'inicializar_grade', e guarda o vencedor em ARQUIVO_PERFIL:
+#   - uma entrada por faixa de tamanho (potência de 2 acima do lado) e por regra;
+#   - o perfil guarda a máquina em que foi medido e é refeito se ela mudar.
+# Candidatos: cada motor de motores.py (o "blocos"/"tabela" com vários lados de bloco),
+# e, com mais de um núcleo, threads (roubo ou faixas) e processos com 2, 4, ... núcleos.
+# As sondas medem só o tempo por geração: a criação dos pools fica de fora.
+
+ARQUIVO_PERFIL = "perfil_autoajuste.json"
+TAMANHOS_BLOCO_SONDA = [128, 256, 512]  # Lados de bloco testados nos motores "blocos" e "tabela"
+CELULAS_SONDA = 2 * 10**7     # Células-geração por medição (gerações = isso / lado², entre os limites abaixo)
+GERACOES_SONDA_MIN = 2
+GERACOES_SONDA_MAX = 50
+REPETICOES_SONDA = 3          # Medições por candidato (vale a mediana)
+LADO_MAXIMO_SONDA = 4096      # Grades maiores são sondadas com este lado (o regime de cache já é o mesmo)
+LADO_MINIMO_FAIXA = 64        # Menor faixa de tamanho do perfil
+SEMENTE_SONDA = 2024
+
+
+# FUNÇÃO 1: FAIXAS E CHAVES DO PERFIL
+def faixa_de_tamanho(tamanho):
+    """Lado que representa a faixa do tamanho: a potência de 2 >= tamanho (mínimo LADO_MINIMO_FAIXA)."""
+    return max(LADO_MINIMO_FAIXA, 2 ** math.ceil(math.log2(max(tamanho, 1))))
+
+
+def chave_perfil(tamanho, regra):
+    return f"{normalizar_regra(regra)} ate {faixa_de_tamanho(tamanho)}"
+
+
+def descrever_maquina(num_cpus=None):
+    """O que invalida o perfil se mudar: núcleos, processador/sistema e versões de Python e NumPy."""
+    return {
+        'cpus': num_cpus or os.cpu_count() or 1,
+        'processador': platform.processor() or platform.machine(),
+        'plataforma': platform.platform(),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+    }
+
+
+def descrever_configuracao(configuracao):
+    """Texto curto da configuração, para as mensagens."""
+    modo = configuracao['modo']
+    if modo == "sequencial":
+        bloco = configuracao.get('tamanho_bloco')
+        return f"sequencial, motor {configuracao['motor']}" + (f" (bloco {bloco})" if bloco else "")
+    if modo == "threads":
+        return (f"{configuracao['trabalhadores']} threads, motor {configuracao['motor']}, "
+                f"escalonamento {configuracao['escalonamento']}")
+    return f"{configuracao['trabalhadores']} processos"
+
+
+# FUNÇÃO 2: CANDIDATOS
+def listar_candidatos(regra=REGRA_PADRAO, num_cpus=None):
+    """Todas as configurações que valem a pena sondar para a regra nesta máquina."""
+    num_cpus = num_cpus or os.cpu_count() or 1
+    padrao = eh_regra_padrao(regra)
+    motor_paralelo = "vetorizado" if padrao else "tabela"
+    candidatos = []
+    for motor in MOTORES:
+        if motor in ("blocos", "tabela"):
+            if motor == "blocos" and not padrao:
+                continue
+            candidatos += [{'modo': "sequencial", 'motor': motor, 'tamanho_bloco': t} for t in TAMANHOS_BLOCO_SONDA]
+        elif padrao or motor in MOTORES_COM_REGRA:
+            candidatos.append({'modo': "sequencial", 'motor': motor, 'tamanho_bloco': None})
+
+    # Num núcleo só, threads e processos só somam custo de sincronização
+    trabalhadores = sorted({2 ** k for k in range(1, int(math.log2(num_cpus)) + 1)} | {num_cpus}) if num_cpus > 1 else []
+    for n in trabalhadores:
+        for escalonamento in ("roubo", "faixas"):
+            candidatos.append({'modo': "threads", 'motor': motor_paralelo, 'trabalhadores': n,
+                               'escalonamento': escalonamento})
+        candidatos.append({'modo': "processos", 'trabalhadores': n})
+    return candidatos
+
+
+# FUNÇÃO 3: SONDAS
+def _executar_sonda(configuracao, grade, num_geracoes, regra):
+    """Roda 'num_geracoes' com a configuração e devolve o tempo do laço de gerações."""
+    modo = configuracao['modo']
+    if modo == "sequencial":
+        calcular_geracao = obter_motor(configuracao['motor'], regra, configuracao['tamanho_bloco'])
+        grade_atual = calcular_geracao(grade, grade.shape[0]) # Aquece (e prepara os buffers do motor)
+        inicio = time.perf_counter()
+        for _ in range(num_geracoes):
+            grade_atual = calcular_geracao(grade_atual, grade.shape[0])
+        return time.perf_counter() - inicio
+
+    if modo == "threads":
+        from jogo_da_vida_paralelo import PoolThreads
+        pool = PoolThreads(grade, configuracao['trabalhadores'], configuracao['motor'],
+                           escalonamento=configuracao['escalonamento'], regra=regra)
+    else:
+        from jogo_da_vida_processos import PoolProcessos
+        pool = PoolProcessos(grade, configuracao['trabalhadores'], regra)
+    with pool:
+        pool.passo()
+        inicio = time.perf_counter()
+        for _ in range(num_geracoes):
+            pool.passo()
+        return time.perf_counter() - inicio
+
+
+def sondar(configuracao, lado, regra=REGRA_PADRAO, repeticoes=REPETICOES_SONDA):
+    """Mediana de ns por célula da configuração numa sopa aleatória de lado x lado."""
+    grade = np.random.default_rng(SEMENTE_SONDA).integers(0, 2, size=(lado, lado), dtype=np.int8)
+    num_geracoes = min(GERACOES_SONDA_MAX, max(GERACOES_SONDA_MIN, CELULAS_SONDA // (lado * lado)))
+    tempos = [_executar_sonda(configuracao, grade, num_geracoes, regra) for _ in range(repeticoes)]
+    return float(np.median(tempos)) / (lado * lado * num_geracoes) * 1e9
+
+
+def calibrar(tamanho, regra=REGRA_PADRAO, num_cpus=None):
+    """Sonda todos os candidatos e devolve o mais rápido (com as medições de todos)."""
+    lado = min(faixa_de_tamanho(tamanho), LADO_MAXIMO_SONDA)
+    candidatos = listar_candidatos(regra, num_cpus)
+    print(f"--- Autoajuste: {len(candidatos)} candidatos numa sopa {lado}x{lado}, regra {normalizar_regra(regra)} ---")
+    medicoes = []
+    for configuracao in candidatos:
+        ns_por_celula = sondar(configuracao, lado, regra)
+        medicoes.append({**configuracao, 'ns_por_celula': ns_por_celula})
+        print(f"{descrever_configuracao(configuracao):>50} | {ns_por_celula:.2f} ns/célula")
+    melhor = min(medicoes, key=lambda m: m['ns_por_celula'])
+    return {**melhor, 'lado_sonda': lado, 'medicoes': medicoes}
+
+
+# FUNÇÃO 4: PERFIL EM DISCO
+def carregar_perfil(arquivo=ARQUIVO_PERFIL, num_cpus=None):
+    """Lê o perfil; um perfil de outra máquina (ou ilegível) volta vazio."""
+    vazio = {'maquina': descrever_maquina(num_cpus), 'configuracoes': {}}
+    try:
+        with open(arquivo) as f:
+            perfil = json.load(f)
+    except (OSError, ValueError):
+        return vazio
+    if perfil.get('maquina') != vazio['maquina']:
+        print(f"⚠️ Perfil '{arquivo}' medido em outra máquina: será refeito.")
+        return vazio
+    return perfil
+
+
+def salvar_perfil(perfil, arquivo=ARQUIVO_PERFIL):
+    temporario = arquivo + ".tmp"
+    with open(temporario, 'w') as f:
+        json.dump(perfil, f, indent=2)
+    os.replace(temporario, arquivo)
+
+
+def _entrada_do_perfil(tamanho, regra, recalibrar, arquivo, num_cpus):
+    """Entrada do perfil da faixa (calibrada e gravada agora se ainda não existir) e a sua chave."""
+    perfil = carregar_perfil(arquivo, num_cpus)
+    chave = chave_perfil(tamanho, regra)
+    entrada = perfil['configuracoes'].get(chave)
+    if entrada is None or recalibrar:
+        entrada = calibrar(tamanho, regra, num_cpus)
+        perfil['configuracoes'][chave] = entrada
+        salvar_perfil(perfil, arquivo)
+        print(f"✅ Perfil '{chave}' salvo em '{arquivo}'")
+    return entrada, chave
+
+
+def obter_configuracao(tamanho, regra=REGRA_PADRAO, recalibrar=False, arquivo=ARQUIVO_PERFIL, num_cpus=None):
+    """
+    Configuração mais rápida para a grade 'tamanho' x 'tamanho' e a regra: a do perfil,
+    ou calibrada agora (e gravada no perfil) se a faixa ainda não foi medida.
+    """
+    configuracao, chave = _entrada_do_perfil(tamanho, regra, recalibrar, arquivo, num_cpus)
+    print(f"[AUTOAJUSTE] {chave}: {descrever_configuracao(configuracao)} ({configuracao['ns_por_celula']:.2f} ns/célula)")
+    return configuracao
+
+
+def consultar_perfil(tamanho, regra=REGRA_PADRAO, arquivo=ARQUIVO_PERFIL, num_cpus=None):
+    """Entrada já medida da faixa, sem rodar sondas: None se não há perfil (desta máquina) ou a faixa falta."""
+    if not os.path.exists(arquivo):
+        return None
+    return carregar_perfil(arquivo, num_cpus)['configuracoes'].get(chave_perfil(tamanho, regra))
+
+
+def melhor_do_modo(entrada, modo):
+    """Medição mais rápida do 'modo' ("sequencial", "threads" ou "processos") na entrada do perfil, ou None."""
+    return min((m for m in entrada['medicoes'] if m['modo'] == modo), key=lambda m: m['ns_por_celula'], default=None)
+
+
+def melhor_sequencial(tamanho, regra=REGRA_PADRAO, recalibrar=False, arquivo=ARQUIVO_PERFIL, num_cpus=None):
+    """(motor, tamanho_bloco) sequencial mais rápido da faixa, entre as medições do perfil."""
+    entrada, chave = _entrada_do_perfil(tamanho, regra, recalibrar, arquivo, num_cpus)
+    melhor = melhor_do_modo(entrada, "sequencial")
+    print(f"[AUTOAJUSTE] {chave}: {descrever_configuracao(melhor)} ({melhor['ns_por_celula']:.2f} ns/célula)")
+    return melhor['motor'], melhor['tamanho_bloco']
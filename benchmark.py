@@ -0,0 +1,289 @@
+import numpy as np
+import time
+import json
+import csv
+import os
+import sys
+import platform
+from datetime import datetime
+from motores import obter_motor
+
+# --- PARÂMETROS DO BENCHMARK ---
+# Matriz de varredura: motor x tamanho da grade x gerações x número de trabalhadores.
+# A matriz roda sopas densas (~50% vivas); o "esparso", cujo custo segue a população,
+# fica de fora e é medido no cenário esparso abaixo.
+MOTORES_BENCH = ["vetorizado", "empacotado", "ativo", "blocos", "tabela", "threads", "processos"]
+TAMANHOS = [100, 500, 2000]
+GERACOES = [200]
+TRABALHADORES = [1, 2, 4, 8]  # Só faz diferença para "threads" e "processos"
+REPETICOES = 5                # Medições por ponto da matriz
+AQUECIMENTO = 1               # Execuções descartadas antes de medir
+SEMENTE = 2024                # Mesma grade inicial para todos os motores
+MOTOR_BASE = "vetorizado"     # Referência (1 trabalhador) para speedup e eficiência
+
+ARQUIVO_JSON = "resultados_benchmark.json"
+ARQUIVO_CSV = "resultados_benchmark.csv"
+
+# Varredura do lado do bloco do motor "blocos" (python benchmark.py blocos): com o bloco
+# certo, o tempo por célula fica plano mesmo quando a grade já não cabe na cache.
+TAMANHOS_BLOCO = [64, 128, 256, 512, 1024]
+TAMANHOS_VARREDURA_BLOCO = [500, 2000, 4000, 8000]
+CELULAS_VARREDURA_BLOCO = 4 * 10**8 # Células-geração por medição (gerações = isso / tamanho²)
+ARQUIVO_BLOCOS_CSV = "resultados_blocos.csv"
+
+# Cenário esparso (python benchmark.py esparso): "esparso" (só as chaves vivas) contra o
+# "vetorizado" (grade densa) num campo de planadores, o regime para o qual o esparso existe.
+TAMANHOS_ESPARSO = [1000, 4000, 8000]
+GERACOES_ESPARSO = 50
+ESPACAMENTO_PLANADORES = 50 # Um planador a cada 50x50 células (0,2% vivas)
+ARQUIVO_ESPARSO_CSV = "resultados_esparso.csv"
+
+MOTORES_PARALELOS = ("threads", "processos")
+
+
+# FUNÇÃO 1: GRADE INICIAL REPRODUTÍVEL
+def grade_reprodutivel(tamanho, semente=SEMENTE):
+    """Grade aleatória determinística: a mesma semente gera a mesma grade em todo motor."""
+    rng = np.random.default_rng(semente + tamanho)
+    return rng.integers(0, 2, size=(tamanho, tamanho), dtype=np.int8)
+
+
+def campo_de_planadores(tamanho, espacamento=ESPACAMENTO_PLANADORES):
+    """Grade esparsa e determinística: um planador (rumo sudeste) a cada 'espacamento' células."""
+    grade = np.zeros((tamanho, tamanho), dtype=np.int8)
+    for i, j in ((0, 1), (1, 2), (2, 0), (2, 1), (2, 2)):
+        grade[1 + i:tamanho - 3 + i:espacamento, 1 + j:tamanho - 3 + j:espacamento] = 1
+    return grade
+
+
+# FUNÇÃO 2: UMA EXECUÇÃO MEDIDA
+def executar_uma_vez(motor, grade, num_geracoes, num_trabalhadores):
+    """
+    Roda a simulação e devolve (tempo_preparo, tempo_geracoes, grade_final).
+    Só o laço de gerações entra no tempo principal: a criação da grade fica de fora
+    e a criação de pools (threads/processos) é medida à parte.
+    """
+    tamanho = grade.shape[0]
+    inicio = time.perf_counter()
+
+    if motor in MOTORES_PARALELOS:
+        if motor == "threads":
+            from jogo_da_vida_paralelo import PoolThreads as Pool
+        else:
+            from jogo_da_vida_processos import PoolProcessos as Pool
+        with Pool(grade, num_trabalhadores) as pool:
+            preparado = time.perf_counter()
+            for _ in range(num_geracoes):
+                pool.passo()
+            fim = time.perf_counter()
+            grade_final = pool.grade.copy()
+    else:
+        calcular_geracao = obter_motor(motor)
+        grade_atual = grade.copy()
+        preparado = time.perf_counter()
+        for _ in range(num_geracoes):
+            grade_atual = calcular_geracao(grade_atual, tamanho)
+        fim = time.perf_counter()
+        grade_final = grade_atual
+
+    return preparado - inicio, fim - preparado, grade_final
+
+
+# FUNÇÃO 3: UM PONTO DA MATRIZ (aquecimento + repetições)
+def medir(motor, tamanho, num_geracoes, num_trabalhadores, repeticoes=REPETICOES, aquecimento=AQUECIMENTO):
+    """Mede um ponto da matriz e devolve um dicionário com as estatísticas."""
+    grade = grade_reprodutivel(tamanho)
+    for _ in range(aquecimento):
+        executar_uma_vez(motor, grade, num_geracoes, num_trabalhadores)
+
+    tempos = []
+    preparos = []
+    for _ in range(repeticoes):
+        preparo, tempo, grade_final = executar_uma_vez(motor, grade, num_geracoes, num_trabalhadores)
+        tempos.append(tempo)
+        preparos.append(preparo)
+
+    mediana = float(np.median(tempos))
+    return {
+        'motor': motor,
+        'tamanho': tamanho,
+        'geracoes': num_geracoes,
+        'trabalhadores': num_trabalhadores,
+        'repeticoes': repeticoes,
+        'tempos_s': tempos,
+        'mediana_s': mediana,
+        'p95_s': float(np.percentile(tempos, 95)),
+        'preparo_mediana_s': float(np.median(preparos)),
+        'celulas_por_s': tamanho * tamanho * num_geracoes / mediana if mediana > 0 else float('inf'),
+        'populacao_final': int(grade_final.sum()), # Confere que todos os motores chegam ao mesmo estado
+    }
+
+
+# FUNÇÃO 4: SPEEDUP E EFICIÊNCIA
+def calcular_speedup(resultados, motor_base=MOTOR_BASE):
+    """
+    Acrescenta 'speedup' (T_base / T) e 'eficiencia' (speedup / trabalhadores) a cada
+    resultado, comparando com o motor base (1 trabalhador) no mesmo tamanho e gerações.
+    """
+    base = {
+        (r['tamanho'], r['geracoes']): r['mediana_s']
+        for r in resultados if r['motor'] == motor_base and r['trabalhadores'] == 1
+    }
+    for r in resultados:
+        t_base = base.get((r['tamanho'], r['geracoes']))
+        if t_base is None or r['mediana_s'] <= 0:
+            r['speedup'] = None
+            r['eficiencia'] = None
+        else:
+            r['speedup'] = t_base / r['mediana_s']
+            r['eficiencia'] = r['speedup'] / r['trabalhadores']
+    return resultados
+
+
+# FUNÇÃO 5: SALVAR EM JSON E CSV
+def salvar_resultados(resultados, arquivo_json=ARQUIVO_JSON, arquivo_csv=ARQUIVO_CSV):
+    """Grava os resultados (com metadados da máquina) em JSON e uma linha por ponto em CSV."""
+    metadados = {
+        'data': datetime.now().isoformat(timespec='seconds'),
+        'python': sys.version.split()[0],
+        'numpy': np.__version__,
+        'plataforma': platform.platform(),
+        'cpus': os.cpu_count(),
+        'semente': SEMENTE,
+        'aquecimento': AQUECIMENTO,
+        'motor_base': MOTOR_BASE,
+    }
+    with open(arquivo_json, 'w') as f:
+        json.dump({'metadados': metadados, 'resultados': resultados}, f, indent=2)
+
+    colunas = ['motor', 'tamanho', 'geracoes', 'trabalhadores', 'repeticoes', 'mediana_s', 'p95_s',
+               'preparo_mediana_s', 'celulas_por_s', 'speedup', 'eficiencia', 'populacao_final']
+    with open(arquivo_csv, 'w', newline='') as f:
+        escritor = csv.DictWriter(f, fieldnames=colunas, extrasaction='ignore')
+        escritor.writeheader()
+        escritor.writerows(resultados)
+    print(f"✅ Resultados salvos em '{arquivo_json}' e '{arquivo_csv}'")
+
+
+# FUNÇÃO 6: VARREDURA COMPLETA
+def executar_benchmark(motores=MOTORES_BENCH, tamanhos=TAMANHOS, geracoes=GERACOES, trabalhadores=TRABALHADORES):
+    """Percorre a matriz inteira, imprime um resumo e salva os resultados."""
+    resultados = []
+    for tamanho in tamanhos:
+        for num_geracoes in geracoes:
+            for motor in motores:
+                lista_trabalhadores = trabalhadores if motor in MOTORES_PARALELOS else [1]
+                for num_trabalhadores in lista_trabalhadores:
+                    r = medir(motor, tamanho, num_geracoes, num_trabalhadores)
+                    resultados.append(r)
+                    print(f"{motor:>11} {tamanho:>6}x{tamanho:<6} {num_geracoes:>5} ger. {num_trabalhadores:>2} trab. "
+                          f"| mediana {r['mediana_s']:.4f}s  p95 {r['p95_s']:.4f}s  {r['celulas_por_s']:.3e} células/s")
+
+    calcular_speedup(resultados)
+    salvar_resultados(resultados)
+    return resultados
+
+
+# FUNÇÃO 7: VARREDURA DO TAMANHO DE BLOCO
+def varrer_tamanho_bloco(tamanhos=TAMANHOS_VARREDURA_BLOCO, tamanhos_bloco=TAMANHOS_BLOCO,
+                         repeticoes=REPETICOES, arquivo_csv=ARQUIVO_BLOCOS_CSV):
+    """
+    Mede ns por célula do motor "blocos" para cada lado de bloco e tamanho de grade,
+    com o "vetorizado" (grade inteira por operação) como referência.
+    """
+    from motor_blocos import MotorBlocos
+    from motor_vetorizado import proxima_geracao_vetorizada
+
+    resultados = []
+    for tamanho in tamanhos:
+        grade = grade_reprodutivel(tamanho)
+        num_geracoes = max(3, CELULAS_VARREDURA_BLOCO // (tamanho * tamanho))
+        candidatos = [("vetorizado", None, proxima_geracao_vetorizada)]
+        candidatos += [("blocos", t, MotorBlocos(t)) for t in tamanhos_bloco]
+        for motor, tamanho_bloco, calcular_geracao in candidatos:
+            tempos = []
+            for _ in range(AQUECIMENTO + repeticoes):
+                grade_atual = calcular_geracao(grade, tamanho) # Aquece (e prepara os buffers do motor)
+                inicio = time.perf_counter()
+                for _ in range(num_geracoes):
+                    grade_atual = calcular_geracao(grade_atual, tamanho)
+                tempos.append(time.perf_counter() - inicio)
+            mediana = float(np.median(tempos[AQUECIMENTO:]))
+            r = {
+                'motor': motor,
+                'tamanho_bloco': tamanho_bloco,
+                'tamanho': tamanho,
+                'geracoes': num_geracoes,
+                'mediana_s': mediana,
+                'ns_por_celula': mediana / (tamanho * tamanho * num_geracoes) * 1e9,
+            }
+            resultados.append(r)
+            rotulo = f"bloco {tamanho_bloco}" if tamanho_bloco else "grade inteira"
+            print(f"{motor:>11} {rotulo:>13} {tamanho:>6}x{tamanho:<6} | {r['ns_por_celula']:.2f} ns/célula")
+
+    with open(arquivo_csv, 'w', newline='') as f:
+        escritor = csv.DictWriter(f, fieldnames=list(resultados[0]))
+        escritor.writeheader()
+        escritor.writerows(resultados)
+    print(f"✅ Varredura de blocos salva em '{arquivo_csv}'")
+    return resultados
+
+
+# FUNÇÃO 8: CENÁRIO ESPARSO
+def varrer_esparso(tamanhos=TAMANHOS_ESPARSO, num_geracoes=GERACOES_ESPARSO, repeticoes=REPETICOES,
+                   arquivo_csv=ARQUIVO_ESPARSO_CSV):
+    """
+    Mede o "esparso" (simular_esparso sobre as chaves vivas, com as conversões de ida e volta)
+    e o "vetorizado" no mesmo campo de planadores de cada tamanho.
+    """
+    from motor_esparso import grade_para_chaves, chaves_para_grade, simular_esparso
+
+    def rodar_vetorizado(grade):
+        calcular_geracao = obter_motor("vetorizado")
+        for _ in range(num_geracoes):
+            grade = calcular_geracao(grade, grade.shape[0])
+        return grade
+
+    def rodar_esparso(grade):
+        linhas, colunas = grade.shape
+        return chaves_para_grade(simular_esparso(grade_para_chaves(grade), linhas, colunas, num_geracoes),
+                                 linhas, colunas)
+
+    resultados = []
+    for tamanho in tamanhos:
+        grade = campo_de_planadores(tamanho)
+        for motor, rodar in (("vetorizado", rodar_vetorizado), ("esparso", rodar_esparso)):
+            tempos = []
+            for _ in range(AQUECIMENTO + repeticoes):
+                inicio = time.perf_counter()
+                grade_final = rodar(grade)
+                tempos.append(time.perf_counter() - inicio)
+            mediana = float(np.median(tempos[AQUECIMENTO:]))
+            r = {
+                'motor': motor,
+                'tamanho': tamanho,
+                'geracoes': num_geracoes,
+                'populacao_inicial': int(grade.sum()),
+                'mediana_s': mediana,
+                'celulas_por_s': tamanho * tamanho * num_geracoes / mediana if mediana > 0 else float('inf'),
+                'populacao_final': int(grade_final.sum()), # Os dois motores têm de chegar ao mesmo estado
+            }
+            resultados.append(r)
+            print(f"{motor:>11} {tamanho:>6}x{tamanho:<6} {r['populacao_inicial']:>8} vivas "
+                  f"| mediana {mediana:.4f}s  {r['celulas_por_s']:.3e} células/s")
+
+    with open(arquivo_csv, 'w', newline='') as f:
+        escritor = csv.DictWriter(f, fieldnames=list(resultados[0]))
+        escritor.writeheader()
+        escritor.writerows(resultados)
+    print(f"✅ Cenário esparso salvo em '{arquivo_csv}'")
+    return resultados
+
+
+if __name__ == "__main__":
+    if sys.argv[1:] == ["blocos"]:
+        varrer_tamanho_bloco()
+    elif sys.argv[1:] == ["esparso"]:
+        varrer_esparso()
+    else:
+        executar_benchmark()
@@ -0,0 +1,143 @@
+import os
+import struct
+import numpy as np
+from motor_empacotado import empacotar_grade, desempacotar_grade, BITS_POR_PALAVRA
+from regras import REGRA_PADRAO, normalizar_regra
+
+
+# --- FORMATO DE CHECKPOINT (.ckpt) ---
+# Cabeçalho fixo de 64 bytes + corpo cru, que pode ser aberto com np.memmap:
+# dá para ler um bloco do tabuleiro sem carregar o arquivo inteiro (o pickle não deixa).
+#
+#   magico (8s) | versao (H) | codificacao (B) | - | linhas (Q) | colunas (Q) | geracao (Q) | regra (24s) | -
+#
+# A regra vai normalizada (no máximo "B012345678/S012345678", 21 bytes). A versão 1 tinha
+# só 16 bytes para a regra (e cortava as longas em silêncio); ainda é lida.
+#
+# Codificações do corpo:
+#   INT8 -> linhas x colunas bytes (1 byte por célula, igual à grade em memória)
+#   BITS -> linhas x palavras uint64 little-endian (64 células por palavra, ver motor_empacotado.py)
+
+MAGICO = b'JDVCKPT1'
+VERSAO = 2
+CABECALHO = struct.Struct('<8sHBxQQQ24s4x')
+CABECALHOS = {1: struct.Struct('<8sHBxQQQ16s12x'), VERSAO: CABECALHO} # Versões que ainda são lidas
+TAMANHO_CABECALHO = CABECALHO.size # 64: o corpo começa alinhado
+TAMANHO_REGRA = 24
+
+INT8 = 0
+BITS = 1
+
+LINHAS_POR_ESCRITA = 4096 # Empacota e grava em faixas para não duplicar a grade na memória
+
+
+# FUNÇÃO 1: ESCRITA
+def salvar_checkpoint(nome_arquivo, grade, geracao, regra=REGRA_PADRAO, empacotado=True):
+    """
+    Grava a grade no formato .ckpt. A escrita vai para um arquivo temporário que só
+    substitui o anterior no final: uma queda no meio nunca deixa um checkpoint pela metade.
+    """
+    linhas, colunas = grade.shape
+    codificacao = BITS if empacotado else INT8
+    regra_bytes = normalizar_regra(regra).encode('ascii')
+    if len(regra_bytes) > TAMANHO_REGRA:
+        raise ValueError(f"Regra '{regra}' não cabe nos {TAMANHO_REGRA} bytes do cabeçalho")
+    cabecalho = CABECALHO.pack(MAGICO, VERSAO, codificacao, linhas, colunas, geracao, regra_bytes)
+
+    temporario = nome_arquivo + ".tmp"
+    with open(temporario, 'wb') as f:
+        f.write(cabecalho)
+        for inicio in range(0, linhas, LINHAS_POR_ESCRITA):
+            faixa = grade[inicio:inicio + LINHAS_POR_ESCRITA]
+            corpo = empacotar_grade(faixa) if empacotado else np.ascontiguousarray(faixa, dtype=np.int8)
+            f.write(memoryview(corpo).cast('B'))
+    os.replace(temporario, nome_arquivo)
+
+
+def talvez_salvar_checkpoint(nome_arquivo, grade, geracao, intervalo, **opcoes):
+    """Salva só quando 'geracao' é múltiplo de 'intervalo' (intervalo 0 = desligado)."""
+    if intervalo and geracao % intervalo == 0:
+        salvar_checkpoint(nome_arquivo, grade, geracao, **opcoes)
+        return True
+    return False
+
+
+# FUNÇÃO 2: LEITURA DO CABEÇALHO E MAPEAMENTO DO CORPO
+def ler_cabecalho(nome_arquivo):
+    """Lê só os 64 bytes do cabeçalho e devolve um dicionário."""
+    with open(nome_arquivo, 'rb') as f:
+        dados = f.read(TAMANHO_CABECALHO)
+    if len(dados) < TAMANHO_CABECALHO:
+        raise ValueError(f"'{nome_arquivo}' é curto demais para ser um checkpoint")
+    magico, versao = struct.unpack_from('<8sH', dados)
+    if magico != MAGICO:
+        raise ValueError(f"'{nome_arquivo}' não é um checkpoint (cabeçalho {magico!r})")
+    if versao not in CABECALHOS:
+        raise ValueError(f"Checkpoint versão {versao} não suportada (esperado {VERSAO})")
+    _, _, codificacao, linhas, colunas, geracao, regra = CABECALHOS[versao].unpack(dados)
+    return {
+        'versao': versao,
+        'codificacao': 'bits' if codificacao == BITS else 'int8',
+        'linhas': linhas,
+        'colunas': colunas,
+        'geracao': geracao,
+        'regra': regra.rstrip(b'\0').decode('ascii'),
+    }
+
+
+def abrir_checkpoint(nome_arquivo):
+    """
+    Devolve (cabecalho, corpo) com o corpo mapeado via np.memmap (somente leitura).
+    Nada é lido do disco até que uma parte do corpo seja acessada.
+    """
+    cabecalho = ler_cabecalho(nome_arquivo)
+    linhas, colunas = cabecalho['linhas'], cabecalho['colunas']
+    if cabecalho['codificacao'] == 'bits':
+        forma = (linhas, -(-colunas // BITS_POR_PALAVRA))
+        dtype = '<u8'
+    else:
+        forma = (linhas, colunas)
+        dtype = np.int8
+    corpo = np.memmap(nome_arquivo, dtype=dtype, mode='r', offset=TAMANHO_CABECALHO, shape=forma)
+    return cabecalho, corpo
+
+
+# FUNÇÃO 3: LEITURA PARCIAL E COMPLETA
+def ler_bloco(nome_arquivo, linha_inicio, linha_fim, coluna_inicio, coluna_fim):
+    """Lê só o bloco [linha_inicio, linha_fim) x [coluna_inicio, coluna_fim) como int8."""
+    cabecalho, corpo = abrir_checkpoint(nome_arquivo)
+    if cabecalho['codificacao'] == 'int8':
+        return np.array(corpo[linha_inicio:linha_fim, coluna_inicio:coluna_fim])
+    palavra_inicio = coluna_inicio // BITS_POR_PALAVRA
+    palavra_fim = -(-coluna_fim // BITS_POR_PALAVRA)
+    palavras = corpo[linha_inicio:linha_fim, palavra_inicio:palavra_fim]
+    grade = desempacotar_grade(palavras, (palavra_fim - palavra_inicio) * BITS_POR_PALAVRA)
+    deslocamento = coluna_inicio - palavra_inicio * BITS_POR_PALAVRA
+    return grade[:, deslocamento:deslocamento + (coluna_fim - coluna_inicio)]
+
+
+def carregar_checkpoint(nome_arquivo):
+    """Carrega a grade inteira (int8) e devolve (grade, cabecalho)."""
+    cabecalho = ler_cabecalho(nome_arquivo)
+    grade = ler_bloco(nome_arquivo, 0, cabecalho['linhas'], 0, cabecalho['colunas'])
+    return grade, cabecalho
+
+
+# FUNÇÃO 4: PONTO DE PARTIDA DAS SIMULAÇÕES
+def retomar_ou_inicializar(retomar_de, tamanho, inicializar_grade, regra=REGRA_PADRAO):
+    """
+    Devolve (grade, geracao_inicial, regra): a grade do checkpoint 'retomar_de', se houver,
+    ou uma grade nova de 'inicializar_grade(tamanho)' começando na geração 0.
+    Um checkpoint gravado com outra regra é recusado (ValueError): a continuação não
+    seria a mesma simulação.
+    """
+    regra = normalizar_regra(regra)
+    if retomar_de is None:
+        return inicializar_grade(tamanho), 0, regra
+    grade, cabecalho = carregar_checkpoint(retomar_de)
+    regra_salva = normalizar_regra(cabecalho['regra'])
+    if regra_salva != regra:
+        raise ValueError(f"O checkpoint '{retomar_de}' foi gravado com a regra {regra_salva}, não {regra}; "
+                         f"retome com a mesma regra")
+    print(f"[CHECKPOINT] Retomando '{retomar_de}' na geração {cabecalho['geracao']} (regra {regra_salva}).")
+    return grade, cabecalho['geracao'], regra_salva
@@ -0,0 +1,119 @@
+from collections import deque
+import hashlib
+import numpy as np
+from motor_empacotado import empacotar_grade, desempacotar_grade
+
+
+# --- DETECÇÃO DE ESTABILIZAÇÃO E CICLOS ---
+# Sopas aleatórias de 100x100 costumam congelar (período 1) ou cair em osciladores de
+# período 2 bem antes da geração 200. O detector guarda só um hash de 64 bits de cada
+# uma das últimas PERIODO_MAXIMO gerações (a grade bit-empacotada passa pelo blake2b):
+# a janela custa 8 bytes por geração, em vez de uma grade inteira.
+#
+# Um hash repetido é só um candidato: se a geração g repete o hash da g - p, o detector
+# guarda as grades empacotadas das p gerações seguintes e confirma o ciclo comparando a
+# grade g + p, célula por célula, com a da g. Uma colisão de hash nunca vira um falso
+# ciclo; só atrasa a detecção de p gerações.
+#
+# Confirmado um ciclo de período p na geração g, o estado em qualquer geração n >= g é o
+# estado em g - p + (n - g) % p, uma das p grades guardadas na confirmação: dá para saltar
+# direto para a última geração sem calcular mais nada.
+
+PERIODO_MAXIMO = 16 # Maior período detectado (e tamanho da janela)
+
+
+def hash_grade(empacotada):
+    """Hash de 64 bits da grade bit-empacotada (lida direto do buffer, sem cópia)."""
+    return int.from_bytes(hashlib.blake2b(empacotada, digest_size=8).digest(), 'little')
+
+
+class DetectorCiclos:
+    """
+    Uso:
+        detector = DetectorCiclos()
+        for geracao in ...:
+            ...
+            if detector.observar(geracao, grade):
+                break
+        grade = detector.avancar_ate(num_geracoes, grade)
+    """
+
+    def __init__(self, periodo_maximo=PERIODO_MAXIMO):
+        self.periodo_maximo = periodo_maximo
+        self._janela = deque()  # (geracao, hash) em ordem, no máximo periodo_maximo
+        self._vistos = {}       # hash -> geracao mais recente com esse hash
+        self._candidato = None  # (geracao, periodo) do hash repetido, à espera de confirmação
+        self._grades = []       # (geracao, grade empacotada) desde o candidato
+        self._colunas = None
+        self.periodo = None            # 1 = estável (natureza morta), 2+ = oscilador
+        self.geracao_detectada = None  # Geração em que o ciclo foi confirmado
+
+    def observar(self, geracao, grade):
+        """Registra a grade da geração 'geracao'; devolve True quando um ciclo é confirmado."""
+        if self.periodo is not None:
+            return True
+        self._colunas = grade.shape[1]
+        empacotada = empacotar_grade(grade)
+
+        if self._candidato is not None:
+            inicio, periodo = self._candidato
+            if geracao - inicio < periodo:
+                self._grades.append((geracao, empacotada))
+            elif np.array_equal(empacotada, self._grades[0][1]):
+                self.periodo = periodo
+                self.geracao_detectada = geracao
+                tipo = "estável" if periodo == 1 else f"ciclo de período {periodo}"
+                print(f"[CICLO] Tabuleiro {tipo}: geração {geracao} repete a geração {geracao - periodo}.")
+                return True
+            else:
+                self._candidato = None # Colisão de hash: descarta o candidato
+                self._grades = []
+
+        chave = hash_grade(empacotada)
+        anterior = self._vistos.get(chave)
+        if anterior is not None and self._candidato is None:
+            self._candidato = (geracao, geracao - anterior)
+            self._grades = [(geracao, empacotada)]
+
+        self._janela.append((geracao, chave))
+        self._vistos[chave] = geracao
+        if len(self._janela) > self.periodo_maximo:
+            antiga_geracao, antiga = self._janela.popleft()
+            if self._vistos.get(antiga) == antiga_geracao:
+                del self._vistos[antiga]
+        return False
+
+    def avancar_ate(self, geracao_final, grade):
+        """
+        Grade da 'geracao_final'. Sem ciclo detectado, devolve 'grade' como está; com ciclo,
+        a tira das grades guardadas na confirmação (salto analítico) sem calcular as gerações restantes.
+        """
+        if self.periodo is None or geracao_final <= self.geracao_detectada:
+            return grade
+        alvo = self.geracao_detectada - self.periodo + (geracao_final - self.geracao_detectada) % self.periodo
+        for geracao, empacotada in self._grades:
+            if geracao == alvo:
+                break
+        print(f"[CICLO] Saltando da geração {self.geracao_detectada} para a {geracao_final} "
+              f"({geracao_final - self.geracao_detectada} gerações não calculadas).")
+        return desempacotar_grade(empacotada, self._colunas)
+
+
+class DetectorNulo:
+    """Detecção desligada: nunca para a simulação mais cedo, e 'avancar_ate' devolve a grade recebida."""
+    periodo = None
+    geracao_detectada = None
+
+    def observar(self, geracao, grade):
+        return False
+
+    def avancar_ate(self, geracao_final, grade):
+        return grade
+
+
+DETECTOR_NULO = DetectorNulo()
+
+
+def criar_detector(ativo, periodo_maximo=PERIODO_MAXIMO):
+    """Detector de períodos até 'periodo_maximo', ou DETECTOR_NULO se 'ativo' for falso."""
+    return DetectorCiclos(periodo_maximo) if ativo else DETECTOR_NULO
@@ -1,18 +1,32 @@
 import time
 import numpy as np
 import socket
-import pickle
 import sys 
+import os
+from motores import obter_motor, verificar_regra_fixa
+from regras import tabela_para
+from instrumentacao import criar_rastreador
+from motor_vetorizado import calcular_faixa_vetorizada
+from codificacao import CodificadorResultados
+from estatisticas import ContagemFaixa, linha_da_faixa, largura_linha_faixa
+from protocolo import (
+    INICIO, PASSO, RESULTADO, FIM, FATIA, CONTADORES, HALO_ACIMA, HALO_ABAIXO, PEDIR_CONTADORES,
+    configurar_socket, enviar_quadro, receber_quadro, esperar_quadro, tamanho_quadro, enviar_codificado, enviar_ola,
+)
 
 # --- PARÂMETROS GLOBAIS ---
 HOST = '127.0.0.1' 
 PORT = 65432
 TAMANHO_GRADE = 100 
+MOTOR = "vetorizado" # "classico" (laço célula a célula) ou um dos motores de motores.py
+REGRA = "B3/S23"     # Regra B/S (a do servidor, conferida no OLA). Modos 1:1/async: outras regras pedem MOTOR = "vetorizado" ou "tabela"
+MODO = "faixas"      # "faixas" (faixa residente + halos); "1:1" ou "async" (recebe um bloco/grade por quadro)
+INSTRUMENTAR = False # Tempo por fase (esperar / calcular / enviar) e bytes; grava trace_cliente_<pid>.json
 
 
 # --- FUNÇÃO ESSENCIAL: CONTAGEM DE VIZINHOS ---
-def contar_vizinhos_vivos(grade, i, j, tamanho):
-    """Conta os 8 vizinhos vivos de uma célula (i, j) na grade completa."""
+def contar_vizinhos_vivos(grade, i, j, linhas, colunas):
+    """Conta os 8 vizinhos vivos de uma célula (i, j) na grade (linhas x colunas) recebida."""
     vizinhos_vivos = 0
     
     # O cliente está recebendo a grade completa, então a lógica é a mesma do sequencial
@@ -26,7 +40,7 @@ def contar_vizinhos_vivos(grade, i, j, tamanho):
             
             # Condição de borda (Toroidal ou Borda Fixa, dependendo da sua preferência)
             # Para simplificar, vamos usar borda fixa (não olha para fora)
-            if 0 <= vizinho_i < tamanho and 0 <= vizinho_j < tamanho:
+            if 0 <= vizinho_i < linhas and 0 <= vizinho_j < colunas:
                 vizinhos_vivos += grade[vizinho_i, vizinho_j]
 
     return vizinhos_vivos
@@ -34,13 +48,17 @@ def contar_vizinhos_vivos(grade, i, j, tamanho):
 
 # --- FUNÇÃO CHAVE: LÓGICA DO JOGO DA VIDA ---
 def calcular_proxima_geracao(grade_atual, tamanho):
-    """Calcula o novo estado para a grade completa recebida."""
-    nova_grade = np.zeros((tamanho, tamanho), dtype=np.int8)
+    """
+    Calcula o novo estado para a grade recebida.
+    As dimensões vêm da própria grade: os blocos do modo assíncrono não são quadrados.
+    """
+    linhas, colunas = grade_atual.shape
+    nova_grade = np.zeros((linhas, colunas), dtype=np.int8)
     
-    for i in range(tamanho):
-        for j in range(tamanho):
+    for i in range(linhas):
+        for j in range(colunas):
             
-            vivos = contar_vizinhos_vivos(grade_atual, i, j, tamanho) 
+            vivos = contar_vizinhos_vivos(grade_atual, i, j, linhas, colunas) 
             
             # Aplica as 4 regras
             if grade_atual[i, j] == 1: 
@@ -53,51 +71,175 @@ def calcular_proxima_geracao(grade_atual, tamanho):
     return nova_grade
 
 
+# --- CONEXÃO E HANDSHAKE ---
+def conectar_com_espera(host, port, regra=REGRA, intervalo=0.1):
+    """
+    Tenta conectar até o servidor estar ouvindo e abre a sessão (quadro OLA com a regra).
+    Se a regra não for a do servidor, ele responde RECUSADO e a primeira leitura levanta ConnectionError.
+    """
+    while True:
+        try:
+            s = socket.create_connection((host, port))
+            break
+        except ConnectionRefusedError:
+            time.sleep(intervalo)
+    configurar_socket(s)
+    enviar_ola(s, regra)
+    return s
+
+
 # --- FUNÇÃO PRINCIPAL DO CLIENTE (Worker) ---
-def cliente_worker(host, port):
+def cliente_worker(host, port, motor=MOTOR, instrumentar=INSTRUMENTAR, regra=REGRA):
+    """
+    Modo 1:1: UMA conexão para a simulação inteira.
+    A cada quadro PASSO recebe a grade, calcula e responde com um quadro RESULTADO,
+    codificado contra a própria grade recebida (que o servidor também tem).
+    """
+    if motor == "classico":
+        verificar_regra_fixa(motor, regra)
+        calcular_geracao = calcular_proxima_geracao
+    else:
+        calcular_geracao = obter_motor(motor, regra)
+    rastreador = criar_rastreador("cliente 1:1", instrumentar)
+    codificador = CodificadorResultados()
     try:
-        # 1. TENTA CONECTAR
-        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-            s.connect((host, port))
+        with conectar_com_espera(host, port, regra) as s:
             print(f"[CLIENTE] Conectado ao Servidor. Aguardando trabalho...")
-            
-            # 2. RECEBER DADOS
-            tamanho_dados_bytes = s.recv(8)
-            if not tamanho_dados_bytes: return
-
-            tamanho_dados = int.from_bytes(tamanho_dados_bytes, byteorder='big')
-            
-            dados_recebidos = b''
-            while len(dados_recebidos) < tamanho_dados:
-                pacote = s.recv(tamanho_dados - len(dados_recebidos))
-                if not pacote: break
-                dados_recebidos += pacote
-            
-            dados = pickle.loads(dados_recebidos)
-            grade_fatia = dados['grade_fatia'] # Recebe a grade inteira
-            tamanho = dados['tamanho']
-            
-            print(f"[CLIENTE] Recebeu {len(dados_recebidos) / 1024:.2f} KB. Calculando...")
-            
-            # 3. CALCULAR O TRABALHO
-            nova_fatia = calcular_proxima_geracao(grade_fatia, tamanho)
-            
-            # 4. ENVIAR RESULTADO
-            data_resposta = pickle.dumps(nova_fatia)
-            s.sendall(len(data_resposta).to_bytes(8, byteorder='big'))
-            s.sendall(data_resposta)
-            
-            print(f"[CLIENTE] Envio concluído. Desconectando...")
-            
-    except ConnectionRefusedError:
-        print(f"[CLIENTE] ERRO: Servidor não está ativo ou porta incorreta.", file=sys.stderr)
+            grade_fatia = None
+            geracao = 0
+            while True:
+                # Inclui o tempo ocioso esperando o servidor
+                with rastreador.fase("esperar", geracao):
+                    quadro = receber_quadro(s, saida=grade_fatia)
+                if quadro is None or quadro[0] == FIM:
+                    break
+                tipo, _, _, grade_fatia = quadro
+                rastreador.contar_bytes("recebidos", tamanho_quadro(grade_fatia))
+                with rastreador.fase("calcular", geracao):
+                    nova_fatia = calcular_geracao(grade_fatia, grade_fatia.shape[0])
+                with rastreador.fase("enviar", geracao):
+                    rastreador.contar_bytes("enviados", enviar_codificado(s, RESULTADO, nova_fatia, codificador, grade_fatia))
+                geracao += 1
+            print(f"[CLIENTE] Simulação concluída. Desconectando...")
     except Exception as e:
         print(f"[CLIENTE] ERRO durante a execução: {e}", file=sys.stderr)
-        
+    codificador.imprimir_resumo()
+    finalizar_rastreador(rastreador)
+
+
+def finalizar_rastreador(rastreador):
+    """Imprime a tabela de fases e grava o trace deste cliente (se instrumentado)."""
+    rastreador.imprimir_resumo()
+    rastreador.salvar_trace(f"trace_cliente_{os.getpid()}.json")
+
+
+# --- MODO FAIXAS: FAIXA RESIDENTE + TROCA DE HALOS ---
+def avancar_faixa(estendida, nova_estendida, profundidade, geracoes, acima, abaixo, tabela=None, contadores=None):
+    """
+    Avança 'geracoes' gerações numa faixa com 'profundidade' linhas de halo de cada lado
+    (faixa em estendida[profundidade:-profundidade]). A cada geração a região confiável
+    encolhe uma linha de cada lado; depois de 'geracoes' <= 'profundidade' passos a faixa
+    inteira está certa. Sem vizinho ('acima'/'abaixo' False) o halo é a borda fixa: fica
+    zerado e nunca é calculado. Devolve (estendida, nova_estendida) trocados conforme o número de passos.
+    Com 'contadores' (geracoes x (3 + blocos de colunas)), cada linha recebe a população,
+    os nascimentos, as mortes e a atividade por bloco de colunas das linhas da própria faixa,
+    contados pelo núcleo durante o cálculo (os halos recalculados ficam de fora).
+    """
+    total, colunas = estendida.shape
+    topo = 0 if acima else profundidade
+    base = total if abaixo else total - profundidade
+    contagem = ContagemFaixa(profundidade, total - profundidade, colunas) if contadores is not None else None
+    for passo in range(1, geracoes + 1):
+        calcular_faixa_vetorizada(estendida, nova_estendida, max(topo, passo), min(base, total - passo), tabela,
+                                  contagem)
+        if contagem is not None:
+            contadores[passo - 1] = linha_da_faixa(contagem.concluir())
+        estendida, nova_estendida = nova_estendida, estendida
+    return estendida, nova_estendida
+
+
+def cliente_worker_faixas(host, port, instrumentar=INSTRUMENTAR, regra=REGRA):
+    """
+    Mantém UMA conexão durante toda a simulação e guarda a própria faixa da grade.
+    A faixa mora numa matriz com k linhas extras em cima e embaixo (os halos);
+    sem vizinho, as linhas extras ficam zeradas, que é a própria borda fixa.
+    Cada PASSO traz halos de k linhas e pede k gerações (quadro.valor): o cliente as
+    avança sozinho (recalculando as bordas em redundância) e devolve as suas 'profundidade'
+    primeiras e últimas linhas, com o tempo de cálculo em µs no valor do quadro.
+    As bordas vão codificadas contra as da troca anterior (o servidor guarda as mesmas).
+    """
+    rastreador = criar_rastreador("cliente faixas", instrumentar)
+    codificador = CodificadorResultados()
+    tabela = tabela_para(regra)
+    with conectar_com_espera(host, port, regra) as s:
+        _, profundidade, linha_inicio, grade_fatia = esperar_quadro(s, INICIO)
+        profundidade = max(profundidade, 1) # Profundidade das bordas devolvidas (flags do INICIO)
+        rastreador.contar_bytes("recebidos", tamanho_quadro(grade_fatia))
+        linhas, colunas = grade_fatia.shape
+        print(f"[CLIENTE] Faixa recebida: linhas {linha_inicio} a {linha_inicio + linhas - 1}.")
+
+        # Buffers pré-alocados: faixa estendida (atual/próxima), halos recebidos e bordas enviadas.
+        # A faixa estendida é refeita só quando o número de gerações por troca (k) muda.
+        k = 1
+        estendida = np.zeros((linhas + 2 * k, colunas), dtype=np.int8)
+        estendida[k:-k] = grade_fatia
+        nova_estendida = np.zeros_like(estendida)
+        halos = np.zeros((2 * k, colunas), dtype=np.int8)
+        bordas = np.empty((2 * profundidade, colunas), dtype=np.int8)
+        bordas_anteriores = np.concatenate((grade_fatia[:profundidade], grade_fatia[linhas - profundidade:]))
+
+        geracao = 0
+        while True:
+            with rastreador.fase("esperar", geracao):
+                quadro = receber_quadro(s, saida=halos)
+            if quadro is None:
+                print(f"[CLIENTE] ERRO: conexão encerrada pelo servidor.", file=sys.stderr)
+                break
+            tipo, flags, valor, recebido = quadro
+            if tipo == PASSO:
+                rastreador.contar_bytes("recebidos", tamanho_quadro(recebido))
+                geracoes = max(valor, 1)
+                with rastreador.fase("calcular", geracao):
+                    inicio = time.perf_counter_ns()
+                    if recebido.shape[0] != 2 * k:
+                        # Nova profundidade de halo: remonta a faixa estendida com k' linhas extras
+                        faixa = estendida[k:k + linhas].copy()
+                        k = recebido.shape[0] // 2
+                        estendida = np.zeros((linhas + 2 * k, colunas), dtype=np.int8)
+                        estendida[k:k + linhas] = faixa
+                        nova_estendida = np.zeros_like(estendida)
+                        halos = recebido
+                    estendida[:k] = recebido[:k] if flags & HALO_ACIMA else 0
+                    estendida[k + linhas:] = recebido[k:] if flags & HALO_ABAIXO else 0
+                    # Estatísticas pedidas: contadas aqui, o servidor só soma (não vê a faixa)
+                    contadores = None
+                    if flags & PEDIR_CONTADORES:
+                        contadores = np.zeros((geracoes, largura_linha_faixa(colunas)), dtype='<u8')
+                    estendida, nova_estendida = avancar_faixa(
+                        estendida, nova_estendida, k, geracoes, flags & HALO_ACIMA, flags & HALO_ABAIXO, tabela,
+                        contadores)
+                    microssegundos = (time.perf_counter_ns() - inicio) // 1000
+                with rastreador.fase("enviar", geracao):
+                    bordas[:profundidade] = estendida[k:k + profundidade]
+                    bordas[profundidade:] = estendida[k + linhas - profundidade:k + linhas]
+                    rastreador.contar_bytes("enviados", enviar_codificado(
+                        s, RESULTADO, bordas, codificador, bordas_anteriores, valor=microssegundos))
+                    bordas, bordas_anteriores = bordas_anteriores, bordas
+                    if contadores is not None:
+                        rastreador.contar_bytes("enviados", enviar_quadro(s, CONTADORES, contadores))
+                geracao += geracoes
+            elif tipo == FIM:
+                rastreador.contar_bytes("enviados", enviar_codificado(s, FATIA, estendida[k:k + linhas], codificador))
+                print(f"[CLIENTE] Simulação concluída. Desconectando...")
+                break
+    codificador.imprimir_resumo()
+    finalizar_rastreador(rastreador)
+
+
 if __name__ == "__main__":
-    # O cliente rodará em loop AUTOMATICAMENTE, reconectando a cada geração.
-    print("[CLIENTE] MODO AUTOMÁTICO ATIVADO. Aguardando o Servidor iniciar a Geração 1...")
-    while True:
+    if MODO == "faixas":
+        print("[CLIENTE] MODO FAIXAS. Aguardando o Servidor...")
+        cliente_worker_faixas(HOST, PORT)
+    else:
+        print("[CLIENTE] MODO 1:1. Aguardando o Servidor...")
         cliente_worker(HOST, PORT)
-        # se o servidor ainda não estiver ouvindo a próxima porta.
-        time.sleep(0.1)
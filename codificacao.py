@@ -0,0 +1,104 @@
+import numpy as np
+from motor_empacotado import empacotar_grade, desempacotar_grade, BITS_POR_PALAVRA
+from historico import codificar_delta, decodificar_delta
+
+
+# --- CODIFICAÇÃO ADAPTATIVA DOS RESULTADOS (CLIENTE -> SERVIDOR) ---
+# O resultado de uma geração quase sempre é parecido com a referência que os dois lados
+# já têm (a grade que o servidor mandou, ou as bordas da troca anterior). A cada quadro
+# o cliente mede o tamanho exato de três codificações e envia a menor:
+#   BITS    : a grade bit-empacotada (uint64, 64 células por palavra), 8x menor que int8
+#   XOR     : XOR empacotado com a referência, palavras nulas em corridas (o delta do historico.py)
+#   ESPARSA : índices (uint32, em ordem de linha) das células que mudaram, 4 bytes por mudança
+# Sem referência (FATIA final) só BITS vale. O código vai no campo 'flags' do quadro;
+# CRUA (flags = 0) é o int8 célula a célula de sempre, ainda aceito na recepção.
+#
+# Com menos de ~3% de mudanças a ESPARSA ganha; com a atividade concentrada em poucas
+# regiões, o XOR; numa sopa agitada, BITS. Índices uint32 só alcançam LIMITE_CELULAS_ESPARSA
+# células: numa faixa maior a ESPARSA sai da disputa (o XOR cobre o mesmo caso de poucas mudanças).
+
+CRUA = 0
+BITS = 1
+XOR = 2
+ESPARSA = 3
+NOMES_CODIFICACAO = {CRUA: "crua", BITS: "bits", XOR: "xor", ESPARSA: "esparsa"}
+LIMITE_CELULAS_ESPARSA = 2**32 # Maior faixa cujos índices cabem em uint32
+
+
+# FUNÇÃO 1: CODIFICAÇÃO (lado do cliente)
+class CodificadorResultados:
+    """
+    Escolhe a codificação de cada resultado e acumula quantos bytes ela economizou
+    em relação ao int8 cru (o formato do protocolo v1):
+        codigo, payload = codificador.codificar(nova, referencia)
+    """
+
+    def __init__(self):
+        self.quadros = {codigo: 0 for codigo in NOMES_CODIFICACAO}
+        self.bytes_crus = 0
+        self.bytes_codificados = 0
+
+    def codificar(self, nova, referencia=None):
+        """Devolve (codigo, payload 2D) com o menor payload para 'nova' (int8)."""
+        linhas, colunas = nova.shape
+        tamanho_bits = linhas * -(-colunas // BITS_POR_PALAVRA) * 8
+        if referencia is None:
+            codigo, payload = BITS, empacotar_grade(nova)
+        else:
+            if referencia.shape != nova.shape:
+                raise ValueError(f"Referência {referencia.shape} não tem a forma do resultado {nova.shape}")
+            mudou = np.not_equal(nova, referencia)
+            mudancas = int(np.count_nonzero(mudou))
+            if mudancas == 0:
+                codigo, payload = ESPARSA, np.empty((1, 0), dtype='<u4')
+            else:
+                delta = codificar_delta(empacotar_grade(mudou))
+                tamanhos = {BITS: tamanho_bits, XOR: len(delta)}
+                if nova.size <= LIMITE_CELULAS_ESPARSA:
+                    tamanhos[ESPARSA] = 4 * mudancas
+                codigo = min(tamanhos, key=tamanhos.get)
+                if codigo == BITS:
+                    payload = empacotar_grade(nova)
+                elif codigo == XOR:
+                    payload = np.frombuffer(delta, dtype=np.uint8)[np.newaxis, :]
+                else:
+                    payload = np.flatnonzero(mudou).astype('<u4')[np.newaxis, :]
+
+        self.quadros[codigo] += 1
+        self.bytes_crus += nova.size
+        self.bytes_codificados += payload.nbytes
+        return codigo, payload
+
+    def imprimir_resumo(self, prefixo="[CLIENTE]"):
+        """Bytes enviados x int8 cru e quantos quadros usaram cada codificação."""
+        if self.bytes_crus == 0:
+            return
+        economia = 1 - self.bytes_codificados / self.bytes_crus
+        usos = ", ".join(f"{NOMES_CODIFICACAO[c]}: {n}" for c, n in self.quadros.items() if n)
+        print(f"{prefixo} Resultados: {self.bytes_codificados / 1024:.1f} KB enviados em vez de "
+              f"{self.bytes_crus / 1024:.1f} KB em int8 ({100 * economia:.1f}% economizados; {usos})")
+
+
+# FUNÇÃO 2: DECODIFICAÇÃO (lado do servidor)
+def decodificar_resultado(codigo, payload, saida, referencia=None):
+    """
+    Escreve em 'saida' (int8) o resultado recebido. 'referencia' é a mesma usada pelo
+    cliente (pode ser a própria 'saida': a decodificação funciona no lugar).
+    """
+    if codigo == CRUA:
+        np.copyto(saida, payload)
+    elif codigo == BITS:
+        np.copyto(saida, desempacotar_grade(payload, saida.shape[1]))
+    elif referencia is None:
+        raise ValueError(f"Codificação '{NOMES_CODIFICACAO.get(codigo, codigo)}' exige uma referência")
+    elif codigo == XOR:
+        linhas, colunas = saida.shape
+        xor = decodificar_delta(payload.tobytes(), (linhas, -(-colunas // BITS_POR_PALAVRA)))
+        np.bitwise_xor(referencia, desempacotar_grade(xor, colunas), out=saida)
+    elif codigo == ESPARSA:
+        np.copyto(saida, referencia)
+        if payload is not None:
+            saida[np.unravel_index(payload.ravel(), saida.shape)] ^= 1
+    else:
+        raise ValueError(f"Codificação desconhecida: {codigo}")
+    return saida
@@ -0,0 +1,132 @@
+import numpy as np
+import time
+import os
+import multiprocessing as mp
+from motor_vetorizado import contar_vizinhos_vetorizado, aplicar_regras
+from regras import normalizar_regra, tabela_para
+
+# --- PARÂMETROS DO ENSEMBLE ---
+# Muitas sementes independentes: B tabuleiros empilhados num array (B, N, N) avançam
+# juntos com um único passo vetorizado, e os lotes são espalhados entre processos.
+NUM_SEMENTES = 1000
+TAMANHO_GRADE = 100
+NUM_GERACOES = 200
+TAMANHO_LOTE = 64          # Tabuleiros por passo vetorizado
+NUM_PROCESSOS = os.cpu_count() or 4
+SEMENTE_BASE = 0           # Sementes usadas: SEMENTE_BASE .. SEMENTE_BASE + NUM_SEMENTES - 1
+PERIODO_MAXIMO = 2         # Estável (1) e osciladores de período 2, os finais típicos das sopas
+REGRA = "B3/S23"           # Regra B/S de todos os tabuleiros
+ARQUIVO_RESULTADOS = "resultados_ensemble.npz"
+
+
+# FUNÇÃO 1: LOTE INICIAL
+def inicializar_lote(sementes, tamanho):
+    """Empilha uma grade aleatória por semente: a semente s gera sempre o mesmo tabuleiro."""
+    lote = np.empty((len(sementes), tamanho, tamanho), dtype=np.int8)
+    for i, semente in enumerate(sementes):
+        lote[i] = np.random.default_rng(semente).integers(0, 2, size=(tamanho, tamanho), dtype=np.int8)
+    return lote
+
+
+# FUNÇÃO 2: SIMULAÇÃO DE UM LOTE
+def simular_lote(sementes, tamanho, num_geracoes, periodo_maximo=PERIODO_MAXIMO, regra=REGRA):
+    """
+    Avança todos os tabuleiros do lote juntos e devolve um dicionário com, por tabuleiro:
+      'populacoes'    (B, num_geracoes + 1): células vivas em cada geração
+      'periodos'      (B,): período do estado final (0 = não estabilizou em num_geracoes)
+      'estabilizacao' (B,): primeira geração do ciclo final (-1 = não estabilizou)
+    e 'geracoes_calculadas', a última geração de fato calculada. Quando todos os tabuleiros
+    do lote estabilizam, o laço para e o resto das curvas de população é preenchido pela
+    periodicidade, sem calcular essas gerações.
+    """
+    b = len(sementes)
+    tabela = tabela_para(regra)
+    # Anel de periodo_maximo + 1 buffers: a geração g é escrita por cima da g - periodo_maximo - 1,
+    # que já não serve para comparação. Nada é copiado entre gerações.
+    anel = np.empty((periodo_maximo + 1, b, tamanho, tamanho), dtype=np.int8)
+    anel[0] = inicializar_lote(sementes, tamanho)
+    populacoes = np.zeros((b, num_geracoes + 1), dtype=np.int32)
+    periodos = np.zeros(b, dtype=np.int32)
+    estabilizacao = np.full(b, -1, dtype=np.int32)
+    populacoes[:, 0] = anel[0].reshape(b, -1).sum(axis=1, dtype=np.int32)
+
+    geracao = 0
+    for geracao in range(1, num_geracoes + 1):
+        atual = anel[(geracao - 1) % (periodo_maximo + 1)]
+        nova = anel[geracao % (periodo_maximo + 1)]
+        aplicar_regras(atual, contar_vizinhos_vetorizado(atual), nova, tabela)
+        populacoes[:, geracao] = nova.reshape(b, -1).sum(axis=1, dtype=np.int32)
+
+        # Compara com as gerações g-1, g-2, ... (menor período primeiro)
+        for p in range(1, min(periodo_maximo, geracao) + 1):
+            anterior = anel[(geracao - p) % (periodo_maximo + 1)]
+            iguais = (anterior == nova).reshape(b, -1).all(axis=1) & (periodos == 0)
+            periodos[iguais] = p
+            estabilizacao[iguais] = geracao - p
+
+        if periodos.all():
+            break
+
+    # Salto analítico: população da geração n = população de g - p + (n - g) mod p
+    if geracao < num_geracoes:
+        restantes = np.arange(geracao + 1, num_geracoes + 1)
+        for i in range(b):
+            g, p = estabilizacao[i] + periodos[i], periodos[i]
+            populacoes[i, restantes] = populacoes[i, g - p + (restantes - g) % p]
+
+    return {'populacoes': populacoes, 'periodos': periodos, 'estabilizacao': estabilizacao,
+            'geracoes_calculadas': geracao}
+
+
+def _simular_lote_tarefa(args):
+    """Adaptador para o Pool: desempacota os argumentos de 'simular_lote'."""
+    return simular_lote(*args)
+
+
+# FUNÇÃO 3: ENSEMBLE COMPLETO (lotes espalhados entre processos)
+def executar_ensemble(num_sementes=NUM_SEMENTES, tamanho=TAMANHO_GRADE, num_geracoes=NUM_GERACOES,
+                      tamanho_lote=TAMANHO_LOTE, num_processos=NUM_PROCESSOS, semente_base=SEMENTE_BASE,
+                      regra=REGRA):
+    """Roda todas as sementes, imprime o resumo e salva as curvas em ARQUIVO_RESULTADOS."""
+    sementes = np.arange(semente_base, semente_base + num_sementes)
+    regra = normalizar_regra(regra)
+    lotes = [(sementes[i:i + tamanho_lote], tamanho, num_geracoes, PERIODO_MAXIMO, regra)
+             for i in range(0, num_sementes, tamanho_lote)]
+    num_processos = max(1, min(num_processos, len(lotes)))
+
+    print(f"--- Ensemble: {num_sementes} sementes ({tamanho}x{tamanho}, {num_geracoes} gerações, {regra}), "
+          f"{len(lotes)} lotes de até {tamanho_lote}, {num_processos} processos ---")
+    inicio = time.perf_counter()
+    if num_processos == 1:
+        resultados = [_simular_lote_tarefa(lote) for lote in lotes]
+    else:
+        with mp.Pool(num_processos) as pool:
+            resultados = pool.map(_simular_lote_tarefa, lotes)
+    tempo_total = time.perf_counter() - inicio
+
+    populacoes = np.concatenate([r['populacoes'] for r in resultados])
+    periodos = np.concatenate([r['periodos'] for r in resultados])
+    estabilizacao = np.concatenate([r['estabilizacao'] for r in resultados])
+    np.savez_compressed(ARQUIVO_RESULTADOS, sementes=sementes, populacoes=populacoes,
+                        periodos=periodos, estabilizacao=estabilizacao)
+
+    # 📊 Resumo (a vazão conta só as gerações calculadas, não as preenchidas pelo salto)
+    calculadas = sum(len(r['periodos']) * r['geracoes_calculadas'] for r in resultados)
+    vazao = calculadas / tempo_total
+    estaveis = periodos > 0
+    print(f"\n--- Fim do Ensemble ---")
+    print(f"Tempo total: {tempo_total:.4f} segundos ({vazao:,.0f} tabuleiros-geração/s, "
+          f"{calculadas} de {num_sementes * num_geracoes} calculados)")
+    print(f"Estabilizaram até a geração {num_geracoes}: {estaveis.sum()} de {num_sementes} ({100 * estaveis.mean():.1f}%)")
+    for p in range(1, PERIODO_MAXIMO + 1):
+        print(f"  período {p}: {(periodos == p).sum()}")
+    if estaveis.any():
+        print(f"Geração de estabilização: média {estabilizacao[estaveis].mean():.1f}, "
+              f"mediana {np.median(estabilizacao[estaveis]):.0f}")
+    print(f"População final média: {populacoes[:, -1].mean():.1f}")
+    print(f"✅ Curvas salvas em '{ARQUIVO_RESULTADOS}'")
+    return tempo_total
+
+
+if __name__ == "__main__":
+    executar_ensemble()
@@ -0,0 +1,152 @@
+import math
+import time
+from collections import deque
+import numpy as np
+from motor_ativo import dilatar_blocos
+from estatisticas import ContagemBlocos
+
+
+# --- ESCALONADOR DE BLOCOS COM ROUBO DE TRABALHO ---
+# Faixas fixas (uma por thread) só equilibram a carga se todas as regiões da grade custam
+# o mesmo. Aqui cada geração é cortada em muitos blocos pequenos:
+#   - blocos parados (nem eles nem os vizinhos mudaram na geração anterior) são pulados,
+#     com o mesmo truque de buffers duplos do motor_ativo.py;
+#   - os demais vão para uma fila por trabalhador, dos mais caros para os mais baratos
+#     (custo = média móvel do tempo medido de cada bloco), sempre na fila menos carregada;
+#   - quem esvazia a própria fila rouba blocos do FIM da fila dos outros (os mais baratos),
+#     então ninguém fica parado enquanto ainda há trabalho e a geração não espera o mais lento.
+# 'deque.popleft'/'deque.pop' são atômicos: as filas dispensam travas.
+# Com 'ativar_contadores()', o teste de "o bloco mudou?" vira a contagem da população e
+# dos nascimentos do bloco (estatisticas.py): mudou = nascimentos ou mortes.
+
+BLOCOS_POR_TRABALHADOR = 8 # Lado do bloco escolhido para dar ~isso de blocos por trabalhador
+BLOCO_MINIMO = 32          # Abaixo disso o custo de chamada domina o cálculo
+PESO_CUSTO = 0.3           # Peso da última medição na média móvel do custo de cada bloco
+
+
+def lado_automatico(linhas, colunas, num_trabalhadores):
+    """Lado do bloco que dá cerca de BLOCOS_POR_TRABALHADOR blocos por trabalhador."""
+    por_lado = math.ceil(math.sqrt(BLOCOS_POR_TRABALHADOR * num_trabalhadores))
+    return max(BLOCO_MINIMO, -(-max(linhas, colunas) // por_lado))
+
+
+class EscalonadorRoubo:
+    """
+    Distribui os blocos de uma geração entre 'num_trabalhadores'. Uso por geração:
+        escalonador.preparar()                 # coordenador, com os trabalhadores parados
+        escalonador.executar(k, calcular_bloco, atual, nova)   # em cada trabalhador k
+        escalonador.concluir()                 # coordenador, depois de todos terminarem
+    'calcular_bloco(atual, nova, l0, l1, c0, c1)' escreve o bloco da próxima geração.
+    """
+
+    def __init__(self, linhas, colunas, num_trabalhadores, tamanho_bloco=None):
+        self.tamanho_bloco = tamanho_bloco or lado_automatico(linhas, colunas, num_trabalhadores)
+        t = self.tamanho_bloco
+        self.forma_blocos = (-(-linhas // t), -(-colunas // t))
+        self.blocos = [
+            (l0, min(l0 + t, linhas), c0, min(c0 + t, colunas))
+            for l0 in range(0, linhas, t) for c0 in range(0, colunas, t)
+        ]
+        self.num_trabalhadores = num_trabalhadores
+        self._mudou = np.ones(len(self.blocos), dtype=bool)  # Primeira geração: tudo ativo
+        self._custo = np.ones(len(self.blocos))
+        self._filas = [deque() for _ in range(num_trabalhadores)]
+        self._inicio = 0.0
+        self._ocupado_geracao = np.zeros(num_trabalhadores)
+        self.contadores = None   # (populacao, nascimentos, mortes, atividade por bloco) da última geração
+        self._contagem = None
+
+        # Estatísticas acumuladas, por trabalhador
+        self.tempo_ocupado = np.zeros(num_trabalhadores)
+        self.tempo_ocioso = np.zeros(num_trabalhadores)
+        self.blocos_calculados = np.zeros(num_trabalhadores, dtype=np.int64)
+        self.blocos_roubados = np.zeros(num_trabalhadores, dtype=np.int64)
+        self.blocos_pulados = 0
+        self.geracoes = 0
+
+    def ativar_contadores(self, grade):
+        """Liga a contagem a partir de 'grade' (a geração atual): população inicial de cada bloco."""
+        self._contagem = ContagemBlocos(self.forma_blocos, [
+            np.count_nonzero(grade[l0:l1, c0:c1]) for l0, l1, c0, c1 in self.blocos])
+
+    def preparar(self):
+        """Escolhe os blocos da geração e os reparte entre as filas (maior custo primeiro)."""
+        a_calcular = dilatar_blocos(self._mudou.reshape(self.forma_blocos)).ravel()
+        indices = np.flatnonzero(a_calcular)
+        self.blocos_pulados += len(self.blocos) - len(indices)
+        self._mudou[:] = False
+
+        cargas = np.zeros(self.num_trabalhadores)
+        for i in indices[np.argsort(-self._custo[indices], kind='stable')]:
+            k = int(cargas.argmin())
+            self._filas[k].append(int(i))
+            cargas[k] += self._custo[i]
+        self._ocupado_geracao[:] = 0.0
+        self._inicio = time.perf_counter()
+
+    def _proximo(self, k):
+        """Próximo bloco do trabalhador k: da própria fila ou roubado do fim de outra."""
+        try:
+            return self._filas[k].popleft(), False
+        except IndexError:
+            pass
+        for passo in range(1, self.num_trabalhadores):
+            try:
+                return self._filas[(k + passo) % self.num_trabalhadores].pop(), True
+            except IndexError:
+                continue
+        return None, False
+
+    def executar(self, k, calcular_bloco, atual, nova):
+        """Laço do trabalhador k numa geração: calcula blocos até todas as filas esvaziarem."""
+        ocupado = 0.0
+        while True:
+            i, roubado = self._proximo(k)
+            if i is None:
+                break
+            l0, l1, c0, c1 = self.blocos[i]
+            inicio = time.perf_counter()
+            calcular_bloco(atual, nova, l0, l1, c0, c1)
+            if self._contagem is None:
+                self._mudou[i] = (nova[l0:l1, c0:c1] != atual[l0:l1, c0:c1]).any()
+            else:
+                contagem = self._contagem
+                contagem.nova_populacao[i] = np.count_nonzero(nova[l0:l1, c0:c1])
+                contagem.nascimentos[i] = np.count_nonzero(nova[l0:l1, c0:c1] > atual[l0:l1, c0:c1])
+                # Sem nascimentos, só mudou se houve mortes (a população caiu)
+                self._mudou[i] = contagem.nascimentos[i] > 0 or contagem.nova_populacao[i] != contagem.populacao[i]
+            duracao = time.perf_counter() - inicio
+            # Cada bloco é de um só trabalhador por geração: escritas em índices distintos
+            self._custo[i] += PESO_CUSTO * (duracao - self._custo[i])
+            ocupado += duracao
+            self.blocos_calculados[k] += 1
+            self.blocos_roubados[k] += roubado
+        self._ocupado_geracao[k] = ocupado
+
+    def concluir(self):
+        """Fecha a geração: ocioso = duração da geração - tempo ocupado de cada trabalhador."""
+        duracao = time.perf_counter() - self._inicio
+        self.tempo_ocupado += self._ocupado_geracao
+        self.tempo_ocioso += np.maximum(duracao - self._ocupado_geracao, 0.0)
+        self.geracoes += 1
+        if self._contagem is not None:
+            self.contadores = self._contagem.concluir()
+
+    @property
+    def fracao_ativa(self):
+        """Fração dos blocos que mudaram na última geração."""
+        return float(self._mudou.mean())
+
+    def imprimir_resumo(self):
+        """Tabela de ocupação por trabalhador (tempo ocupado x ocioso e blocos roubados)."""
+        if self.geracoes == 0:
+            return
+        total = len(self.blocos) * self.geracoes
+        print(f"\n--- Escalonador: blocos {self.tamanho_bloco}x{self.tamanho_bloco}, "
+              f"{self.blocos_pulados} de {total} pulados por estarem parados ---")
+        print(f"{'trab.':>5} {'ocupado (s)':>12} {'ocioso (s)':>11} {'ocupação':>9} {'blocos':>8} {'roubados':>9}")
+        for k in range(self.num_trabalhadores):
+            soma = self.tempo_ocupado[k] + self.tempo_ocioso[k]
+            ocupacao = self.tempo_ocupado[k] / soma if soma > 0 else 0.0
+            print(f"{k:>5} {self.tempo_ocupado[k]:>12.4f} {self.tempo_ocioso[k]:>11.4f} {100 * ocupacao:>8.1f}% "
+                  f"{self.blocos_calculados[k]:>8} {self.blocos_roubados[k]:>9}")
@@ -0,0 +1,260 @@
+import csv
+import os
+import struct
+import numpy as np
+
+
+# --- ESTATÍSTICAS POR GERAÇÃO ---
+# Por geração: população, nascimentos, mortes e quantos blocos tiveram alguma mudança,
+# mais um mapa de atividade (células que mudaram por bloco, somadas na execução inteira).
+#
+# A contagem é feita durante o cálculo, com o bloco ainda na cache, sem passadas extras
+# nas grades inteiras:
+#   - motores em blocos (motor_blocos.py, motor_tabela.py e o escalonador das threads):
+#     por bloco só a população nova e os nascimentos. As mortes saem da população do
+#     bloco na geração anterior:  mortes = nascimentos - (populacao_nova - populacao_anterior)
+#   - núcleo vetorizado (motor_vetorizado.py: motor "vetorizado", faixas das threads, processos
+#     e clientes do modo faixas): a faixa é calculada em trechos da altura de um bloco e cada
+#     trecho é contado logo depois de escrito (ContagemFaixa). Com a grade repartida em faixas,
+#     o mapa de atividade tem uma linha por faixa.
+# Só os motores sem nenhum dos dois caminhos (classico, empacotado, ativo, esparso) usam
+# 'contar_transicao', que compara as duas grades depois do passo.
+#
+# Saída em fluxo, uma linha por geração: CSV (.csv) ou binário (.bin):
+#   magico (8s) | versao (H) | -   e um registro de CAMPOS (uint64) por geração.
+# O mapa de atividade vai, no fechamento, para '<arquivo>_atividade.npy'.
+
+CAMPOS = ("geracao", "populacao", "nascimentos", "mortes", "blocos_ativos")
+TAMANHO_BLOCO_ATIVIDADE = 256 # Lado dos blocos do mapa de atividade quando o motor não tem blocos próprios
+
+MAGICO = b'JDVESTAT'
+VERSAO = 1
+CABECALHO = struct.Struct('<8sH6x')
+REGISTRO = struct.Struct('<' + 'Q' * len(CAMPOS))
+
+
+# FUNÇÃO 1: CONTAGEM
+def somar_por_bloco(grade, tamanho_bloco):
+    """Soma de 'grade' em cada bloco tamanho_bloco x tamanho_bloco (blocos da borda podem ser menores)."""
+    linhas, colunas = grade.shape
+    por_linha = np.add.reduceat(grade, np.arange(0, linhas, tamanho_bloco), axis=0, dtype=np.int64)
+    return np.add.reduceat(por_linha, np.arange(0, colunas, tamanho_bloco), axis=1)
+
+
+def contar_transicao(atual, nova, tamanho_bloco=TAMANHO_BLOCO_ATIVIDADE):
+    """(populacao, nascimentos, mortes, atividade por bloco) comparando duas gerações seguidas."""
+    nasceu = np.greater(nova, atual)
+    morreu = np.less(nova, atual)
+    atividade = somar_por_bloco(nasceu | morreu, tamanho_bloco)
+    return int(np.count_nonzero(nova)), int(np.count_nonzero(nasceu)), int(np.count_nonzero(morreu)), atividade
+
+
+class ContagemBlocos:
+    """
+    Contadores por bloco de um motor em blocos. A cada geração o motor preenche, para
+    cada bloco i que calcular, 'nova_populacao[i]' e 'nascimentos[i]'; 'concluir()' fecha
+    a geração. Blocos não calculados (pulados por estarem parados) ficam como estavam.
+    """
+
+    def __init__(self, forma_blocos, populacao_inicial):
+        self.forma_blocos = forma_blocos
+        self.populacao = np.asarray(populacao_inicial, dtype=np.int64).ravel().copy()
+        self.nova_populacao = self.populacao.copy()
+        self.nascimentos = np.zeros_like(self.populacao)
+
+    def concluir(self):
+        """Devolve (populacao, nascimentos, mortes, atividade por bloco) e passa para a próxima geração."""
+        mortes = self.nascimentos - (self.nova_populacao - self.populacao)
+        atividade = (self.nascimentos + mortes).reshape(self.forma_blocos)
+        contadores = (int(self.nova_populacao.sum()), int(self.nascimentos.sum()), int(mortes.sum()), atividade)
+        self.populacao[:] = self.nova_populacao
+        self.nascimentos[:] = 0
+        return contadores
+
+
+class ContagemFaixa:
+    """
+    Contadores das linhas [linha_inicio, linha_fim) de uma grade calculada pelo núcleo
+    vetorizado. O núcleo pede os 'trechos' (nenhum atravessa a borda de um bloco ou da
+    janela) e chama 'contar' em cada um logo depois de calculá-lo. Linhas fora da janela
+    (halos, por exemplo) são calculadas mas não contadas. 'concluir()' fecha a geração.
+    """
+
+    def __init__(self, linha_inicio, linha_fim, colunas, tamanho_bloco=TAMANHO_BLOCO_ATIVIDADE):
+        self.linha_inicio = linha_inicio
+        self.linha_fim = linha_fim
+        self.colunas = colunas
+        self.tamanho_bloco = tamanho_bloco
+        self._cortes_colunas = np.arange(0, colunas, tamanho_bloco)
+        self.atividade = np.zeros((-(-(linha_fim - linha_inicio) // tamanho_bloco), len(self._cortes_colunas)),
+                                  dtype=np.int64)
+        self.populacao = self.nascimentos = self.mortes = 0
+
+    def trechos(self, linha_inicio, linha_fim):
+        """Divide [linha_inicio, linha_fim) nas bordas dos blocos e da janela."""
+        cortes = {linha_inicio, linha_fim, self.linha_inicio, self.linha_fim}
+        cortes.update(range(self.linha_inicio, self.linha_fim, self.tamanho_bloco))
+        cortes = sorted(c for c in cortes if linha_inicio <= c <= linha_fim)
+        return list(zip(cortes[:-1], cortes[1:]))
+
+    def contar(self, linha_inicio, atual, nova):
+        """Conta o trecho que começa em 'linha_inicio' ('atual'/'nova': as linhas dele nas duas gerações)."""
+        if not self.linha_inicio <= linha_inicio < self.linha_fim:
+            return
+        mudou = np.not_equal(nova, atual)
+        por_coluna = np.count_nonzero(mudou, axis=0)
+        nascimentos = np.count_nonzero(np.greater(nova, atual, out=mudou))
+        self.atividade[(linha_inicio - self.linha_inicio) // self.tamanho_bloco] += \
+            np.add.reduceat(por_coluna, self._cortes_colunas)
+        self.populacao += np.count_nonzero(nova)
+        self.nascimentos += nascimentos
+        self.mortes += int(por_coluna.sum()) - nascimentos
+
+    def concluir(self):
+        """Devolve (populacao, nascimentos, mortes, atividade por bloco) e zera para a próxima geração."""
+        contadores = (int(self.populacao), int(self.nascimentos), int(self.mortes), self.atividade.copy())
+        self.atividade[:] = 0
+        self.populacao = self.nascimentos = self.mortes = 0
+        return contadores
+
+
+def largura_linha_faixa(colunas):
+    """Valores numa linha de 'linha_da_faixa': 3 contadores mais um por bloco de colunas."""
+    return 3 + -(-colunas // TAMANHO_BLOCO_ATIVIDADE)
+
+
+def linha_da_faixa(contadores):
+    """Os contadores de uma faixa numa linha: população, nascimentos, mortes e atividade por bloco de colunas."""
+    populacao, nascimentos, mortes, atividade = contadores
+    return (populacao, nascimentos, mortes, *atividade.sum(axis=0))
+
+
+def juntar_faixas(linhas):
+    """Soma as linhas de 'linha_da_faixa' de todas as faixas; o mapa de atividade fica com uma linha por faixa."""
+    linhas = np.asarray(linhas, dtype=np.int64)
+    populacao, nascimentos, mortes = linhas[:, :3].sum(axis=0)
+    return int(populacao), int(nascimentos), int(mortes), linhas[:, 3:]
+
+
+def contadores_da_geracao(atual, nova, motor=None):
+    """Os contadores que o motor produziu nesta geração, ou (sem eles) os de 'contar_transicao'."""
+    contadores = getattr(motor, 'contadores', None)
+    return contadores if contadores is not None else contar_transicao(atual, nova)
+
+
+# FUNÇÃO 2: SÉRIE EM ARQUIVO
+class SerieEstatisticas:
+    """
+    Grava as estatísticas de cada geração em fluxo. Uso:
+        with SerieEstatisticas("estatisticas.csv") as serie:
+            serie.acompanhar(motor)       # liga os contadores do motor, se ele tiver
+            for geracao in ...:
+                nova = motor(atual, tamanho)
+                serie.registrar(geracao, atual, nova, motor)
+    Quem já tem os números (os clientes do modo faixas) usa 'registrar_contadores'.
+    """
+
+    def __init__(self, nome_arquivo):
+        self.nome_arquivo = nome_arquivo
+        self.binario = os.path.splitext(nome_arquivo)[1].lower() == '.bin'
+        if self.binario:
+            self._arquivo = open(nome_arquivo, 'wb')
+            self._arquivo.write(CABECALHO.pack(MAGICO, VERSAO))
+        else:
+            self._arquivo = open(nome_arquivo, 'w', newline='')
+            self._csv = csv.writer(self._arquivo)
+            self._csv.writerow(CAMPOS)
+        self.atividade_total = None
+        self.geracoes = 0
+
+    def acompanhar(self, motor):
+        ativar = getattr(motor, 'ativar_contadores', None)
+        if ativar is not None:
+            ativar()
+
+    def registrar(self, geracao, atual, nova, motor=None):
+        self.registrar_contadores(geracao, *contadores_da_geracao(atual, nova, motor))
+
+    def registrar_contadores(self, geracao, populacao, nascimentos, mortes, atividade=None, blocos_ativos=None):
+        """'atividade' é o mapa por bloco desta geração; sem ele, informe 'blocos_ativos'."""
+        if atividade is not None:
+            blocos_ativos = int(np.count_nonzero(atividade))
+            if self.atividade_total is None:
+                self.atividade_total = np.zeros(atividade.shape, dtype=np.int64)
+            if self.atividade_total.shape == atividade.shape:
+                self.atividade_total += atividade
+        registro = (geracao, populacao, nascimentos, mortes, blocos_ativos or 0)
+        if self.binario:
+            self._arquivo.write(REGISTRO.pack(*registro))
+        else:
+            self._csv.writerow(registro)
+        self.geracoes += 1
+
+    def fechar(self):
+        if self._arquivo.closed:
+            return
+        self._arquivo.close()
+        mensagem = f"✅ Estatísticas de {self.geracoes} gerações salvas em '{self.nome_arquivo}'"
+        if self.atividade_total is not None:
+            nome_mapa = arquivo_atividade(self.nome_arquivo)
+            np.save(nome_mapa, self.atividade_total)
+            mensagem += f" (mapa de atividade em '{nome_mapa}')"
+        print(mensagem)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fechar()
+
+
+class SerieNula:
+    """
+    Estatísticas desligadas: nenhum arquivo é escrito e 'acompanhar' não liga os contadores
+    do motor, que continua calculando sem contar nada.
+    """
+
+    def acompanhar(self, motor):
+        pass
+
+    def registrar(self, geracao, atual, nova, motor=None):
+        pass
+
+    def registrar_contadores(self, geracao, populacao, nascimentos, mortes, atividade=None, blocos_ativos=None):
+        pass
+
+    def fechar(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+
+SERIE_NULA = SerieNula()
+
+
+def criar_serie(nome_arquivo, ativo):
+    """Série em 'nome_arquivo' (.csv ou .bin, mais o mapa de atividade ao lado); desligada, SERIE_NULA."""
+    return SerieEstatisticas(nome_arquivo) if ativo else SERIE_NULA
+
+
+# FUNÇÃO 3: LEITURA
+def arquivo_atividade(nome_arquivo):
+    return os.path.splitext(nome_arquivo)[0] + "_atividade.npy"
+
+
+def ler_estatisticas(nome_arquivo):
+    """Lê uma série (.csv ou .bin) e devolve um dicionário campo -> array int64."""
+    if os.path.splitext(nome_arquivo)[1].lower() == '.bin':
+        with open(nome_arquivo, 'rb') as f:
+            magico, versao = CABECALHO.unpack(f.read(CABECALHO.size))
+            if magico != MAGICO or versao != VERSAO:
+                raise ValueError(f"'{nome_arquivo}' não é uma série de estatísticas v{VERSAO}")
+            dados = np.frombuffer(f.read(), dtype='<u8').reshape(-1, len(CAMPOS)).astype(np.int64)
+    else:
+        dados = np.loadtxt(nome_arquivo, delimiter=',', skiprows=1, dtype=np.int64, ndmin=2)
+        dados = dados.reshape(-1, len(CAMPOS))
+    return {campo: dados[:, k] for k, campo in enumerate(CAMPOS)}
@@ -0,0 +1,253 @@
+import os
+import queue
+import struct
+import threading
+import numpy as np
+from motor_empacotado import empacotar_grade, desempacotar_grade, BITS_POR_PALAVRA
+
+
+# --- HISTÓRICO DE GERAÇÕES (.hist) ---
+# Fluxo só de acréscimo: um cabeçalho de arquivo e, depois, um registro por geração.
+# A cada KEYFRAME_A_CADA gerações vai um quadro-chave (grade bit-empacotada inteira);
+# nas outras, só o XOR com a geração anterior, com as palavras nulas comprimidas em
+# corridas (run-length). Num tabuleiro que muda pouco, o delta é quase vazio.
+#
+#   arquivo:  magico (8s) | versao (H) | - | linhas (Q) | colunas (Q) | keyframe_a_cada (I) | -
+#   registro: tipo (B) | - | geracao (Q) | tamanho do payload (Q)  + payload
+#
+# Payload do delta: numero de corridas (I) | zeros antes de cada corrida (I[n]) |
+# palavras em cada corrida (I[n]) | palavras não nulas do XOR (uint64, em ordem).
+
+MAGICO = b'JDVHIST1'
+VERSAO = 1
+CABECALHO_ARQUIVO = struct.Struct('<8sH6xQQI4x')
+CABECALHO_REGISTRO = struct.Struct('<B7xQQ')
+CONTAGEM = struct.Struct('<I')
+
+QUADRO_CHAVE = 1
+DELTA = 2
+
+KEYFRAME_A_CADA = 64   # Gerações entre quadros-chave (custo máximo de uma leitura aleatória)
+TAMANHO_FILA = 256     # Gerações empacotadas à espera do escritor
+
+
+# FUNÇÃO 1: CODIFICAÇÃO DO DELTA (XOR + RUN-LENGTH DAS PALAVRAS NULAS)
+def codificar_delta(xor):
+    """Comprime o XOR (uint64, qualquer forma) em corridas de palavras não nulas."""
+    plano = xor.ravel()
+    marca = np.concatenate(([0], (plano != 0).view(np.int8), [0]))
+    bordas = np.diff(marca)
+    inicios = np.flatnonzero(bordas == 1)
+    fins = np.flatnonzero(bordas == -1)
+    fins_anteriores = np.concatenate(([0], fins[:-1]))
+    zeros = (inicios - fins_anteriores).astype('<u4')
+    comprimentos = (fins - inicios).astype('<u4')
+    literais = plano[plano != 0].astype('<u8')
+    return b''.join((CONTAGEM.pack(len(inicios)), zeros.tobytes(), comprimentos.tobytes(), literais.tobytes()))
+
+
+def decodificar_delta(payload, forma):
+    """Inverso de 'codificar_delta': devolve o XOR com a forma pedida."""
+    (n,) = CONTAGEM.unpack_from(payload)
+    zeros = np.frombuffer(payload, dtype='<u4', count=n, offset=CONTAGEM.size).astype(np.int64)
+    comprimentos = np.frombuffer(payload, dtype='<u4', count=n, offset=CONTAGEM.size + 4 * n).astype(np.int64)
+    literais = np.frombuffer(payload, dtype='<u8', offset=CONTAGEM.size + 8 * n)
+
+    xor = np.zeros(forma, dtype='<u8')
+    plano = xor.reshape(-1)
+    inicios = np.cumsum(zeros + np.concatenate(([0], comprimentos[:-1])))
+    marca = np.zeros(plano.size + 1, dtype=np.int64)
+    np.add.at(marca, inicios, 1)
+    np.add.at(marca, inicios + comprimentos, -1)
+    plano[np.cumsum(marca[:-1]) > 0] = literais
+    return xor
+
+
+# --- GRAVADOR (thread escritora em segundo plano) ---
+class GravadorHistorico:
+    """
+    Grava o histórico sem travar o laço de gerações. Uso:
+        with GravadorHistorico("execucao.hist", linhas, colunas) as gravador:
+            for geracao in ...:
+                ...
+                gravador.registrar(geracao, grade)
+    'registrar' só empacota a grade (8x menor) e a põe na fila; o XOR, a compressão e a
+    escrita no disco ficam com a thread escritora. Se o disco ficar para trás por mais de
+    TAMANHO_FILA gerações, 'registrar' espera (para não acumular memória sem limite).
+    """
+
+    def __init__(self, nome_arquivo, linhas, colunas, keyframe_a_cada=KEYFRAME_A_CADA, tamanho_fila=TAMANHO_FILA):
+        self.nome_arquivo = nome_arquivo
+        self.forma = (linhas, colunas)
+        self.keyframe_a_cada = keyframe_a_cada
+        self.bytes_brutos = 0     # O que gerações int8 densas ocupariam
+        self.bytes_gravados = 0
+        self.registros = 0
+        self._erro = None
+
+        self._arquivo = open(nome_arquivo, 'wb')
+        self._arquivo.write(CABECALHO_ARQUIVO.pack(MAGICO, VERSAO, linhas, colunas, keyframe_a_cada))
+        self._fila = queue.Queue(maxsize=tamanho_fila)
+        self._thread = threading.Thread(target=self._escritor, daemon=True)
+        self._thread.start()
+
+    def registrar(self, geracao, grade):
+        """Enfileira a geração 'geracao' (a grade pode ser reaproveitada logo depois)."""
+        if self._erro is not None:
+            raise self._erro
+        self._fila.put((geracao, empacotar_grade(grade)))
+
+    def _escritor(self):
+        anterior = None
+        while True:
+            item = self._fila.get()
+            if item is None:
+                break
+            if self._erro is not None:
+                continue # Esvazia a fila sem gravar: o erro sobe no próximo 'registrar'/'fechar'
+            geracao, empacotada = item
+            try:
+                tipo, payload = QUADRO_CHAVE, empacotada.tobytes()
+                if anterior is not None and geracao % self.keyframe_a_cada != 0:
+                    delta = codificar_delta(np.bitwise_xor(empacotada, anterior))
+                    if len(delta) < len(payload): # Em tabuleiros caóticos o delta pode sair maior
+                        tipo, payload = DELTA, delta
+                self._arquivo.write(CABECALHO_REGISTRO.pack(tipo, geracao, len(payload)))
+                self._arquivo.write(payload)
+                self.bytes_gravados += CABECALHO_REGISTRO.size + len(payload)
+                self.bytes_brutos += self.forma[0] * self.forma[1]
+                self.registros += 1
+                anterior = empacotada
+            except OSError as e:
+                self._erro = e
+
+    def fechar(self):
+        """Espera a fila esvaziar, fecha o arquivo e imprime a taxa de compressão."""
+        if self._thread is None:
+            return
+        self._fila.put(None)
+        self._thread.join()
+        self._thread = None
+        self._arquivo.close()
+        if self._erro is not None:
+            raise self._erro
+        taxa = self.bytes_brutos / self.bytes_gravados if self.bytes_gravados else 0.0
+        print(f"✅ Histórico salvo em '{self.nome_arquivo}': {self.registros} gerações, "
+              f"{self.bytes_gravados / 1024:.1f} KB ({taxa:.1f}x menor que int8 denso)")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fechar()
+
+
+class GravadorNulo:
+    """Histórico desligado: nenhum arquivo é criado e as grades não são empacotadas nem comparadas."""
+
+    def registrar(self, geracao, grade):
+        pass
+
+    def fechar(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+
+GRAVADOR_NULO = GravadorNulo()
+
+
+def criar_gravador(nome_arquivo, linhas, colunas, ativo, **opcoes):
+    """GravadorHistorico da grade 'linhas' x 'colunas' (com as 'opcoes' repassadas); desligado, GRAVADOR_NULO."""
+    return GravadorHistorico(nome_arquivo, linhas, colunas, **opcoes) if ativo else GRAVADOR_NULO
+
+
+# --- LEITOR COM ACESSO ALEATÓRIO ---
+class LeitorHistorico:
+    """
+    Lê um arquivo .hist. Na abertura só os cabeçalhos dos registros são percorridos
+    (os payloads são pulados com seek) para montar o índice geração -> posição.
+    Uso:
+        leitor = LeitorHistorico("execucao.hist")
+        grade = leitor.ler_geracao(150)   # quadro-chave mais próximo + deltas até 150
+        for geracao, grade in leitor.iterar(): ...
+    """
+
+    def __init__(self, nome_arquivo):
+        self.nome_arquivo = nome_arquivo
+        with open(nome_arquivo, 'rb') as f:
+            dados = f.read(CABECALHO_ARQUIVO.size)
+            if len(dados) < CABECALHO_ARQUIVO.size:
+                raise ValueError(f"'{nome_arquivo}' é curto demais para ser um histórico")
+            magico, versao, linhas, colunas, keyframe_a_cada = CABECALHO_ARQUIVO.unpack(dados)
+            if magico != MAGICO:
+                raise ValueError(f"'{nome_arquivo}' não é um histórico (cabeçalho {magico!r})")
+            if versao != VERSAO:
+                raise ValueError(f"Histórico versão {versao} não suportado (esperado {VERSAO})")
+            self.linhas, self.colunas = linhas, colunas
+            self.keyframe_a_cada = keyframe_a_cada
+            self._forma_empacotada = (linhas, -(-colunas // BITS_POR_PALAVRA))
+
+            # Índice: geracao -> (tipo, posição do payload, tamanho). Um registro truncado
+            # no fim (execução interrompida) é ignorado.
+            self._indice = {}
+            tamanho_arquivo = os.fstat(f.fileno()).st_size
+            while True:
+                cabecalho = f.read(CABECALHO_REGISTRO.size)
+                if len(cabecalho) < CABECALHO_REGISTRO.size:
+                    break
+                tipo, geracao, tamanho = CABECALHO_REGISTRO.unpack(cabecalho)
+                posicao = f.tell()
+                if posicao + tamanho > tamanho_arquivo:
+                    break
+                self._indice[geracao] = (tipo, posicao, tamanho)
+                f.seek(tamanho, os.SEEK_CUR)
+        self.geracoes = sorted(self._indice)
+
+    def __len__(self):
+        return len(self.geracoes)
+
+    def _ler_payload(self, f, geracao):
+        tipo, posicao, tamanho = self._indice[geracao]
+        f.seek(posicao)
+        return tipo, f.read(tamanho)
+
+    def _empacotada(self, f, geracao):
+        """Reconstrói a geração bit-empacotada a partir do quadro-chave anterior."""
+        if geracao not in self._indice:
+            raise KeyError(f"Geração {geracao} não está no histórico")
+        posicao = self.geracoes.index(geracao)
+        inicio = posicao
+        while self._indice[self.geracoes[inicio]][0] != QUADRO_CHAVE:
+            inicio -= 1
+        _, payload = self._ler_payload(f, self.geracoes[inicio])
+        empacotada = np.frombuffer(payload, dtype='<u8').reshape(self._forma_empacotada).copy()
+        for g in self.geracoes[inicio + 1:posicao + 1]:
+            _, payload = self._ler_payload(f, g)
+            empacotada ^= decodificar_delta(payload, self._forma_empacotada)
+        return empacotada
+
+    def ler_geracao(self, geracao):
+        """Devolve a grade int8 da geração pedida."""
+        with open(self.nome_arquivo, 'rb') as f:
+            return desempacotar_grade(self._empacotada(f, geracao), self.colunas)
+
+    def iterar(self, inicio=None, fim=None):
+        """Percorre (geracao, grade) em ordem, aplicando cada delta uma única vez."""
+        geracoes = [g for g in self.geracoes if (inicio is None or g >= inicio) and (fim is None or g < fim)]
+        if not geracoes:
+            return
+        with open(self.nome_arquivo, 'rb') as f:
+            empacotada = self._empacotada(f, geracoes[0])
+            yield geracoes[0], desempacotar_grade(empacotada, self.colunas)
+            for g in geracoes[1:]:
+                tipo, payload = self._ler_payload(f, g)
+                if tipo == QUADRO_CHAVE:
+                    empacotada = np.frombuffer(payload, dtype='<u8').reshape(self._forma_empacotada).copy()
+                else:
+                    empacotada ^= decodificar_delta(payload, self._forma_empacotada)
+                yield g, desempacotar_grade(empacotada, self.colunas)
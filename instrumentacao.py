@@ -0,0 +1,118 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+
+# --- INSTRUMENTAÇÃO OPCIONAL (cronômetros por fase + contadores de bytes) ---
+# Liga-se com INSTRUMENTAR = True nos scripts. Desligada, cada 'fase' é um
+# contexto nulo compartilhado: nenhum relógio é lido e nada é guardado.
+#
+# O trace sai no formato "Trace Event" do Chrome (abrir em chrome://tracing ou
+# https://ui.perfetto.dev). Cada processo grava o seu arquivo; 'mesclar_traces'
+# junta servidor e clientes numa linha do tempo só.
+
+
+class Rastreador:
+    """Guarda eventos de duração (fases) e contadores de bytes de um processo."""
+
+    def __init__(self, nome_processo):
+        self.nome_processo = nome_processo
+        self.pid = os.getpid()
+        self.eventos = []
+        self.bytes = {}
+
+    @contextmanager
+    def fase(self, nome, geracao=None):
+        """Mede o tempo de um trecho: 'with rastreador.fase("enviar", geracao):'."""
+        inicio = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            fim = time.perf_counter_ns()
+            self.eventos.append((nome, inicio, fim - inicio, threading.get_ident(), geracao))
+
+    def contar_bytes(self, nome, quantidade):
+        """Acumula bytes num contador (ex.: 'enviados', 'recebidos')."""
+        self.bytes[nome] = self.bytes.get(nome, 0) + quantidade
+
+    def salvar_trace(self, nome_arquivo):
+        """Grava os eventos no formato JSON de trace do Chrome."""
+        eventos = [{
+            'name': 'process_name', 'ph': 'M', 'pid': self.pid, 'tid': 0,
+            'args': {'name': self.nome_processo},
+        }]
+        for nome, inicio, duracao, tid, geracao in self.eventos:
+            evento = {
+                'name': nome, 'ph': 'X', 'pid': self.pid, 'tid': tid,
+                'ts': inicio / 1000, 'dur': duracao / 1000, # Microssegundos
+            }
+            if geracao is not None:
+                evento['args'] = {'geracao': geracao}
+            eventos.append(evento)
+        for nome, total in self.bytes.items():
+            eventos.append({'name': f'bytes_{nome}', 'ph': 'C', 'pid': self.pid, 'tid': 0,
+                            'ts': self.eventos[-1][1] / 1000 if self.eventos else 0, 'args': {nome: total}})
+        with open(nome_arquivo, 'w') as f:
+            json.dump({'traceEvents': eventos}, f)
+        print(f"✅ Trace salvo em '{nome_arquivo}'")
+
+    def resumo(self):
+        """Tempo total, número de ocorrências e média por fase."""
+        fases = {}
+        for nome, _, duracao, _, _ in self.eventos:
+            total, vezes = fases.get(nome, (0, 0))
+            fases[nome] = (total + duracao, vezes + 1)
+        return {nome: {'total_s': total / 1e9, 'vezes': vezes, 'media_ms': total / vezes / 1e6}
+                for nome, (total, vezes) in fases.items()}
+
+    def imprimir_resumo(self):
+        """Imprime a tabela de fases (ordenada pelo tempo total) e os contadores de bytes."""
+        resumo = self.resumo()
+        total_geral = sum(f['total_s'] for f in resumo.values()) or 1.0
+        print(f"\n--- Instrumentação: {self.nome_processo} (pid {self.pid}) ---")
+        print(f"{'Fase':<22}{'Vezes':>8}{'Total (s)':>12}{'Média (ms)':>12}{'%':>7}")
+        for nome, f in sorted(resumo.items(), key=lambda item: -item[1]['total_s']):
+            print(f"{nome:<22}{f['vezes']:>8}{f['total_s']:>12.4f}{f['media_ms']:>12.4f}{100 * f['total_s'] / total_geral:>7.1f}")
+        for nome, total in self.bytes.items():
+            print(f"Bytes {nome}: {total} ({total / 1024:.1f} KB)")
+
+
+class RastreadorNulo:
+    """
+    Instrumentação desligada: cada 'fase' devolve o mesmo contexto nulo (nenhum relógio é
+    lido), os bytes não são somados e nem o resumo nem o trace são gravados.
+    """
+    _nulo = nullcontext()
+
+    def fase(self, nome, geracao=None):
+        return self._nulo
+
+    def contar_bytes(self, nome, quantidade):
+        pass
+
+    def salvar_trace(self, nome_arquivo):
+        pass
+
+    def imprimir_resumo(self):
+        pass
+
+
+RASTREADOR_NULO = RastreadorNulo()
+
+
+def criar_rastreador(nome_processo, ativo):
+    """Com 'ativo', um Rastreador com o nome que o processo terá no trace; senão RASTREADOR_NULO."""
+    return Rastreador(nome_processo) if ativo else RASTREADOR_NULO
+
+
+def mesclar_traces(arquivos, nome_saida):
+    """Junta vários traces (servidor + clientes) num único arquivo."""
+    eventos = []
+    for nome in arquivos:
+        with open(nome) as f:
+            eventos.extend(json.load(f)['traceEvents'])
+    with open(nome_saida, 'w') as f:
+        json.dump({'traceEvents': eventos}, f)
+    print(f"✅ Trace combinado salvo em '{nome_saida}'")
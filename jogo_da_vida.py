@@ -0,0 +1,232 @@
+import argparse
+import sys
+
+# --- PONTO DE ENTRADA ÚNICO (CLI) ---
+# Uso:  python jogo_da_vida.py <subcomando> [opções]     (ver --help de cada subcomando)
+#
+# Este arquivo só importa argparse e sys. Cada subcomando importa o próprio módulo
+# na hora de rodar, então um 'cliente' não carrega servidor, asyncio nem matplotlib:
+# quem sobe dezenas de trabalhadores paga só numpy + socket por processo.
+
+
+# --- SUBCOMANDOS ---
+def motor_para(args):
+    """Motor pedido, ou o padrão para a regra: 'vetorizado' no B3/S23, 'tabela' nas outras."""
+    return args.motor or ("vetorizado" if args.regra == "B3/S23" else "tabela")
+
+
+def aplicar_opcoes_simulacao(modulo, args):
+    """Passa ao módulo da simulação as opções de saída comuns (estatísticas e checkpoints)."""
+    modulo.ESTATISTICAS = args.estatisticas
+    modulo.INTERVALO_CHECKPOINT = args.checkpoint
+
+
+def configuracao_do_perfil(args, modo):
+    """
+    Medição mais rápida do 'modo' no perfil do autoajuste, se ele já mediu esta faixa e regra
+    nesta máquina (sem rodar sondas); senão None e valem os padrões de sempre.
+    """
+    import autoajuste
+    entrada = autoajuste.consultar_perfil(args.tamanho, args.regra, args.perfil)
+    melhor = autoajuste.melhor_do_modo(entrada, modo) if entrada is not None else None
+    if melhor is not None:
+        print(f"[AUTOAJUSTE] Perfil '{args.perfil}': {autoajuste.descrever_configuracao(melhor)}")
+    return melhor
+
+
+def executar_sequencial(args, motor, tamanho_bloco=None):
+    import jogo_da_vida_sequencial as sequencial
+    aplicar_opcoes_simulacao(sequencial, args)
+    sequencial.simular_jogo_da_vida_sequencial(args.tamanho, args.geracoes, motor, args.retomar, args.regra,
+                                               tamanho_bloco)
+
+
+def executar_threads(args, trabalhadores, motor, escalonamento):
+    import jogo_da_vida_paralelo as paralelo
+    paralelo.ESCALONAMENTO = escalonamento
+    paralelo.INSTRUMENTAR = args.instrumentar
+    aplicar_opcoes_simulacao(paralelo, args)
+    paralelo.simular_jogo_da_vida_paralelo(args.tamanho, args.geracoes, trabalhadores or paralelo.NUM_THREADS, motor,
+                                           args.retomar, args.regra)
+
+
+def executar_processos(args, trabalhadores):
+    import jogo_da_vida_processos as processos
+    processos.INSTRUMENTAR = args.instrumentar
+    aplicar_opcoes_simulacao(processos, args)
+    processos.simular_jogo_da_vida_processos(args.tamanho, args.geracoes, trabalhadores or processos.NUM_PROCESSOS,
+                                             args.retomar, args.regra)
+
+
+def comando_sequencial(args):
+    # Sem --motor, o perfil do autoajuste (se existir) escolhe; "auto" calibra se faltar
+    motor, tamanho_bloco = args.motor, None
+    if motor == "auto":
+        import autoajuste
+        motor, tamanho_bloco = autoajuste.melhor_sequencial(args.tamanho, args.regra, args.recalibrar, args.perfil)
+    elif motor is None:
+        melhor = configuracao_do_perfil(args, "sequencial")
+        if melhor is not None:
+            motor, tamanho_bloco = melhor['motor'], melhor['tamanho_bloco']
+        else:
+            motor = motor_para(args)
+    executar_sequencial(args, motor, tamanho_bloco)
+
+
+def comando_paralelo(args):
+    # Cada opção não dada na linha de comando vem do perfil do autoajuste, se ele existir
+    if args.processos:
+        melhor = configuracao_do_perfil(args, "processos") or {}
+        executar_processos(args, args.trabalhadores or melhor.get('trabalhadores'))
+    else:
+        melhor = configuracao_do_perfil(args, "threads") or {}
+        executar_threads(args, args.trabalhadores or melhor.get('trabalhadores'),
+                         args.motor or melhor.get('motor') or motor_para(args),
+                         args.escalonamento or melhor.get('escalonamento') or "roubo")
+
+
+def comando_auto(args):
+    import autoajuste
+    configuracao = autoajuste.obter_configuracao(args.tamanho, args.regra, args.recalibrar, args.perfil)
+    modo = configuracao['modo']
+    if modo == "sequencial":
+        if args.instrumentar:
+            print("⚠️ --instrumentar não tem efeito: o perfil escolheu o modo sequencial, que não é instrumentado.")
+        executar_sequencial(args, configuracao['motor'], configuracao['tamanho_bloco'])
+    elif modo == "threads":
+        executar_threads(args, configuracao['trabalhadores'], configuracao['motor'], configuracao['escalonamento'])
+    else:
+        executar_processos(args, configuracao['trabalhadores'])
+
+
+def comando_servidor(args):
+    import servidor_distribuido as servidor
+    servidor.HOST, servidor.PORT = args.host, args.port
+    servidor.INSTRUMENTAR = args.instrumentar
+    servidor.REGRA = args.regra
+    servidor.GERACOES_POR_TROCA = args.geracoes_por_troca
+    aplicar_opcoes_simulacao(servidor, args)
+    servidor.executar_servidor(args.modo, args.tamanho, args.geracoes, args.clientes, not args.sem_clientes_locais)
+
+
+def comando_cliente(args):
+    import cliente_distribuido as cliente
+    if args.modo == "faixas":
+        print("[CLIENTE] MODO FAIXAS. Aguardando o Servidor...")
+        try:
+            cliente.cliente_worker_faixas(args.host, args.port, args.instrumentar, args.regra)
+        except ConnectionError as e:
+            print(f"[CLIENTE] ERRO: {e}", file=sys.stderr)
+            return 1
+    else:
+        print(f"[CLIENTE] MODO {args.modo}. Aguardando o Servidor...")
+        cliente.cliente_worker(args.host, args.port, motor_para(args), args.instrumentar, args.regra)
+
+
+def comando_analisar(args):
+    import analisador_final
+    return analisador_final.executar_analise()
+
+
+# --- MONTAGEM DOS ARGUMENTOS ---
+def regra_bs(texto):
+    """Tipo do argparse para --regra: valida e normaliza a regra B/S."""
+    from regras import normalizar_regra
+    try:
+        return normalizar_regra(texto)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+
+
+def criar_parser():
+    """Monta o argparse com um subcomando por modo de execução (com apelidos em inglês)."""
+    # Padrões repetidos aqui (em vez de lidos dos módulos) para o --help não importar nada
+    parser = argparse.ArgumentParser(prog="jogo_da_vida", description="Jogo da Vida: sequencial, paralelo e distribuído.")
+    sub = parser.add_subparsers(dest="comando", required=True)
+
+    def opcoes_regra(p):
+        p.add_argument("--regra", type=regra_bs, default="B3/S23",
+                       help="regra B/S, ex.: B36/S23 (padrão: B3/S23; outras pedem um motor que as aceite)")
+
+    def opcoes_simulacao(p):
+        p.add_argument("--tamanho", type=int, default=100, help="lado da grade (padrão: 100)")
+        p.add_argument("--geracoes", type=int, default=200, help="número de gerações (padrão: 200)")
+        opcoes_regra(p)
+        p.add_argument("--estatisticas", action="store_true",
+                       help="grava população, nascimentos, mortes e blocos ativos por geração em estatisticas_<modo>.csv")
+        p.add_argument("--checkpoint", type=int, default=0, metavar="N",
+                       help="grava um checkpoint a cada N gerações, para o --retomar (padrão: 0 = desligado; "
+                            "no servidor, só nos modos 1:1 e async)")
+
+    def opcoes_instrumentar(p):
+        p.add_argument("--instrumentar", action="store_true", help="tempo por fase + trace do Chrome")
+
+    def opcoes_perfil(p):
+        p.add_argument("--perfil", default="perfil_autoajuste.json",
+                       help="arquivo do perfil do autoajuste (se já mediu esta faixa, dá o padrão das opções não informadas)")
+
+    def opcoes_autoajuste(p):
+        p.add_argument("--recalibrar", action="store_true", help="refaz as sondas do autoajuste para esta faixa")
+        opcoes_perfil(p)
+
+    p = sub.add_parser("sequencial", aliases=["sequential"], help="simulação em um único núcleo")
+    opcoes_simulacao(p)
+    p.add_argument("--motor", help="'classico', 'auto' (o mais rápido do perfil) ou um motor de motores.py "
+                                   "(padrão: o do perfil, se existir; senão vetorizado, ou tabela em outras regras)")
+    p.add_argument("--retomar", metavar="ARQUIVO.ckpt", help="continua a partir de um checkpoint")
+    opcoes_autoajuste(p)
+    p.set_defaults(funcao=comando_sequencial)
+
+    p = sub.add_parser("auto", help="modo, motor, bloco e trabalhadores escolhidos pelo autoajuste desta máquina")
+    opcoes_simulacao(p)
+    opcoes_instrumentar(p)
+    p.add_argument("--retomar", metavar="ARQUIVO.ckpt", help="continua a partir de um checkpoint")
+    opcoes_autoajuste(p)
+    p.set_defaults(funcao=comando_auto)
+
+    p = sub.add_parser("paralelo", aliases=["parallel"], help="pool de threads (ou de processos com --processos)")
+    opcoes_simulacao(p)
+    p.add_argument("--trabalhadores", type=int, default=0,
+                   help="threads/processos (padrão: o do perfil, se existir; senão núcleos da CPU)")
+    p.add_argument("--processos", action="store_true", help="usa processos com memória compartilhada")
+    p.add_argument("--motor", help="'vetorizado', 'tabela' ou 'classico' (só threads; padrão: o do perfil, se existir)")
+    p.add_argument("--escalonamento", choices=["roubo", "faixas"],
+                   help="threads: blocos com roubo de trabalho ou faixas fixas (padrão: o do perfil; senão roubo)")
+    opcoes_instrumentar(p)
+    p.add_argument("--retomar", metavar="ARQUIVO.ckpt", help="continua a partir de um checkpoint")
+    opcoes_perfil(p)
+    p.set_defaults(funcao=comando_paralelo)
+
+    def opcoes_rede(p):
+        p.add_argument("--host", default="127.0.0.1")
+        p.add_argument("--port", type=int, default=65432)
+        p.add_argument("--modo", choices=["faixas", "async", "1:1"], default="faixas")
+        opcoes_instrumentar(p)
+
+    p = sub.add_parser("servidor", aliases=["server"], help="coordenador da simulação distribuída")
+    opcoes_simulacao(p)
+    opcoes_rede(p)
+    p.add_argument("--clientes", type=int, default=4, help="número de clientes (modos faixas e async)")
+    p.add_argument("--geracoes-por-troca", type=int, default=0, metavar="K",
+                   help="modo faixas: gerações por troca de halos (padrão: 0 = automático)")
+    p.add_argument("--sem-clientes-locais", action="store_true", help="espera clientes externos em vez de lançá-los")
+    p.set_defaults(funcao=comando_servidor)
+
+    p = sub.add_parser("cliente", aliases=["worker"], help="trabalhador da simulação distribuída")
+    opcoes_rede(p)
+    opcoes_regra(p)
+    p.add_argument("--motor", help="motor usado nos modos 1:1 e async (padrão: vetorizado; tabela em outras regras)")
+    p.set_defaults(funcao=comando_cliente)
+
+    p = sub.add_parser("analisar", aliases=["analyze"], help="gera imagens e gráficos de comparação")
+    p.set_defaults(funcao=comando_analisar)
+    return parser
+
+
+def main(argv=None):
+    args = criar_parser().parse_args(argv)
+    return args.funcao(args) or 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
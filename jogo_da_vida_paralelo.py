@@ -1,19 +1,41 @@
 import numpy as np
 import time
-import matplotlib.pyplot as plt 
-from matplotlib.colors import ListedColormap
 import threading # Módulo essencial para paralelismo com threads
 import os        # Para descobrir o número de CPUs e manipular arquivos
+from functools import partial
+from motor_vetorizado import calcular_faixa_vetorizada, calcular_bloco_vetorizado, dividir_faixas
+from escalonador import EscalonadorRoubo
+from motores import verificar_regra_fixa
+from regras import normalizar_regra, obter_tabela, tabela_para
+from instrumentacao import criar_rastreador, RASTREADOR_NULO
+from checkpoint import talvez_salvar_checkpoint, retomar_ou_inicializar
+from historico import criar_gravador
+from estatisticas import criar_serie, ContagemFaixa, linha_da_faixa, juntar_faixas, largura_linha_faixa
+from ciclos import criar_detector
+from renderizacao import salvar_imagem, LIMITE_MATPLOTLIB
 
 # --- PARÂMETROS GLOBAIS DA SIMULAÇÃO ---
 TAMANHO_GRADE = 100 
 NUM_GERACOES = 200 
 NOME_ARQUIVO_IMAGEM = "estado_final_jogo_da_vida_paralelo.png"
+MOTOR = "vetorizado" # "vetorizado" (NumPy por faixa), "tabela" (qualquer regra B/S) ou "classico" (laço célula a célula)
+REGRA = "B3/S23"     # Regra B/S: "vetorizado" e "tabela" aceitam qualquer uma; "classico" só a padrão
+INSTRUMENTAR = False # Tempo por fase (criação de threads, cálculo, espera) -> trace + tabela
+TRACE_FILE = "trace_paralelo.json"
+INTERVALO_CHECKPOINT = 0 # Salva um checkpoint a cada N gerações (0 = desligado)
+ARQUIVO_CHECKPOINT = "checkpoint_paralelo.ckpt"
+GRAVAR_HISTORICO = False # Grava todas as gerações (quadros-chave + deltas) em ARQUIVO_HISTORICO
+ARQUIVO_HISTORICO = "historico_paralelo.hist"
+DETECTAR_CICLOS = False # Para ao detectar tabuleiro estável/ciclo e salta direto para a última geração
+ESTATISTICAS = False # Grava população, nascimentos, mortes e blocos ativos por geração em ARQUIVO_ESTATISTICAS
+ARQUIVO_ESTATISTICAS = "estatisticas_paralelo.csv" # .csv ou .bin
+ESCALONAMENTO = "roubo" # "roubo" (blocos pequenos + roubo de trabalho) ou "faixas" (uma faixa fixa por thread)
+TAMANHO_BLOCO_ESCALONADOR = None # Lado dos blocos do modo "roubo" (None = automático, ver escalonador.py)
+TIMEOUT_BARREIRA = 600 # Segundos que o coordenador espera as threads numa barreira (None = sem limite)
 
 # Configuração do Paralelismo
 # Determina o número de threads com base nos núcleos lógicos da CPU
 NUM_THREADS = os.cpu_count() or 4 
-print(f"Utilizando {NUM_THREADS} threads para paralelização.")
 
 
 # FUNÇÃO 1: INICIALIZAÇÃO 
@@ -38,7 +60,14 @@ def contar_vizinhos_vivos(grade, i, j, tamanho):
 #  FUNÇÃO 4: VISUALIZAÇÃO
 def salvar_grade_como_imagem(grade, nome_arquivo):
     """Converte o estado final da grade em uma imagem PNG customizada (Preto/Branco)."""
-    
+    if grade.size > LIMITE_MATPLOTLIB:
+        # Grade grande: 1 pixel por célula, gravado por faixas (rápido e com memória limitada)
+        salvar_imagem(grade, nome_arquivo)
+        return
+    # Importado aqui: só quem gera imagem paga o custo de carregar o matplotlib
+    import matplotlib.pyplot as plt
+    from matplotlib.colors import ListedColormap
+
     # Define as cores: Preto (Morto, 0) e Branco (Vivo, 1)
     cores = ['black', 'white'] 
     cmap_personalizado = ListedColormap(cores)
@@ -86,65 +115,247 @@ def worker_calcular_linhas(grade_atual, nova_grade, tamanho, linha_inicio, linha
     # Como as threads trabalham em fatias diferentes, não há conflito de escrita (Race Condition).
 
 
-# --- FUNÇÃO DE COORDENAÇÃO (SUBSTITUI proxima_geracao) ---
-def proxima_geracao_paralela(grade_atual, tamanho, num_threads):
+def worker_calcular_linhas_vetorizado(grade_atual, nova_grade, tamanho, linha_inicio, linha_fim, tabela=None,
+                                      contagem=None):
     """
-    Coordena a criação e sincronização das threads para calcular a próxima geração.
+    Versão vetorizada do trabalhador: calcula a faixa inteira com NumPy.
+    As operações do NumPy liberam o GIL, então as threads podem de fato rodar juntas.
+    Com 'tabela' (regras.TabelaRegra), calcula outra regra B/S; com 'contagem'
+    (estatisticas.ContagemFaixa), conta as estatísticas da faixa durante o cálculo.
     """
-    # Cria a nova grade de destino
-    nova_grade = np.zeros((tamanho, tamanho), dtype=np.int8)
-    threads = []
-    
-    # 1. Divisão do Trabalho
-    linhas_por_thread = tamanho // num_threads  #Se a grade é 100x100 e num_threads é 4, cada fatia terá 25 linhas.
+    calcular_faixa_vetorizada(grade_atual, nova_grade, linha_inicio, linha_fim, tabela, contagem)
 
-    # 2. Criação e Início das Threads
-    for k in range(num_threads):
-        linha_inicio = k * linhas_por_thread
-        
-        # O último thread pega o restante das linhas para garantir que tudo seja processado.
-        if k == num_threads - 1:
-            linha_fim = tamanho 
+
+def worker_calcular_bloco(grade_atual, nova_grade, linha_inicio, linha_fim, coluna_inicio, coluna_fim):
+    """Trabalhador clássico para um bloco retangular (usado pelo escalonador de blocos)."""
+    tamanho = grade_atual.shape[0]
+    nova_grade[linha_inicio:linha_fim, coluna_inicio:coluna_fim] = 0 # Buffer reaproveitado: só as vivas são escritas
+    for i in range(linha_inicio, linha_fim):
+        for j in range(coluna_inicio, coluna_fim):
+            vivos = contar_vizinhos_vivos(grade_atual, i, j, tamanho)
+            if vivos == 3 or (vivos == 2 and grade_atual[i, j] == 1):
+                nova_grade[i, j] = 1
+
+
+# --- POOL PERSISTENTE DE THREADS (SUBSTITUI proxima_geracao no laço) ---
+class PoolThreads:
+    """
+    Cria as threads UMA vez e as reaproveita em todas as gerações.
+    Entre gerações as threads esperam numa 'threading.Barrier' e trocam os papéis
+    de dois buffers pré-alocados (atual / próxima): nada de criar threads nem
+    alocar 'nova_grade' a cada geração.
+
+    Com escalonamento "roubo", cada geração é repartida em blocos pelo EscalonadorRoubo
+    (pula blocos parados, equilibra pelo custo medido e rouba trabalho); com "faixas",
+    cada thread fica sempre com a mesma faixa de linhas.
+    """
+
+    def __init__(self, grade, num_threads, motor=MOTOR, rastreador=RASTREADOR_NULO, escalonamento=None, regra=None):
+        self.rastreador = rastreador
+        escalonamento = escalonamento or ESCALONAMENTO
+        self.regra = normalizar_regra(regra or REGRA)
+        tamanho = grade.shape[0]
+        if escalonamento == "roubo":
+            self.escalonador = EscalonadorRoubo(*grade.shape, num_threads, TAMANHO_BLOCO_ESCALONADOR)
+            self.num_threads = num_threads
+        elif escalonamento == "faixas":
+            self.escalonador = None
+            faixas = dividir_faixas(tamanho, num_threads)
+            self.num_threads = len(faixas)
         else:
-            linha_fim = linha_inicio + linhas_por_thread
-            
-        # Cria a thread e atribui a função worker e seus argumentos (o intervalo de linhas)
-        thread = threading.Thread(
-            target=worker_calcular_linhas, 
-            args=(grade_atual, nova_grade, tamanho, linha_inicio, linha_fim)
-        )
-        threads.append(thread)
-        thread.start() # Inicia a execução em paralelo
-        
-    # 3. Sincronização (Join)
-    # O programa principal PAUSA aqui até que TODAS as threads terminem o seu trabalho.
-    for thread in threads:
-        thread.join() 
-        
-    return nova_grade
+            raise ValueError(f"Escalonamento desconhecido: '{escalonamento}'. Opções: faixas, roubo")
+
+        # Buffers duplos: a grade atual e a de destino
+        self._grades = [grade.copy(), np.zeros_like(grade)]
+        self._atual = 0
+        self._parar = False
+        self._contagens = None # Faixas: uma ContagemFaixa por thread, depois de 'ativar_contadores'
+        self._erro = None # Exceção da thread que falhou (relançada por 'passo')
+
+        # Trabalhadores + coordenador passam pela mesma barreira
+        self._barreira = threading.Barrier(self.num_threads + 1)
+
+        if motor in ("vetorizado", "tabela"):
+            # "tabela" força a tabela compilada até no B3/S23; "vetorizado" só a usa em outras regras
+            tabela = obter_tabela(self.regra) if motor == "tabela" else tabela_para(self.regra)
+            trabalhador = partial(worker_calcular_linhas_vetorizado, tabela=tabela)
+            calcular_bloco = partial(calcular_bloco_vetorizado, tabela=tabela)
+        else:
+            verificar_regra_fixa(motor, self.regra)
+            trabalhador = worker_calcular_linhas
+            calcular_bloco = worker_calcular_bloco
+        self._faixas = faixas if self.escalonador is None and trabalhador is not worker_calcular_linhas else None
+
+        if self.escalonador is not None:
+            tarefas = [(self._laco_trabalhador_roubo, (calcular_bloco, k)) for k in range(self.num_threads)]
+        else:
+            tarefas = [(self._laco_trabalhador, (trabalhador, tamanho, linha_inicio, linha_fim, k))
+                       for k, (linha_inicio, linha_fim) in enumerate(faixas)]
+
+        self._threads = []
+        with rastreador.fase("criar_threads"):
+            for alvo, args in tarefas:
+                thread = threading.Thread(target=self._proteger, args=(alvo, *args), daemon=True)
+                self._threads.append(thread)
+                thread.start()
+
+    def _proteger(self, laco, *args):
+        """
+        Roda o laço de uma thread. Se ele falhar, guarda a exceção e aborta a barreira:
+        o coordenador e as outras threads recebem BrokenBarrierError em vez de esperar para sempre.
+        """
+        try:
+            laco(*args)
+        except threading.BrokenBarrierError:
+            pass # Outra parte abortou a barreira: só encerra
+        except BaseException as erro:
+            self._erro = erro
+            self._barreira.abort()
+
+    def _laco_trabalhador(self, trabalhador, tamanho, linha_inicio, linha_fim, indice):
+        """Laço de vida longa de cada thread: uma faixa de linhas por geração."""
+        while True:
+            self._barreira.wait() # Início da geração
+            if self._parar:
+                break
+            grade_atual = self._grades[self._atual]
+            nova_grade = self._grades[1 - self._atual]
+            with self.rastreador.fase("calcular"):
+                if trabalhador is worker_calcular_linhas:
+                    # O trabalhador clássico só escreve as células vivas: limpa a faixa reaproveitada
+                    nova_grade[linha_inicio:linha_fim] = 0
+                if self._contagens is not None:
+                    contagem = self._contagens[indice]
+                    trabalhador(grade_atual, nova_grade, tamanho, linha_inicio, linha_fim, contagem=contagem)
+                    self._linhas_contadores[indice] = linha_da_faixa(contagem.concluir())
+                else:
+                    trabalhador(grade_atual, nova_grade, tamanho, linha_inicio, linha_fim)
+            with self.rastreador.fase("esperar_barreira"):
+                self._barreira.wait() # Fim da geração
+
+    def _laco_trabalhador_roubo(self, calcular_bloco, trabalhador):
+        """Laço de vida longa de cada thread no modo "roubo": blocos até as filas esvaziarem."""
+        while True:
+            self._barreira.wait() # Início da geração
+            if self._parar:
+                break
+            with self.rastreador.fase("calcular"):
+                self.escalonador.executar(trabalhador, calcular_bloco,
+                                          self._grades[self._atual], self._grades[1 - self._atual])
+            with self.rastreador.fase("esperar_barreira"):
+                self._barreira.wait() # Fim da geração
+
+    @property
+    def grade(self):
+        """Visão (sem cópia) da grade da geração atual."""
+        return self._grades[self._atual]
+
+    @property
+    def grade_anterior(self):
+        """Visão da grade da geração anterior (válida até o próximo passo)."""
+        return self._grades[1 - self._atual]
+
+    def ativar_contadores(self):
+        """
+        As estatísticas passam a sair do próprio cálculo (estatisticas.py): por bloco no
+        escalonador, ou por faixa no núcleo vetorizado. O trabalhador clássico não conta.
+        """
+        if self.escalonador is not None:
+            self.escalonador.ativar_contadores(self.grade)
+        elif self._faixas is not None:
+            colunas = self.grade.shape[1]
+            self._contagens = [ContagemFaixa(inicio, fim, colunas) for inicio, fim in self._faixas]
+            self._linhas_contadores = np.zeros((len(self._faixas), largura_linha_faixa(colunas)), dtype=np.int64)
+
+    @property
+    def contadores(self):
+        """Contadores da última geração (nas faixas, o mapa de atividade tem uma linha por thread), ou None."""
+        if self.escalonador is not None:
+            return self.escalonador.contadores
+        return juntar_faixas(self._linhas_contadores) if self._contagens is not None else None
+
+    def passo(self):
+        """
+        Avança uma geração: libera as threads e espera todas terminarem.
+        Se uma thread falhar, relança a exceção dela; se a geração passar de TIMEOUT_BARREIRA,
+        levanta BrokenBarrierError. Nos dois casos o pool fica inutilizável (só 'fechar').
+        """
+        with self.rastreador.fase("passo"):
+            if self.escalonador is not None:
+                self.escalonador.preparar()
+            try:
+                self._barreira.wait(TIMEOUT_BARREIRA)
+                self._barreira.wait(TIMEOUT_BARREIRA)
+            except threading.BrokenBarrierError:
+                self._barreira.abort() # Ninguém mais fica preso nesta barreira
+                if self._erro is not None:
+                    raise self._erro
+                raise
+            if self.escalonador is not None:
+                self.escalonador.concluir()
+        self._atual = 1 - self._atual
+
+    def fechar(self):
+        """Sinaliza o fim e espera as threads terminarem."""
+        if self._threads:
+            self._parar = True
+            try:
+                self._barreira.wait(TIMEOUT_BARREIRA)
+            except threading.BrokenBarrierError:
+                pass # Barreira abortada (falha em 'passo'): as threads já estão saindo
+            for thread in self._threads:
+                thread.join(TIMEOUT_BARREIRA)
+            self._threads = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fechar()
 
 
 # --- FUNÇÃO PRINCIPAL DE SIMULAÇÃO ---
 
-def simular_jogo_da_vida_paralelo(tamanho, num_geracoes, num_threads):
+def simular_jogo_da_vida_paralelo(tamanho, num_geracoes, num_threads, motor=MOTOR, retomar_de=None, regra=REGRA):
     """
     Controla o fluxo da simulação paralela e mede o tempo.
+    Com 'retomar_de' (arquivo .ckpt), continua de onde o checkpoint parou até 'num_geracoes'.
     """
+    rastreador = criar_rastreador("paralelo (threads)", INSTRUMENTAR)
     start_time = time.time()
     
-    grade_atual = inicializar_grade(tamanho)
+    grade_atual, geracao_inicial, regra = retomar_ou_inicializar(retomar_de, tamanho, inicializar_grade, regra)
+    tamanho = grade_atual.shape[0]
+    detector = criar_detector(DETECTAR_CICLOS)
     
-    print(f"--- Início da Simulação Paralela ({tamanho}x{tamanho}, {num_geracoes} gerações, {num_threads} threads) ---")
+    print(f"--- Início da Simulação Paralela ({tamanho}x{tamanho}, {num_geracoes} gerações, {num_threads} threads, motor {motor}, regra {regra}) ---")
     
-    # Loop principal das gerações, usando a função PARALELA
-    for geracao in range(num_geracoes):
-        grade_atual = proxima_geracao_paralela(grade_atual, tamanho, num_threads)
+    # Loop principal das gerações, usando o POOL PERSISTENTE de threads
+    with PoolThreads(grade_atual, num_threads, motor, rastreador, regra=regra) as pool, \
+            criar_gravador(ARQUIVO_HISTORICO, *grade_atual.shape, GRAVAR_HISTORICO) as gravador, \
+            criar_serie(ARQUIVO_ESTATISTICAS, ESTATISTICAS) as serie:
+        gravador.registrar(geracao_inicial, pool.grade)
+        detector.observar(geracao_inicial, pool.grade)
+        serie.acompanhar(pool)
+        for geracao in range(geracao_inicial + 1, num_geracoes + 1):
+            pool.passo()
+            serie.registrar(geracao, pool.grade_anterior, pool.grade, pool)
+            talvez_salvar_checkpoint(ARQUIVO_CHECKPOINT, pool.grade, geracao, INTERVALO_CHECKPOINT, regra=pool.regra)
+            gravador.registrar(geracao, pool.grade)
+            if detector.observar(geracao, pool.grade):
+                break
+        grade_atual = pool.grade.copy()
+        if pool.escalonador is not None:
+            pool.escalonador.imprimir_resumo()
+    grade_atual = detector.avancar_ate(num_geracoes, grade_atual)
         
     end_time = time.time()
     tempo_total = end_time - start_time
     
     # Salva o tempo no arquivo de comparação
     salvar_tempo_em_arquivo("Paralela (Threads)", tempo_total)
+    rastreador.imprimir_resumo()
+    rastreador.salvar_trace(TRACE_FILE)
     
     # Gera a visualização
     salvar_grade_como_imagem(grade_atual, NOME_ARQUIVO_IMAGEM)
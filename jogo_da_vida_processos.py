@@ -0,0 +1,243 @@
+import numpy as np
+import time
+import os
+import threading # Só pela exceção BrokenBarrierError (a mesma da barreira de multiprocessing)
+import multiprocessing as mp
+from multiprocessing import shared_memory # Memória compartilhada entre PROCESSOS (sem GIL)
+from motor_vetorizado import calcular_faixa_vetorizada, dividir_faixas
+from jogo_da_vida_sequencial import inicializar_grade, salvar_grade_como_imagem, salvar_tempo_em_arquivo
+from checkpoint import talvez_salvar_checkpoint, retomar_ou_inicializar
+from ciclos import criar_detector
+from instrumentacao import criar_rastreador, mesclar_traces, RASTREADOR_NULO
+from estatisticas import criar_serie, ContagemFaixa, linha_da_faixa, juntar_faixas, largura_linha_faixa
+from regras import REGRA_PADRAO, normalizar_regra, tabela_para
+
+# --- PARÂMETROS GLOBAIS DA SIMULAÇÃO ---
+TAMANHO_GRADE = 100
+NUM_GERACOES = 200
+NOME_ARQUIVO_IMAGEM = "estado_final_jogo_da_vida_processos.png"
+INTERVALO_CHECKPOINT = 0 # Salva um checkpoint a cada N gerações (0 = desligado)
+ARQUIVO_CHECKPOINT = "checkpoint_processos.ckpt"
+DETECTAR_CICLOS = False # Para ao detectar tabuleiro estável/ciclo e salta direto para a última geração
+ESTATISTICAS = False # Grava população, nascimentos, mortes e blocos ativos por geração em ARQUIVO_ESTATISTICAS
+ARQUIVO_ESTATISTICAS = "estatisticas_processos.csv" # .csv ou .bin
+REGRA = "B3/S23" # Regra B/S (outras regras usam a tabela compilada de regras.py)
+INSTRUMENTAR = False # Tempo por fase no coordenador e em cada processo -> trace combinado + tabela
+TRACE_FILE = "trace_processos.json"
+TRACE_TRABALHADOR = "trace_processo_{}.json" # Trace de cada processo (pelo índice), mesclado em TRACE_FILE
+
+TIMEOUT_BARREIRA = 600 # Segundos que o coordenador espera os processos numa barreira (None = sem limite)
+
+# Um processo por núcleo lógico: cada processo tem seu próprio interpretador (e seu próprio GIL)
+NUM_PROCESSOS = os.cpu_count() or 4
+
+
+# --- FUNÇÃO EXECUTADA POR CADA PROCESSO TRABALHADOR ---
+def trabalhador_processo(nomes_memorias, forma, linha_inicio, linha_fim, barreira, parar, regra=REGRA_PADRAO,
+                         contar=None, forma_contadores=(1, 1), indice=0, instrumentar=False):
+    """
+    Processo de vida longa responsável pelas linhas [linha_inicio, linha_fim).
+    As duas grades (atual e próxima) moram em memória compartilhada: nada é serializado
+    entre gerações. A cada geração o processo espera o sinal de início na barreira,
+    calcula sua faixa, troca os buffers e espera na barreira de fim.
+    Com 'contar' ligado, conta as estatísticas da faixa durante o cálculo e as escreve na
+    linha 'indice' da terceira memória compartilhada (a tabela 'forma_contadores' de contadores).
+    Se o cálculo falhar, aborta a barreira para o coordenador não esperar para sempre.
+    Com 'instrumentar', mede as próprias fases e grava o trace em TRACE_TRABALHADOR ao encerrar.
+    """
+    rastreador = criar_rastreador(f"processo {indice}", instrumentar)
+    memorias = []
+    grades = contadores = None
+    try:
+        tabela = tabela_para(regra) # Montada no próprio processo (só a regra atravessa o pickle)
+        memorias = [shared_memory.SharedMemory(name=nome) for nome in nomes_memorias]
+        grades = [np.ndarray(forma, dtype=np.int8, buffer=m.buf) for m in memorias[:2]]
+        contadores = np.ndarray(forma_contadores, dtype=np.int64, buffer=memorias[2].buf)
+        contagem = None
+        atual = 0
+        while True:
+            barreira.wait() # Início da geração
+            if parar.value:
+                break
+            if contar is not None and contar.value and contagem is None:
+                contagem = ContagemFaixa(linha_inicio, linha_fim, forma[1])
+            with rastreador.fase("calcular"):
+                calcular_faixa_vetorizada(grades[atual], grades[1 - atual], linha_inicio, linha_fim, tabela, contagem)
+                if contagem is not None:
+                    contadores[indice] = linha_da_faixa(contagem.concluir())
+            atual = 1 - atual
+            with rastreador.fase("esperar_barreira"):
+                barreira.wait() # Fim da geração: todas as faixas estão prontas
+        rastreador.salvar_trace(TRACE_TRABALHADOR.format(indice))
+    except threading.BrokenBarrierError:
+        pass # O coordenador ou outro processo abortou a barreira: só encerra
+    except BaseException:
+        barreira.abort() # Libera o coordenador; o erro sai no stderr deste processo
+        raise
+    finally:
+        del grades, contadores # Solta as visões antes de fechar a memória
+        for m in memorias:
+            m.close()
+
+
+# --- COORDENADOR: POOL PERSISTENTE DE PROCESSOS ---
+class PoolProcessos:
+    """
+    Mantém os processos trabalhadores vivos durante toda a simulação.
+    Uso:
+        with PoolProcessos(grade, num_processos) as pool:
+            for _ in range(num_geracoes):
+                pool.passo()
+            grade_final = pool.grade.copy()
+    """
+
+    def __init__(self, grade, num_processos, regra=REGRA_PADRAO, rastreador=RASTREADOR_NULO):
+        forma = grade.shape
+        self.rastreador = rastreador
+        self.regra = normalizar_regra(regra)
+        faixas = dividir_faixas(forma[0], num_processos)
+        self.num_processos = len(faixas)
+
+        # 1. Buffers duplos em memória compartilhada, mais a tabela de contadores das estatísticas
+        forma_contadores = (self.num_processos, largura_linha_faixa(forma[1])) # Uma linha por faixa
+        self._memorias = [shared_memory.SharedMemory(create=True, size=max(grade.nbytes, 1)) for _ in range(2)]
+        self._memorias.append(shared_memory.SharedMemory(create=True, size=8 * forma_contadores[0] * forma_contadores[1]))
+        self._grades = [np.ndarray(forma, dtype=np.int8, buffer=m.buf) for m in self._memorias[:2]]
+        self._grades[0][:] = grade
+        self._contadores = np.ndarray(forma_contadores, dtype=np.int64, buffer=self._memorias[2].buf)
+        self._atual = 0
+
+        # 2. Sincronização: os trabalhadores + o coordenador passam pela mesma barreira
+        self._barreira = mp.Barrier(self.num_processos + 1)
+        self._parar = mp.Value('b', 0)
+        self._contar = mp.Value('b', 0)
+
+        # 3. Criação dos processos (uma única vez); cada um mede as próprias fases se o pool for instrumentado
+        nomes = [m.name for m in self._memorias]
+        instrumentar = rastreador is not RASTREADOR_NULO
+        self._processos = []
+        with rastreador.fase("criar_processos"):
+            for indice, (linha_inicio, linha_fim) in enumerate(faixas):
+                processo = mp.Process(
+                    target=trabalhador_processo,
+                    args=(nomes, forma, linha_inicio, linha_fim, self._barreira, self._parar, self.regra,
+                          self._contar, forma_contadores, indice, instrumentar),
+                    daemon=True,
+                )
+                processo.start()
+                self._processos.append(processo)
+
+    @property
+    def grade(self):
+        """Visão (sem cópia) da grade da geração atual."""
+        return self._grades[self._atual]
+
+    @property
+    def grade_anterior(self):
+        """Visão da grade da geração anterior (válida até o próximo passo)."""
+        return self._grades[1 - self._atual]
+
+    def ativar_contadores(self):
+        """Os trabalhadores passam a contar as estatísticas das suas faixas durante o cálculo (estatisticas.py)."""
+        self._contar.value = 1
+
+    @property
+    def contadores(self):
+        """Contadores da última geração (o mapa de atividade tem uma linha por processo), ou None."""
+        return juntar_faixas(self._contadores) if self._contar.value else None
+
+    def passo(self):
+        """
+        Avança uma geração: libera os trabalhadores e espera todos terminarem.
+        Se um processo falhar ou a geração passar de TIMEOUT_BARREIRA, levanta RuntimeError
+        e o pool fica inutilizável (só 'fechar').
+        """
+        try:
+            with self.rastreador.fase("passo"):
+                self._barreira.wait(TIMEOUT_BARREIRA)
+                self._barreira.wait(TIMEOUT_BARREIRA)
+        except threading.BrokenBarrierError as erro:
+            self._barreira.abort() # Ninguém mais fica preso nesta barreira
+            raise RuntimeError(f"Um processo trabalhador falhou (ver o erro dele acima) ou passou de "
+                               f"{TIMEOUT_BARREIRA} s na geração") from erro
+        self._atual = 1 - self._atual
+
+    def fechar(self):
+        """Encerra os processos e libera a memória compartilhada."""
+        if self._processos:
+            self._parar.value = 1
+            try:
+                self._barreira.wait(TIMEOUT_BARREIRA)
+            except threading.BrokenBarrierError:
+                pass # Barreira abortada (falha em 'passo'): os processos já estão saindo
+            for processo in self._processos:
+                processo.join(TIMEOUT_BARREIRA)
+                if processo.is_alive():
+                    processo.terminate() # Travado fora da barreira: não segura o encerramento
+                    processo.join()
+            self._processos = []
+        if self._memorias:
+            del self._grades, self._contadores
+            for m in self._memorias:
+                m.close()
+                m.unlink()
+            self._memorias = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fechar()
+
+
+# --- FUNÇÃO PRINCIPAL DE SIMULAÇÃO ---
+def simular_jogo_da_vida_processos(tamanho, num_geracoes, num_processos, retomar_de=None, regra=REGRA):
+    """
+    Controla o fluxo da simulação com processos e mede o tempo.
+    Com 'retomar_de' (arquivo .ckpt), continua de onde o checkpoint parou até 'num_geracoes'.
+    """
+    rastreador = criar_rastreador("paralelo (processos)", INSTRUMENTAR)
+    start_time = time.time()
+
+    grade_atual, geracao_inicial, regra = retomar_ou_inicializar(retomar_de, tamanho, inicializar_grade, regra)
+    tamanho = grade_atual.shape[0]
+    detector = criar_detector(DETECTAR_CICLOS)
+
+    print(f"--- Início da Simulação Paralela ({tamanho}x{tamanho}, {num_geracoes} gerações, {num_processos} processos, regra {normalizar_regra(regra)}) ---")
+
+    with PoolProcessos(grade_atual, num_processos, regra, rastreador) as pool, \
+            criar_serie(ARQUIVO_ESTATISTICAS, ESTATISTICAS) as serie:
+        detector.observar(geracao_inicial, pool.grade)
+        serie.acompanhar(pool) # Cada processo conta a sua faixa durante o cálculo
+        for geracao in range(geracao_inicial + 1, num_geracoes + 1):
+            pool.passo()
+            serie.registrar(geracao, pool.grade_anterior, pool.grade, pool)
+            talvez_salvar_checkpoint(ARQUIVO_CHECKPOINT, pool.grade, geracao, INTERVALO_CHECKPOINT, regra=pool.regra)
+            if detector.observar(geracao, pool.grade):
+                break
+        grade_atual = pool.grade.copy()
+    grade_atual = detector.avancar_ate(num_geracoes, grade_atual)
+
+    end_time = time.time()
+    tempo_total = end_time - start_time
+
+    # Salva o tempo no arquivo de comparação
+    salvar_tempo_em_arquivo("Paralela (Processos)", tempo_total)
+    rastreador.imprimir_resumo()
+    if INSTRUMENTAR:
+        rastreador.salvar_trace(TRACE_FILE)
+        # Coordenador + um trace por processo (gravados ao encerrar o pool) numa linha do tempo só
+        mesclar_traces([TRACE_FILE] + [TRACE_TRABALHADOR.format(k) for k in range(pool.num_processos)], TRACE_FILE)
+
+    # Gera a visualização
+    salvar_grade_como_imagem(grade_atual, NOME_ARQUIVO_IMAGEM)
+
+    print(f"\n--- Fim da Simulação ---")
+    print(f"Tempo total de execução PARALELA (processos): {tempo_total:.4f} segundos")
+    print(f"Células vivas restantes: {np.sum(grade_atual)}")
+    print(f"IMAGEM SALVA: Verifique o arquivo '{NOME_ARQUIVO_IMAGEM}' na pasta do projeto.")
+
+    return tempo_total
+
+if __name__ == "__main__":
+    simular_jogo_da_vida_processos(TAMANHO_GRADE, NUM_GERACOES, NUM_PROCESSOS)
@@ -1,13 +1,27 @@
 import numpy as np
 import time
-import matplotlib.pyplot as plt # Importa a biblioteca para gerar imagens
-from matplotlib.colors import ListedColormap
 import os
+from motores import obter_motor, verificar_regra_fixa
+from regras import normalizar_regra
+from checkpoint import talvez_salvar_checkpoint, retomar_ou_inicializar
+from historico import criar_gravador
+from estatisticas import criar_serie
+from ciclos import criar_detector
+from renderizacao import salvar_imagem, LIMITE_MATPLOTLIB
 
 # --- PARÂMETROS GLOBAIS DA SIMULAÇÃO ---
 TAMANHO_GRADE = 100 # matriz(100x100)
 NUM_GERACOES = 200  # Número de iterações
 NOME_ARQUIVO_IMAGEM = "estado_final_jogo_da_vida_sequencial.png"
+MOTOR = "vetorizado" # "classico" (laço célula a célula) ou um dos motores de motores.py
+REGRA = "B3/S23"     # Regra B/S; outras regras (ex.: "B36/S23") pedem MOTOR = "vetorizado" ou "tabela"
+INTERVALO_CHECKPOINT = 0 # Salva um checkpoint a cada N gerações (0 = desligado)
+ARQUIVO_CHECKPOINT = "checkpoint_sequencial.ckpt"
+GRAVAR_HISTORICO = False # Grava todas as gerações (quadros-chave + deltas) em ARQUIVO_HISTORICO
+ARQUIVO_HISTORICO = "historico_sequencial.hist"
+DETECTAR_CICLOS = False # Para ao detectar tabuleiro estável/ciclo e salta direto para a última geração
+ESTATISTICAS = False # Grava população, nascimentos, mortes e blocos ativos por geração em ARQUIVO_ESTATISTICAS
+ARQUIVO_ESTATISTICAS = "estatisticas_sequencial.csv" # .csv ou .bin
 
 
 # FUNÇÃO 1: INICIALIZAÇÃO 
@@ -83,7 +97,14 @@ def proxima_geracao(grade_atual, tamanho):
 #  FUNÇÃO 4: VISUALIZAÇÃO
 def salvar_grade_como_imagem(grade, nome_arquivo):
     """Converte o estado final da grade em uma imagem PNG customizada (Preto/Branco)."""
-    
+    if grade.size > LIMITE_MATPLOTLIB:
+        # Grade grande: 1 pixel por célula, gravado por faixas (rápido e com memória limitada)
+        salvar_imagem(grade, nome_arquivo)
+        return
+    # Importado aqui: só quem gera imagem paga o custo de carregar o matplotlib
+    import matplotlib.pyplot as plt
+    from matplotlib.colors import ListedColormap
+
     # Define as cores: Preto (Morto, 0) e Branco (Vivo, 1)
     cores = ['black', 'white'] 
     cmap_personalizado = ListedColormap(cores)
@@ -110,19 +131,43 @@ def salvar_tempo_em_arquivo(algoritmo, tempo):
         print(f"❌ ERRO ao salvar o tempo: {e}")
 
 #  FUNÇÃO 6: EXECUÇÃO PRINCIPAL
-def simular_jogo_da_vida_sequencial(tamanho, num_geracoes):
+def simular_jogo_da_vida_sequencial(tamanho, num_geracoes, motor=MOTOR, retomar_de=None, regra=REGRA,
+                                    tamanho_bloco=None):
     """
     Controla o fluxo da simulação e registra o tempo.
+    Com 'retomar_de' (arquivo .ckpt), continua de onde o checkpoint parou até 'num_geracoes'.
+    'tamanho_bloco' vale só para os motores "blocos" e "tabela" (None = o lado padrão).
     """
+    # Escolhe a função que calcula cada geração
+    regra = normalizar_regra(regra)
+    if motor == "classico":
+        verificar_regra_fixa(motor, regra)
+        calcular_geracao = proxima_geracao
+    else:
+        calcular_geracao = obter_motor(motor, regra, tamanho_bloco)
+
     start_time = time.time() # Inicia o cronômetro
 
-    grade_atual = inicializar_grade(tamanho)
+    grade_atual, geracao_inicial, regra = retomar_ou_inicializar(retomar_de, tamanho, inicializar_grade, regra)
+    tamanho = grade_atual.shape[0]
+    detector = criar_detector(DETECTAR_CICLOS)
 
-    print(f"--- Início da Simulação Sequencial ({tamanho}x{tamanho}, {num_geracoes} gerações) ---")
+    print(f"--- Início da Simulação Sequencial ({tamanho}x{tamanho}, {num_geracoes} gerações, motor {motor}, regra {regra}) ---")
 
     # Loop principal das gerações
-    for geracao in range(num_geracoes):
-        grade_atual = proxima_geracao(grade_atual, tamanho)
+    with criar_gravador(ARQUIVO_HISTORICO, *grade_atual.shape, GRAVAR_HISTORICO) as gravador, \
+            criar_serie(ARQUIVO_ESTATISTICAS, ESTATISTICAS) as serie:
+        gravador.registrar(geracao_inicial, grade_atual)
+        detector.observar(geracao_inicial, grade_atual)
+        serie.acompanhar(calcular_geracao)
+        for geracao in range(geracao_inicial + 1, num_geracoes + 1):
+            grade_anterior, grade_atual = grade_atual, calcular_geracao(grade_atual, tamanho)
+            serie.registrar(geracao, grade_anterior, grade_atual, calcular_geracao)
+            talvez_salvar_checkpoint(ARQUIVO_CHECKPOINT, grade_atual, geracao, INTERVALO_CHECKPOINT, regra=regra)
+            gravador.registrar(geracao, grade_atual)
+            if detector.observar(geracao, grade_atual):
+                break
+    grade_atual = detector.avancar_ate(num_geracoes, grade_atual)
 
     end_time = time.time() # Para o cronômetro
     tempo_total = end_time - start_time
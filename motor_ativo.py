@@ -0,0 +1,94 @@
+import numpy as np
+from motor_vetorizado import calcular_bloco_vetorizado
+
+
+# --- MOTOR INCREMENTAL (REGIÕES ATIVAS) ---
+# A grade é dividida em blocos de TAMANHO_BLOCO x TAMANHO_BLOCO. Um bloco só é
+# recalculado se ele ou algum vizinho mudou na geração anterior; os demais estão
+# estáveis e ficam como estão. Em sopas aleatórias que já viraram natureza-morta
+# e osciladores, quase todos os blocos ficam parados.
+#
+# Truque dos buffers duplos: se um bloco não mudou entre as gerações g-1 e g, o
+# buffer que guarda g-1 já tem o valor certo para g+1. Então blocos parados não
+# são nem copiados.
+
+TAMANHO_BLOCO = 32
+
+
+def _trechos(marcados):
+    """Converte uma linha de booleanos em trechos [inicio, fim) de Trues consecutivos."""
+    bordas = np.diff(np.concatenate(([0], marcados.astype(np.int8), [0])))
+    return zip(np.nonzero(bordas == 1)[0], np.nonzero(bordas == -1)[0])
+
+
+def dilatar_blocos(ativos):
+    """Marca cada bloco ativo e seus 8 vizinhos (dilatação da máscara 2D em 1 bloco)."""
+    expandida = ativos.copy()
+    expandida[1:, :] |= ativos[:-1, :]
+    expandida[:-1, :] |= ativos[1:, :]
+    linhas = expandida.copy()
+    expandida[:, 1:] |= linhas[:, :-1]
+    expandida[:, :-1] |= linhas[:, 1:]
+    return expandida
+
+
+class MotorAtivo:
+    """
+    Motor com estado, usado como uma função de cálculo de geração comum:
+        motor = MotorAtivo()
+        grade = motor(grade, tamanho)   # a cada geração
+    A grade devolvida é um buffer interno, reaproveitado duas gerações depois
+    (copie-a se for guardá-la). Se receber uma grade que não é a sua última
+    saída, o motor recomeça com todos os blocos ativos.
+    """
+
+    def __init__(self, tamanho_bloco=TAMANHO_BLOCO):
+        self.tamanho_bloco = tamanho_bloco
+        self._grades = None
+        self._atual = 0
+        self._ativos = None
+        self.blocos_calculados = 0 # Total acumulado, para medir o ganho
+
+    def reiniciar(self, grade):
+        """Carrega uma grade nova: todos os blocos começam ativos."""
+        linhas, colunas = grade.shape
+        self._grades = [grade.astype(np.int8, copy=True), np.zeros((linhas, colunas), dtype=np.int8)]
+        self._atual = 0
+        blocos_i = -(-linhas // self.tamanho_bloco)
+        blocos_j = -(-colunas // self.tamanho_bloco)
+        self._ativos = np.ones((blocos_i, blocos_j), dtype=bool)
+
+    def _blocos_a_calcular(self):
+        """Blocos ativos e seus 8 vizinhos (dilatação da máscara em 1 bloco)."""
+        return dilatar_blocos(self._ativos)
+
+    def __call__(self, grade_atual, tamanho=None):
+        if self._grades is None or grade_atual is not self._grades[self._atual]:
+            self.reiniciar(grade_atual)
+
+        atual = self._grades[self._atual]
+        nova = self._grades[1 - self._atual]
+        linhas, colunas = atual.shape
+        t = self.tamanho_bloco
+
+        a_calcular = self._blocos_a_calcular()
+        mudou = np.zeros_like(self._ativos)
+        # Percorre por linha de blocos, juntando blocos vizinhos marcados num só trecho:
+        # uma chamada vetorizada por trecho em vez de uma por bloco.
+        for bi in np.nonzero(a_calcular.any(axis=1))[0]:
+            l0, l1 = bi * t, min(bi * t + t, linhas)
+            for j0, j1 in _trechos(a_calcular[bi]):
+                c0, c1 = j0 * t, min(j1 * t, colunas)
+                calcular_bloco_vetorizado(atual, nova, l0, l1, c0, c1)
+                diferente = (nova[l0:l1, c0:c1] != atual[l0:l1, c0:c1]).any(axis=0)
+                mudou[bi, j0:j1] = np.logical_or.reduceat(diferente, np.arange(0, c1 - c0, t))
+                self.blocos_calculados += j1 - j0
+
+        self._ativos = mudou
+        self._atual = 1 - self._atual
+        return nova
+
+    @property
+    def fracao_ativa(self):
+        """Fração dos blocos que mudaram na última geração."""
+        return float(self._ativos.mean()) if self._ativos is not None else 1.0
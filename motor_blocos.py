@@ -0,0 +1,139 @@
+import numpy as np
+from estatisticas import ContagemBlocos
+
+
+# --- MOTOR EM BLOCOS (CACHE) COM BUFFERS DUPLOS PRÉ-ALOCADOS ---
+# O motor vetorizado percorre a grade inteira em cada uma das ~10 operações da geração:
+# a partir de alguns milhares de linhas, cada passada sai da cache e o tempo por célula
+# sobe. Aqui a geração é calculada bloco a bloco (TAMANHO_BLOCO x TAMANHO_BLOCO), e
+# todas as operações de um bloco rodam enquanto ele ainda está na L2.
+#
+# Nada é alocado por geração: as duas grades (atual/nova) e os rascunhos de um bloco são
+# criados uma vez, e todas as operações escrevem com 'out=' nesses buffers.
+#
+# Contagem em duas passadas, incluindo a própria célula (soma 3x3):
+#   colunas[i, j] = acolchoada[i, j] + acolchoada[i+1, j] + acolchoada[i+2, j]
+#   soma[i, j]    = colunas[i, j] + colunas[i, j+1] + colunas[i, j+2]
+# Vive na próxima geração quem tem soma 3, ou soma 4 estando viva (3 vizinhos + ela).
+#
+# Com 'ativar_contadores()', cada bloco também conta a população nova e os nascimentos
+# enquanto ainda está na cache (ver estatisticas.py); o resultado fica em 'contadores'.
+
+TAMANHO_BLOCO = 256 # Lado do bloco: ~6 buffers de 64 KB por bloco, folgado numa L2 de 1-2 MB
+
+
+class MotorBlocos:
+    """
+    Motor com estado, usado como uma função de cálculo de geração comum:
+        motor = MotorBlocos()
+        grade = motor(grade, tamanho)   # a cada geração
+    A grade devolvida é um buffer interno, reaproveitado duas gerações depois
+    (copie-a se for guardá-la). Se receber uma grade que não é a sua última
+    saída, o motor a copia para o buffer atual e recomeça dali.
+    """
+
+    def __init__(self, tamanho_bloco=TAMANHO_BLOCO):
+        self.tamanho_bloco = tamanho_bloco
+        self._grades = None
+        self._atual = 0
+        self._planos = None
+        self.contar_estatisticas = False
+        self.contadores = None   # (populacao, nascimentos, mortes, atividade por bloco) da última geração
+        self._contagem = None
+
+    def ativar_contadores(self):
+        self.contar_estatisticas = True
+        self._contagem = None
+
+    def reiniciar(self, grade):
+        """Aloca os buffers para o formato da grade e monta o plano de blocos."""
+        linhas, colunas = grade.shape
+        t = self.tamanho_bloco
+        if self._grades is None or self._grades[0].shape != grade.shape:
+            self._grades = [np.zeros((linhas, colunas), dtype=np.int8) for _ in range(2)]
+            self._acolchoada = np.zeros((t + 2, t + 2), dtype=np.uint8)
+            self._colunas = np.empty((t, t + 2), dtype=np.uint8)
+            self._soma = np.empty((t, t), dtype=np.uint8)
+            self._tres = np.empty((t, t), dtype=bool)
+            self._quatro = np.empty((t, t), dtype=bool)
+            # Um plano por sentido do pingue-pongue (0 -> 1 e 1 -> 0): só visões, montadas uma vez
+            self._planos = [self._montar_plano(self._grades[k], self._grades[1 - k]) for k in range(2)]
+        np.copyto(self._grades[0], grade, casting='unsafe')
+        self._atual = 0
+        self._contagem = None
+
+    def _montar_plano(self, atual, nova):
+        """Lista com, por bloco, as visões de leitura, de escrita e dos rascunhos."""
+        linhas, colunas = atual.shape
+        t = self.tamanho_bloco
+        fonte = atual.view(np.uint8)
+        plano = []
+        for l0 in range(0, linhas, t):
+            l1 = min(l0 + t, linhas)
+            for c0 in range(0, colunas, t):
+                c1 = min(c0 + t, colunas)
+                a, l = l1 - l0, c1 - c0
+                # Região lida: o bloco mais uma linha/coluna em volta, cortada na borda da grade
+                topo, base = max(l0 - 1, 0), min(l1 + 1, linhas)
+                esquerda, direita = max(c0 - 1, 0), min(c1 + 1, colunas)
+                di, dj = topo - (l0 - 1), esquerda - (c0 - 1)
+                acolchoada = self._acolchoada[:a + 2, :l + 2]
+                destino = acolchoada[di:di + base - topo, dj:dj + direita - esquerda]
+                # Moldura fora do tabuleiro: fica zerada (borda fixa)
+                moldura = []
+                if l0 == 0:
+                    moldura.append(acolchoada[0])
+                if l1 == linhas:
+                    moldura.append(acolchoada[-1])
+                if c0 == 0:
+                    moldura.append(acolchoada[:, 0])
+                if c1 == colunas:
+                    moldura.append(acolchoada[:, -1])
+                plano.append((
+                    fonte[topo:base, esquerda:direita], destino, moldura, acolchoada,
+                    self._colunas[:a, :l + 2], self._soma[:a, :l], atual[l0:l1, c0:c1], nova[l0:l1, c0:c1],
+                ))
+        return plano
+
+    def __call__(self, grade_atual, tamanho=None):
+        if self._grades is None or grade_atual is not self._grades[self._atual]:
+            self.reiniciar(grade_atual)
+        contagem = self._preparar_contagem() if self.contar_estatisticas else None
+
+        for i, (fonte, destino, moldura, acolchoada, colunas, soma, viva, nova) in enumerate(self._planos[self._atual]):
+            np.copyto(destino, fonte)
+            for borda in moldura:
+                borda[...] = 0
+            a = soma.shape[0]
+            np.add(acolchoada[:a], acolchoada[1:a + 1], out=colunas)
+            np.add(colunas, acolchoada[2:a + 2], out=colunas)
+            l = soma.shape[1]
+            np.add(colunas[:, :l], colunas[:, 1:l + 1], out=soma)
+            np.add(soma, colunas[:, 2:l + 2], out=soma)
+            self._aplicar_regra(soma, viva, nova)
+            if contagem is not None:
+                contagem.nova_populacao[i] = np.count_nonzero(nova)
+                contagem.nascimentos[i] = np.count_nonzero(np.greater(nova, viva, out=self._quatro[:a, :l]))
+
+        if contagem is not None:
+            self.contadores = contagem.concluir()
+        self._atual = 1 - self._atual
+        return self._grades[self._atual]
+
+    def _preparar_contagem(self):
+        """Contagem por bloco; na primeira geração conta a população inicial de cada bloco."""
+        if self._contagem is None:
+            plano = self._planos[self._atual]
+            linhas, colunas = self._grades[0].shape
+            forma = (-(-linhas // self.tamanho_bloco), -(-colunas // self.tamanho_bloco))
+            self._contagem = ContagemBlocos(forma, [np.count_nonzero(viva) for _, _, _, _, _, _, viva, _ in plano])
+        return self._contagem
+
+    def _aplicar_regra(self, soma, viva, nova):
+        """B3/S23 a partir da soma 3x3 do bloco; escreve o bloco da próxima geração em 'nova'."""
+        a, l = soma.shape
+        tres, quatro = self._tres[:a, :l], self._quatro[:a, :l]
+        np.equal(soma, 3, out=tres)
+        np.equal(soma, 4, out=quatro)
+        np.logical_and(quatro, viva.view(bool), out=quatro)
+        np.logical_or(tres, quatro, out=nova.view(bool))
@@ -0,0 +1,134 @@
+import numpy as np
+
+
+# --- MOTOR EMPACOTADO EM BITS (SWAR) ---
+# Cada linha da grade é guardada em palavras 'uint64': 64 células por palavra,
+# 1 bit por célula (a grade int8 gasta 8 bits por célula).
+# A próxima geração é calculada com lógica de somadores (full-adder) bit a bit,
+# ou seja, 64 células são atualizadas por operação.
+# A conversão para/da grade int8 acontece só na entrada e na saída.
+
+BITS_POR_PALAVRA = 64
+LINHAS_POR_BLOCO = 1024 # Limita a memória temporária em grades muito grandes
+
+
+# FUNÇÃO 1: CONVERSÃO int8 -> bits
+def empacotar_grade(grade):
+    """
+    Converte a grade int8 (linhas x colunas) em uma matriz uint64 (linhas x palavras).
+    O bit j da palavra w representa a coluna 64*w + j. Colunas de preenchimento ficam em 0.
+    """
+    linhas, colunas = grade.shape
+    palavras = -(-colunas // BITS_POR_PALAVRA)
+    bytes_por_linha = palavras * 8
+
+    empacotada = np.zeros((linhas, bytes_por_linha), dtype=np.uint8)
+    empacotada[:, :-(-colunas // 8)] = np.packbits(grade.astype(bool), axis=1, bitorder='little')
+    return empacotada.view('<u8')
+
+
+# FUNÇÃO 2: CONVERSÃO bits -> int8
+def desempacotar_grade(empacotada, colunas):
+    """Converte a matriz uint64 de volta para a grade int8 com 'colunas' colunas."""
+    bytes_linha = np.ascontiguousarray(empacotada).view(np.uint8)
+    grade = np.unpackbits(bytes_linha, axis=1, count=colunas, bitorder='little')
+    return grade.astype(np.int8)
+
+
+#  FUNÇÃO 3: DESLOCAMENTOS HORIZONTAIS (com transporte entre palavras)
+def _deslocar_oeste(bloco):
+    """Cada bit recebe o valor da coluna à esquerda (vizinho oeste)."""
+    resultado = bloco << np.uint64(1)
+    resultado[:, 1:] |= bloco[:, :-1] >> np.uint64(63)
+    return resultado
+
+def _deslocar_leste(bloco):
+    """Cada bit recebe o valor da coluna à direita (vizinho leste)."""
+    resultado = bloco >> np.uint64(1)
+    resultado[:, :-1] |= bloco[:, 1:] << np.uint64(63)
+    return resultado
+
+
+# FUNÇÃO 4: CÁLCULO DE UM BLOCO DE LINHAS
+def _calcular_bloco(acima, meio, abaixo):
+    """
+    Aplica as regras a um bloco de linhas já empacotado.
+    'acima' e 'abaixo' são o mesmo bloco deslocado uma linha (vizinhos norte e sul).
+    Os 8 vizinhos são somados com contadores bit a bit: 'uns', 'dois' e 'quatro_ou_mais'.
+    """
+    uns = np.zeros_like(meio)
+    dois = np.zeros_like(meio)
+    quatro_ou_mais = np.zeros_like(meio)
+
+    for linha_vizinha, inclui_centro in ((acima, True), (meio, False), (abaixo, True)):
+        vizinhos = [_deslocar_oeste(linha_vizinha), _deslocar_leste(linha_vizinha)]
+        if inclui_centro:
+            vizinhos.append(linha_vizinha)
+        for v in vizinhos:
+            # Meio-somador em cascata: uns -> dois -> quatro_ou_mais (satura em 4)
+            transporte = uns & v
+            uns ^= v
+            transporte2 = dois & transporte
+            dois ^= transporte
+            quatro_ou_mais |= transporte2
+
+    # Vive com exatamente 3 vizinhos, ou com 2 se já estava viva
+    return ~quatro_ou_mais & dois & (uns | meio)
+
+
+# FUNÇÃO 5: PRÓXIMA GERAÇÃO NO FORMATO EMPACOTADO
+def proxima_geracao_empacotada(empacotada, colunas, saida=None, linhas_por_bloco=LINHAS_POR_BLOCO):
+    """
+    Calcula a próxima geração sem sair do formato uint64.
+    Processa 'linhas_por_bloco' linhas por vez para que os temporários não dupliquem a grade.
+    """
+    linhas, palavras = empacotada.shape
+    if saida is None:
+        saida = np.empty_like(empacotada)
+
+    # Máscara que zera as colunas de preenchimento da última palavra (borda fixa)
+    sobra = colunas % BITS_POR_PALAVRA
+    mascara_final = np.uint64((1 << sobra) - 1) if sobra else None
+
+    for inicio in range(0, linhas, linhas_por_bloco):
+        fim = min(inicio + linhas_por_bloco, linhas)
+        meio = empacotada[inicio:fim]
+
+        # Vizinhos norte e sul: linhas fora do tabuleiro são zero
+        acima = np.zeros_like(meio)
+        abaixo = np.zeros_like(meio)
+        acima[1:] = meio[:-1]
+        abaixo[:-1] = meio[1:]
+        if inicio > 0:
+            acima[0] = empacotada[inicio - 1]
+        if fim < linhas:
+            abaixo[-1] = empacotada[fim]
+
+        saida[inicio:fim] = _calcular_bloco(acima, meio, abaixo)
+
+    if mascara_final is not None:
+        saida[:, -1] &= mascara_final
+    return saida
+
+
+# FUNÇÃO 6: INTERFACE COMPATÍVEL COM 'proxima_geracao'
+def proxima_geracao_bits(grade_atual, tamanho):
+    """Recebe e devolve a grade int8, calculando a geração no formato empacotado."""
+    colunas = grade_atual.shape[1]
+    empacotada = proxima_geracao_empacotada(empacotar_grade(grade_atual), colunas)
+    return desempacotar_grade(empacotada, colunas)
+
+
+# FUNÇÃO 7: VÁRIAS GERAÇÕES SEM DESEMPACOTAR
+def simular_empacotado(grade, num_geracoes):
+    """
+    Avança 'num_geracoes' gerações mantendo a grade empacotada entre elas.
+    Usa dois buffers pré-alocados que trocam de papel a cada geração.
+    """
+    colunas = grade.shape[1]
+    atual = empacotar_grade(grade)
+    proxima = np.empty_like(atual)
+    for _ in range(num_geracoes):
+        proxima_geracao_empacotada(atual, colunas, saida=proxima)
+        atual, proxima = proxima, atual
+    return desempacotar_grade(atual, colunas)
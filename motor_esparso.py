@@ -0,0 +1,72 @@
+import numpy as np
+
+
+# --- MOTOR ESPARSO (só as células vivas) ---
+# O tabuleiro é um vetor ORDENADO de chaves int64, uma por célula viva:
+#     chave = linha * colunas + coluna
+# A memória e o tempo crescem com a POPULAÇÃO, não com a área: poucos milhares de
+# células vivas num tabuleiro 10^6 x 10^6 custam o mesmo que num 100 x 100.
+# Mesma regra e mesma borda fixa dos outros motores (vizinhos fora do tabuleiro não existem).
+
+VIZINHANCA = [(x, y) for x in (-1, 0, 1) for y in (-1, 0, 1) if not (x == 0 and y == 0)]
+
+
+# FUNÇÃO 1: CONVERSÕES ENTRE A GRADE DENSA E AS CHAVES
+def grade_para_chaves(grade):
+    """Converte a grade int8 no vetor ordenado de chaves das células vivas."""
+    linhas, colunas = np.nonzero(grade)
+    return linhas.astype(np.int64) * grade.shape[1] + colunas
+
+
+def chaves_para_grade(chaves, linhas, colunas):
+    """Converte o vetor de chaves de volta para a grade int8 (linhas x colunas)."""
+    grade = np.zeros(linhas * colunas, dtype=np.int8)
+    grade[chaves] = 1
+    return grade.reshape(linhas, colunas)
+
+
+# FUNÇÃO 2: PRÓXIMA GERAÇÃO
+def proxima_geracao_esparsa(chaves, linhas, colunas):
+    """
+    Calcula as chaves vivas da próxima geração.
+    Cada célula viva 'espalha' 1 para os seus 8 vizinhos; as contagens são agregadas
+    de forma vetorizada com np.unique. Só células com pelo menos 1 vizinho vivo podem
+    estar vivas na geração seguinte, então basta olhar para essas.
+    """
+    if chaves.size == 0:
+        return chaves
+    linha = chaves // colunas
+    coluna = chaves % colunas
+
+    candidatas = []
+    for x, y in VIZINHANCA:
+        li = linha + x
+        co = coluna + y
+        # REGRA DE BORDA: descarta vizinhos fora do tabuleiro
+        dentro = (li >= 0) & (li < linhas) & (co >= 0) & (co < colunas)
+        candidatas.append(li[dentro] * colunas + co[dentro])
+
+    celulas, vivos = np.unique(np.concatenate(candidatas), return_counts=True)
+
+    # A célula candidata já estava viva? (busca binária no vetor ordenado)
+    posicao = np.searchsorted(chaves, celulas)
+    posicao[posicao == chaves.size] = 0
+    estava_viva = chaves[posicao] == celulas
+
+    return celulas[(vivos == 3) | (estava_viva & (vivos == 2))]
+
+
+# FUNÇÃO 3: INTERFACE COMPATÍVEL COM 'proxima_geracao'
+def proxima_geracao_esparsa_int8(grade_atual, tamanho):
+    """Recebe e devolve a grade int8, calculando a geração no formato esparso."""
+    linhas, colunas = grade_atual.shape
+    chaves = proxima_geracao_esparsa(grade_para_chaves(grade_atual), linhas, colunas)
+    return chaves_para_grade(chaves, linhas, colunas)
+
+
+# FUNÇÃO 4: VÁRIAS GERAÇÕES SEM VOLTAR À GRADE DENSA
+def simular_esparso(chaves, linhas, colunas, num_geracoes):
+    """Avança 'num_geracoes' gerações mantendo apenas as chaves das células vivas."""
+    for _ in range(num_geracoes):
+        chaves = proxima_geracao_esparsa(chaves, linhas, colunas)
+    return chaves
@@ -0,0 +1,272 @@
+import sys
+from collections import OrderedDict
+import numpy as np
+
+
+# --- MOTOR HASHLIFE ---
+# Quadtree com nós únicos (hash-consing): dois quadrantes iguais em qualquer lugar do
+# tabuleiro, ou em qualquer instante, são O MESMO nó. O resultado de cada nó (o seu
+# centro avançado no tempo) é memorizado, então padrões repetitivos avançam 2^k
+# gerações de uma vez.
+#
+# ATENÇÃO À BORDA: o HashLife simula um plano infinito. O resultado só é igual ao dos
+# outros motores (borda fixa) enquanto o padrão não encosta na borda do tabuleiro.
+# Na exportação ('para_grade') as células fora da janela pedida são descartadas.
+
+LIMITE_NOS = 2_000_000        # Tamanho máximo da tabela de nós únicos
+LIMITE_RESULTADOS = 1_000_000 # Tamanho máximo do cache de resultados
+
+
+class No:
+    """Nó da quadtree: quatro quadrantes (nw, ne, sw, se) de nível 'nivel - 1'."""
+    __slots__ = ('nw', 'ne', 'sw', 'se', 'nivel', 'populacao')
+
+    def __init__(self, nw, ne, sw, se, nivel, populacao):
+        self.nw = nw
+        self.ne = ne
+        self.sw = sw
+        self.se = se
+        self.nivel = nivel         # O nó cobre 2^nivel x 2^nivel células
+        self.populacao = populacao # Células vivas no nó
+
+
+# Folhas (nível 0): uma célula morta e uma viva
+MORTA = No(None, None, None, None, 0, 0)
+VIVA = No(None, None, None, None, 0, 1)
+
+
+class HashLife:
+    """
+    Universo HashLife. Uso:
+        universo = HashLife()
+        universo.carregar_grade(grade)
+        universo.avancar(num_geracoes)          # ou avancar_potencia(k) para 2^k
+        grade = universo.para_grade()
+        print(universo.estatisticas())
+    """
+
+    def __init__(self, limite_nos=LIMITE_NOS, limite_resultados=LIMITE_RESULTADOS):
+        self.limite_nos = limite_nos
+        self.limite_resultados = limite_resultados
+        self._nos = OrderedDict()        # (nw, ne, sw, se) -> No   (LRU)
+        self._resultados = OrderedDict() # (No, j) -> No            (LRU)
+        self._vazios = [MORTA]           # _vazios[k]: nó vazio de nível k
+        self.acertos = 0
+        self.faltas = 0
+        self.remocoes = 0
+
+        self.raiz = MORTA
+        self.origem = (0, 0)   # (linha, coluna) do canto superior esquerdo da raiz
+        self.geracao = 0
+        self.forma = (0, 0)    # Janela da grade importada (para a exportação)
+
+    # --- CONSTRUÇÃO DE NÓS (hash-consing) ---
+    def juntar(self, nw, ne, sw, se):
+        """Devolve o nó único com estes quatro quadrantes."""
+        chave = (nw, ne, sw, se)
+        no = self._nos.get(chave)
+        if no is not None:
+            self._nos.move_to_end(chave)
+            return no
+        no = No(nw, ne, sw, se, nw.nivel + 1, nw.populacao + ne.populacao + sw.populacao + se.populacao)
+        self._nos[chave] = no
+        if len(self._nos) > self.limite_nos:
+            # Esquecer um nó só faz perder o compartilhamento; nós vivos continuam válidos
+            self._nos.popitem(last=False)
+            self.remocoes += 1
+        return no
+
+    def vazio(self, nivel):
+        """Nó de nível 'nivel' sem células vivas."""
+        while len(self._vazios) <= nivel:
+            v = self._vazios[-1]
+            self._vazios.append(self.juntar(v, v, v, v))
+        return self._vazios[nivel]
+
+    def _centro(self, no):
+        """Quadrado central (nível - 1) de um nó."""
+        return self.juntar(no.nw.se, no.ne.sw, no.sw.ne, no.se.nw)
+
+    def _expandir(self):
+        """Envolve a raiz com uma moldura vazia: o nível sobe 1 e a raiz fica no centro."""
+        raiz = self.raiz
+        v = self.vazio(raiz.nivel - 1)
+        self.raiz = self.juntar(
+            self.juntar(v, v, v, raiz.nw),
+            self.juntar(v, v, raiz.ne, v),
+            self.juntar(v, raiz.sw, v, v),
+            self.juntar(raiz.se, v, v, v),
+        )
+        meio = 1 << (raiz.nivel - 1)
+        self.origem = (self.origem[0] - meio, self.origem[1] - meio)
+
+    # --- EVOLUÇÃO ---
+    def _base(self, no):
+        """Nível 2 (4x4): calcula o centro 2x2 uma geração à frente, por força bruta."""
+        celulas = [[0] * 4 for _ in range(4)]
+        for qi, quadrante in enumerate((no.nw, no.ne, no.sw, no.se)):
+            for fi, folha in enumerate((quadrante.nw, quadrante.ne, quadrante.sw, quadrante.se)):
+                celulas[(qi // 2) * 2 + fi // 2][(qi % 2) * 2 + fi % 2] = folha.populacao
+
+        novas = []
+        for i in (1, 2):
+            for j in (1, 2):
+                vivos = sum(celulas[i + x][j + y] for x in (-1, 0, 1) for y in (-1, 0, 1)) - celulas[i][j]
+                viva = vivos == 3 or (celulas[i][j] == 1 and vivos == 2)
+                novas.append(VIVA if viva else MORTA)
+        return self.juntar(*novas)
+
+    def _passo(self, no, j):
+        """
+        Centro (nível - 1) do nó avançado 2^j gerações, com j <= nível - 2.
+        Com j = nível - 2 o salto é o máximo possível (as duas etapas avançam).
+        """
+        if no.populacao == 0:
+            return self.vazio(no.nivel - 1)
+        chave = (no, j)
+        resultado = self._resultados.get(chave)
+        if resultado is not None:
+            self.acertos += 1
+            self._resultados.move_to_end(chave)
+            return resultado
+        self.faltas += 1
+
+        if no.nivel == 2:
+            resultado = self._base(no)
+        else:
+            a, b, c, d = no.nw, no.ne, no.sw, no.se
+            # Nove sub-quadrados de nível - 1 sobrepostos
+            n00, n02, n20, n22 = a, b, c, d
+            n01 = self.juntar(a.ne, b.nw, a.se, b.sw)
+            n10 = self.juntar(a.sw, a.se, c.nw, c.ne)
+            n11 = self.juntar(a.se, b.sw, c.ne, d.nw)
+            n12 = self.juntar(b.sw, b.se, d.nw, d.ne)
+            n21 = self.juntar(c.ne, d.nw, c.se, d.sw)
+            nove = (n00, n01, n02, n10, n11, n12, n20, n21, n22)
+
+            if j == no.nivel - 2:
+                # 1ª etapa também avança 2^(j-1)
+                r = [self._passo(n, j - 1) for n in nove]
+                j2 = j - 1
+            else:
+                # 1ª etapa só recentraliza; todo o avanço fica na 2ª etapa
+                r = [self._centro(n) for n in nove]
+                j2 = j
+
+            resultado = self.juntar(
+                self._passo(self.juntar(r[0], r[1], r[3], r[4]), j2),
+                self._passo(self.juntar(r[1], r[2], r[4], r[5]), j2),
+                self._passo(self.juntar(r[3], r[4], r[6], r[7]), j2),
+                self._passo(self.juntar(r[4], r[5], r[7], r[8]), j2),
+            )
+
+        self._resultados[chave] = resultado
+        if len(self._resultados) > self.limite_resultados:
+            self._resultados.popitem(last=False)
+            self.remocoes += 1
+        return resultado
+
+    def _cabe_no_centro(self):
+        """True se toda a população está no quadrado central (1/4 da largura) da raiz."""
+        raiz = self.raiz
+        if raiz.nivel < 3:
+            return False
+        centro = self._centro(self._centro(raiz))
+        return centro.populacao == raiz.populacao
+
+    def avancar_potencia(self, k):
+        """Avança 2^k gerações numa única chamada."""
+        # Margem suficiente para o padrão crescer à velocidade da luz por 2^k gerações
+        while self.raiz.nivel < k + 3 or not self._cabe_no_centro():
+            self._expandir()
+        nivel = self.raiz.nivel
+        self.raiz = self._passo(self.raiz, k)
+        quarto = 1 << (nivel - 2)
+        self.origem = (self.origem[0] + quarto, self.origem[1] + quarto)
+        self.geracao += 1 << k
+
+    def avancar(self, num_geracoes):
+        """Avança um número qualquer de gerações (decomposto em potências de 2)."""
+        k = 0
+        while num_geracoes:
+            if num_geracoes & 1:
+                self.avancar_potencia(k)
+            num_geracoes >>= 1
+            k += 1
+
+    # --- IMPORTAÇÃO / EXPORTAÇÃO DA GRADE int8 ---
+    def _construir(self, grade, nivel):
+        if nivel == 0:
+            return VIVA if grade[0, 0] else MORTA
+        if not grade.any():
+            return self.vazio(nivel)
+        m = 1 << (nivel - 1)
+        return self.juntar(
+            self._construir(grade[:m, :m], nivel - 1),
+            self._construir(grade[:m, m:], nivel - 1),
+            self._construir(grade[m:, :m], nivel - 1),
+            self._construir(grade[m:, m:], nivel - 1),
+        )
+
+    def carregar_grade(self, grade, linha0=0, coluna0=0):
+        """Importa a grade int8 com o canto superior esquerdo em (linha0, coluna0)."""
+        linhas, colunas = grade.shape
+        nivel = max(3, int(max(linhas, colunas, 1) - 1).bit_length())
+        quadrada = np.zeros((1 << nivel, 1 << nivel), dtype=np.int8)
+        quadrada[:linhas, :colunas] = grade
+        self.raiz = self._construir(quadrada, nivel)
+        self.origem = (linha0, coluna0)
+        self.forma = (linhas, colunas)
+        self.geracao = 0
+
+    def _preencher(self, no, i0, j0, saida, li, lj):
+        """Escreve as células vivas de 'no' (canto em i0, j0) na janela 'saida' (canto em li, lj)."""
+        if no.populacao == 0:
+            return
+        tamanho = 1 << no.nivel
+        linhas, colunas = saida.shape
+        if i0 >= li + linhas or j0 >= lj + colunas or i0 + tamanho <= li or j0 + tamanho <= lj:
+            return
+        if no.nivel == 0:
+            saida[i0 - li, j0 - lj] = 1
+            return
+        m = tamanho >> 1
+        self._preencher(no.nw, i0, j0, saida, li, lj)
+        self._preencher(no.ne, i0, j0 + m, saida, li, lj)
+        self._preencher(no.sw, i0 + m, j0, saida, li, lj)
+        self._preencher(no.se, i0 + m, j0 + m, saida, li, lj)
+
+    def para_grade(self, linha0=0, coluna0=0, linhas=None, colunas=None):
+        """Exporta a janela pedida (por padrão, a mesma da grade importada) como int8."""
+        linhas = self.forma[0] if linhas is None else linhas
+        colunas = self.forma[1] if colunas is None else colunas
+        saida = np.zeros((linhas, colunas), dtype=np.int8)
+        self._preencher(self.raiz, self.origem[0], self.origem[1], saida, linha0, coluna0)
+        return saida
+
+    # --- ESTATÍSTICAS DO CACHE ---
+    def estatisticas(self):
+        """Taxa de acerto do cache de resultados, ocupação das tabelas e memória estimada."""
+        consultas = self.acertos + self.faltas
+        bytes_no = sys.getsizeof(self.raiz)
+        bytes_entrada = 100 # Estimativa do custo de uma entrada de OrderedDict + tupla da chave
+        return {
+            'geracao': self.geracao,
+            'populacao': self.raiz.populacao,
+            'nos': len(self._nos),
+            'resultados': len(self._resultados),
+            'acertos': self.acertos,
+            'faltas': self.faltas,
+            'taxa_acerto': self.acertos / consultas if consultas else 0.0,
+            'remocoes': self.remocoes,
+            'memoria_estimada_bytes': len(self._nos) * (bytes_no + bytes_entrada) + len(self._resultados) * bytes_entrada,
+        }
+
+
+# --- ATALHO PARA AS SIMULAÇÕES ---
+def simular_hashlife(grade, num_geracoes):
+    """Avança a grade int8 'num_geracoes' gerações com HashLife e devolve (grade, universo)."""
+    universo = HashLife()
+    universo.carregar_grade(grade)
+    universo.avancar(num_geracoes)
+    return universo.para_grade(), universo
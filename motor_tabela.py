@@ -0,0 +1,25 @@
+from motor_blocos import MotorBlocos, TAMANHO_BLOCO
+from regras import REGRA_PADRAO, obter_tabela
+
+
+# --- MOTOR DE REGRAS POR TABELA (qualquer regra B/S) ---
+# Mesmo percurso em blocos e buffers pré-alocados do motor_blocos.py; só a última etapa
+# muda: em vez de comparar a soma 3x3 com 3 e 4, aplica a tabela compilada da regra
+# (regras.TabelaRegra). Para o B3/S23 são as mesmas 4 operações do caminho fixo.
+
+
+class MotorTabela(MotorBlocos):
+    """
+    Como o MotorBlocos, mas para qualquer regra "life-like":
+        motor = MotorTabela("B36/S23")   # HighLife
+        grade = motor(grade, tamanho)
+    """
+
+    def __init__(self, regra=REGRA_PADRAO, tamanho_bloco=TAMANHO_BLOCO):
+        super().__init__(tamanho_bloco)
+        self.tabela = obter_tabela(regra)
+        self.regra = self.tabela.regra
+
+    def _aplicar_regra(self, soma, viva, nova):
+        a, l = soma.shape
+        self.tabela.aplicar(soma, viva.view(bool), nova.view(bool), self._tres[:a, :l])
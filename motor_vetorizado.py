@@ -0,0 +1,148 @@
+import numpy as np
+from estatisticas import ContagemFaixa
+
+
+# --- MOTOR VETORIZADO (NumPy) ---
+# Substitui o laço duplo em Python (uma chamada de 'contar_vizinhos_vivos' por célula)
+# por somas de fatias deslocadas sobre a grade inteira.
+# A REGRA DE BORDA é a mesma das três implementações originais: tudo que está
+# fora do tabuleiro conta como célula 'morta' (borda fixa).
+
+
+# FUNÇÃO 1: CONTAGEM DE VIZINHOS (grade inteira de uma vez)
+def contar_vizinhos_vetorizado(grade):
+    """
+    Retorna uma matriz com o número de vizinhos vivos de cada célula.
+    A grade é envolvida por uma moldura de zeros (borda fixa) e os 8 vizinhos
+    são somados como fatias deslocadas dessa visão acolchoada.
+    Aceita também uma pilha de grades (..., linhas, colunas): cada uma é contada à parte.
+    """
+    *lote, linhas, colunas = grade.shape
+    acolchoada = np.zeros((*lote, linhas + 2, colunas + 2), dtype=np.uint8)
+    acolchoada[..., 1:-1, 1:-1] = grade
+
+    vizinhos = np.zeros((*lote, linhas, colunas), dtype=np.uint8)
+    for x in range(3):
+        for y in range(3):
+            if x == 1 and y == 1:
+                continue # Ignora o centro
+            vizinhos += acolchoada[..., x:x + linhas, y:y + colunas]
+    return vizinhos
+
+
+# FUNÇÃO 2: APLICAÇÃO DAS REGRAS
+def aplicar_regras(grade, vivos, saida=None, tabela=None):
+    """
+    Aplica as 4 regras do Jogo da Vida a partir da contagem de vizinhos.
+    Sobrevive quem está viva com 2 ou 3 vizinhos; nasce quem está morta com 3.
+    Com 'tabela' (regras.TabelaRegra), aplica outra regra B/S pela tabela compilada.
+    """
+    if saida is None:
+        saida = np.empty(grade.shape, dtype=np.int8)
+    if tabela is not None:
+        viva = grade != 0
+        np.copyto(saida, tabela.aplicar(vivos + viva, viva, np.empty(grade.shape, dtype=bool)), casting='unsafe')
+        return saida
+    nasce_ou_sobrevive = (vivos == 3) | ((grade == 1) & (vivos == 2))
+    np.copyto(saida, nasce_ou_sobrevive, casting='unsafe')
+    return saida
+
+
+# FUNÇÃO 3: CÁLCULO DE UM BLOCO RETANGULAR
+def calcular_bloco_vetorizado(grade_atual, nova_grade, linha_inicio, linha_fim, coluna_inicio, coluna_fim, tabela=None):
+    """
+    Calcula o bloco [linha_inicio, linha_fim) x [coluna_inicio, coluna_fim) da próxima
+    geração e escreve em nova_grade. Lê uma linha/coluna extra em volta do bloco
+    (quando existir) para contar os vizinhos. 'tabela': ver 'aplicar_regras'.
+    """
+    if linha_inicio >= linha_fim or coluna_inicio >= coluna_fim:
+        return
+    linhas, colunas = grade_atual.shape
+    topo = max(linha_inicio - 1, 0)
+    base = min(linha_fim + 1, linhas)
+    esquerda = max(coluna_inicio - 1, 0)
+    direita = min(coluna_fim + 1, colunas)
+
+    vivos = contar_vizinhos_vetorizado(grade_atual[topo:base, esquerda:direita])
+    # Descarta as linhas/colunas extras que só serviram de vizinhança
+    di = linha_inicio - topo
+    dj = coluna_inicio - esquerda
+    vivos = vivos[di:di + (linha_fim - linha_inicio), dj:dj + (coluna_fim - coluna_inicio)]
+
+    aplicar_regras(
+        grade_atual[linha_inicio:linha_fim, coluna_inicio:coluna_fim], vivos,
+        nova_grade[linha_inicio:linha_fim, coluna_inicio:coluna_fim], tabela,
+    )
+
+
+# FUNÇÃO 3b: CÁLCULO DE UMA FAIXA DE LINHAS
+def calcular_faixa_vetorizada(grade_atual, nova_grade, linha_inicio, linha_fim, tabela=None, contagem=None):
+    """
+    Calcula as linhas [linha_inicio, linha_fim) da próxima geração e escreve em nova_grade.
+    Lê uma linha extra acima e abaixo da faixa (quando existir) para contar os vizinhos.
+    Com 'contagem' (estatisticas.ContagemFaixa), calcula em trechos da altura de um bloco
+    e conta cada trecho logo depois de escrevê-lo, enquanto ele ainda está na cache.
+    """
+    colunas = grade_atual.shape[1]
+    if contagem is None:
+        calcular_bloco_vetorizado(grade_atual, nova_grade, linha_inicio, linha_fim, 0, colunas, tabela)
+        return
+    for inicio, fim in contagem.trechos(linha_inicio, linha_fim):
+        calcular_bloco_vetorizado(grade_atual, nova_grade, inicio, fim, 0, colunas, tabela)
+        contagem.contar(inicio, grade_atual[inicio:fim], nova_grade[inicio:fim])
+
+
+# FUNÇÃO 4: CÁLCULO DA NOVA GERAÇÃO (mesma assinatura de 'proxima_geracao')
+def proxima_geracao_vetorizada(grade_atual, tamanho, tabela=None):
+    """
+    Calcula a próxima geração da grade inteira.
+    Resultado idêntico, célula por célula, ao de 'proxima_geracao' (sequencial).
+    'tabela': ver 'aplicar_regras'.
+    """
+    vivos = contar_vizinhos_vetorizado(grade_atual)
+    return aplicar_regras(grade_atual, vivos, tabela=tabela)
+
+
+class MotorVetorizado:
+    """
+    'proxima_geracao_vetorizada' como motor do registro (motores.py), com a tabela da
+    regra (None = B3/S23 fixo) e, depois de 'ativar_contadores()', as estatísticas da
+    geração em 'contadores', contadas no próprio cálculo.
+    """
+
+    def __init__(self, tabela=None):
+        self.tabela = tabela
+        self.contar_estatisticas = False
+        self.contadores = None
+        self._contagem = None
+
+    def ativar_contadores(self):
+        self.contar_estatisticas = True
+
+    def __call__(self, grade_atual, tamanho):
+        if not self.contar_estatisticas:
+            return proxima_geracao_vetorizada(grade_atual, tamanho, self.tabela)
+        linhas, colunas = grade_atual.shape
+        if self._contagem is None or (self._contagem.linha_fim, self._contagem.colunas) != (linhas, colunas):
+            self._contagem = ContagemFaixa(0, linhas, colunas)
+        nova_grade = np.empty_like(grade_atual)
+        calcular_faixa_vetorizada(grade_atual, nova_grade, 0, linhas, self.tabela, self._contagem)
+        self.contadores = self._contagem.concluir()
+        return nova_grade
+
+
+# FUNÇÃO 5: DIVISÃO DO TRABALHO EM FAIXAS
+def dividir_faixas(tamanho, partes):
+    """
+    Divide as linhas [0, tamanho) em até 'partes' faixas contíguas de tamanhos quase iguais.
+    A sobra da divisão é espalhada uma linha por faixa (em vez de ir toda para a última).
+    """
+    partes = max(1, min(partes, tamanho))
+    base, sobra = divmod(tamanho, partes)
+    faixas = []
+    inicio = 0
+    for k in range(partes):
+        fim = inicio + base + (1 if k < sobra else 0)
+        faixas.append((inicio, fim))
+        inicio = fim
+    return faixas
@@ -0,0 +1,57 @@
+from motor_vetorizado import MotorVetorizado
+from motor_empacotado import proxima_geracao_bits
+from motor_ativo import MotorAtivo
+from motor_esparso import proxima_geracao_esparsa_int8
+from motor_blocos import MotorBlocos
+from motor_tabela import MotorTabela
+from regras import REGRA_PADRAO, eh_regra_padrao, tabela_para
+
+
+# --- REGISTRO DOS MOTORES DE CÁLCULO ---
+# Todos recebem e devolvem a grade int8, com a mesma assinatura de 'proxima_geracao':
+#     nova_grade = motor(grade_atual, tamanho)
+# Motores com estado são registrados pela classe: cada simulação ganha uma instância nova.
+# O motor "classico" (laço célula a célula) continua dentro de cada script.
+# "tabela" e "vetorizado" aceitam qualquer regra B/S (o vetorizado aplica a tabela compilada
+# da regra na última etapa); os demais calculam o B3/S23 fixo, em todos os pontos de entrada.
+MOTORES = {
+    "vetorizado": MotorVetorizado,
+    "empacotado": proxima_geracao_bits,
+    "ativo": MotorAtivo,
+    "esparso": proxima_geracao_esparsa_int8,
+    "blocos": MotorBlocos,
+    "tabela": MotorTabela,
+}
+
+
+MOTORES_COM_BLOCO = ("blocos", "tabela") # Aceitam o lado do bloco de cache (tamanho_bloco)
+MOTORES_COM_REGRA = ("vetorizado", "tabela") # Aceitam qualquer regra B/S
+
+
+def obter_motor(nome, regra=REGRA_PADRAO, tamanho_bloco=None):
+    """
+    Devolve a função de cálculo de geração registrada com o nome 'nome' para a 'regra' B/S.
+    'tamanho_bloco' (só "blocos" e "tabela") troca o lado padrão do bloco de cache.
+    """
+    if nome not in MOTORES:
+        opcoes = ", ".join(["classico"] + sorted(MOTORES))
+        raise ValueError(f"Motor desconhecido: '{nome}'. Opções: {opcoes}")
+    if tamanho_bloco is not None and nome not in MOTORES_COM_BLOCO:
+        raise ValueError(f"O motor '{nome}' não tem tamanho de bloco (só {', '.join(MOTORES_COM_BLOCO)})")
+    extras = {} if tamanho_bloco is None else {'tamanho_bloco': tamanho_bloco}
+    if nome == "tabela":
+        return MotorTabela(regra, **extras)
+    if nome == "vetorizado":
+        return MotorVetorizado(tabela_para(regra))
+    verificar_regra_fixa(nome, regra)
+    motor = MOTORES[nome]
+    if isinstance(motor, type):
+        return motor(**extras)
+    return motor
+
+
+def verificar_regra_fixa(nome, regra):
+    """Erro claro quando um motor que só calcula o B3/S23 recebe outra regra."""
+    if not eh_regra_padrao(regra):
+        raise ValueError(f"O motor '{nome}' só calcula a regra {REGRA_PADRAO}; "
+                         f"para '{regra}' use {' ou '.join(repr(m) for m in MOTORES_COM_REGRA)}")
@@ -0,0 +1,207 @@
+import socket
+import struct
+import numpy as np
+from codificacao import decodificar_resultado
+from regras import normalizar_regra
+
+
+# --- PROTOCOLO BINÁRIO ENTRE SERVIDOR E CLIENTES ---
+# Uma sessão usa UMA conexão TCP do início ao fim:
+#     cliente -> OLA            (handshake, valor = versão do protocolo, payload = regra B/S)
+#     servidor -> RECUSADO      (só se versão ou regra não batem; payload = motivo)
+#     servidor -> INICIO / PASSO ...   cliente -> RESULTADO ...
+#     servidor -> FIM           cliente -> FATIA (estado final da sua parte)
+# No modo faixas, um PASSO com a flag PEDIR_CONTADORES recebe, depois do RESULTADO,
+# um quadro CONTADORES com os contadores de cada geração calculada pelo cliente.
+#
+# Cada quadro tem um cabeçalho fixo de 32 bytes seguido do buffer cru de um ndarray
+# (sem pickle). O buffer é enviado direto via memoryview e lido com recv_into.
+# RESULTADO e FATIA vêm codificados (flags = código de codificacao.py): bit-empacotados,
+# XOR com a referência ou só os índices das células que mudaram, o que for menor.
+
+VERSAO = 3
+MAGICO = b'JDV1'
+
+# magico, tipo, dtype, flags, linhas, colunas, valor, tamanho do payload
+CABECALHO = struct.Struct('!4sBBHIIQQ')
+
+# Tipos de quadro
+OLA = 1
+INICIO = 2
+PASSO = 3
+RESULTADO = 4
+FIM = 5
+FATIA = 6
+CONTADORES = 7
+RECUSADO = 8
+
+# Flags do quadro PASSO (quais halos estão presentes)
+HALO_ACIMA = 1
+HALO_ABAIXO = 2
+PEDIR_CONTADORES = 4
+
+# Códigos de dtype do payload
+DTYPES = {0: None, 1: np.dtype(np.int8), 2: np.dtype(np.uint8), 3: np.dtype('<u8'), 4: np.dtype('<u4')}
+CODIGOS_DTYPE = {dtype: codigo for codigo, dtype in DTYPES.items() if dtype is not None}
+
+
+def configurar_socket(conn):
+    """Desliga o algoritmo de Nagle: quadros pequenos (halos) saem na hora."""
+    conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    return conn
+
+
+def tamanho_quadro(array):
+    """Bytes que um quadro com este payload ocupa no fio (para os contadores de tráfego)."""
+    return CABECALHO.size + (array.nbytes if array is not None else 0)
+
+
+def enviar_quadro(conn, tipo, array=None, flags=0, valor=0):
+    """Envia um quadro. 'array' (2D) vai como buffer cru, sem cópia nem serialização."""
+    if array is None:
+        conn.sendall(CABECALHO.pack(MAGICO, tipo, 0, flags, 0, 0, valor, 0))
+        return CABECALHO.size
+
+    array = np.ascontiguousarray(array)
+    if array.ndim == 1:
+        array = array[np.newaxis, :]
+    linhas, colunas = array.shape
+    cabecalho = CABECALHO.pack(MAGICO, tipo, CODIGOS_DTYPE[array.dtype], flags, linhas, colunas, valor, array.nbytes)
+    conn.sendall(cabecalho)
+    if array.nbytes: # Payload vazio (ex.: resultado sem nenhuma mudança) vai só com o cabeçalho
+        conn.sendall(memoryview(array).cast('B'))
+    return CABECALHO.size + array.nbytes
+
+
+def texto_para_payload(texto):
+    """Texto ASCII como payload uint8 (a regra no OLA, o motivo no RECUSADO)."""
+    return np.frombuffer(texto.encode('ascii', 'replace'), dtype=np.uint8)
+
+
+def payload_para_texto(payload):
+    return payload.tobytes().decode('ascii', 'replace') if payload is not None else ""
+
+
+def enviar_ola(conn, regra):
+    """Abre a sessão: versão do protocolo e a regra B/S que este cliente vai calcular."""
+    return enviar_quadro(conn, OLA, texto_para_payload(normalizar_regra(regra)), valor=VERSAO)
+
+
+def conferir_ola(quadro, regra):
+    """
+    Confere o OLA de um cliente contra a versão e a regra do servidor.
+    Retorna None se a sessão pode seguir, ou o motivo da recusa.
+    """
+    if quadro is None:
+        return "conexão encerrada antes do OLA"
+    tipo, _, versao, payload = quadro
+    if tipo != OLA:
+        return f"quadro {tipo} em vez de OLA"
+    if versao != VERSAO:
+        return f"protocolo v{versao}, servidor usa v{VERSAO}"
+    regra_cliente = payload_para_texto(payload)
+    try:
+        igual = normalizar_regra(regra_cliente) == normalizar_regra(regra)
+    except ValueError:
+        igual = False
+    if not igual:
+        return f"regra '{regra_cliente}', servidor usa '{normalizar_regra(regra)}'"
+    return None
+
+
+def receber_exato(conn, buffer):
+    """Preenche 'buffer' (memoryview gravável) com bytes do socket. Retorna False se a conexão fechar."""
+    recebidos = 0
+    total = len(buffer)
+    while recebidos < total:
+        n = conn.recv_into(buffer[recebidos:], total - recebidos)
+        if n == 0:
+            return False
+        recebidos += n
+    return True
+
+
+def receber_quadro(conn, saida=None):
+    """
+    Recebe um quadro e retorna (tipo, flags, valor, array).
+    Se 'saida' for dada e tiver o formato certo, o payload é escrito nela (sem alocar).
+    Retorna None se a conexão foi encerrada; levanta ConnectionError se o servidor recusou a sessão.
+    """
+    cabecalho = bytearray(CABECALHO.size)
+    if not receber_exato(conn, memoryview(cabecalho)):
+        return None
+    magico, tipo, codigo_dtype, flags, linhas, colunas, valor, tamanho = CABECALHO.unpack(cabecalho)
+    if magico != MAGICO:
+        raise ConnectionError(f"Quadro inválido: cabeçalho {magico!r}")
+
+    array = None
+    if codigo_dtype:
+        dtype = DTYPES[codigo_dtype]
+        if saida is not None and saida.shape == (linhas, colunas) and saida.dtype == dtype and saida.flags.c_contiguous:
+            array = saida
+        else:
+            array = np.empty((linhas, colunas), dtype=dtype)
+        if tamanho and not receber_exato(conn, memoryview(array).cast('B')):
+            return None
+    if tipo == RECUSADO:
+        raise ConnectionError(f"Sessão recusada pelo servidor: {payload_para_texto(array)}")
+    return tipo, flags, valor, array
+
+
+def esperar_quadro(conn, tipo_esperado, saida=None):
+    """Recebe um quadro e confere o tipo. Levanta ConnectionError se a sessão quebrar."""
+    quadro = receber_quadro(conn, saida)
+    if quadro is None:
+        raise ConnectionError("Conexão encerrada no meio da sessão")
+    if quadro[0] != tipo_esperado:
+        raise ConnectionError(f"Quadro inesperado: tipo {quadro[0]} (esperado {tipo_esperado})")
+    return quadro
+
+
+def enviar_codificado(conn, tipo, array, codificador, referencia=None, valor=0):
+    """Envia 'array' (int8) na menor codificação escolhida pelo 'codificador' (código nas flags)."""
+    codigo, payload = codificador.codificar(array, referencia)
+    return enviar_quadro(conn, tipo, payload, flags=codigo, valor=valor)
+
+
+def esperar_codificado(conn, tipo_esperado, saida, referencia=None):
+    """Recebe um quadro de 'enviar_codificado' direto em 'saida'. Retorna (valor, bytes no fio)."""
+    _, codigo, valor, payload = esperar_quadro(conn, tipo_esperado)
+    decodificar_resultado(codigo, payload, saida, referencia)
+    return valor, tamanho_quadro(payload)
+
+
+# --- VERSÃO asyncio (StreamReader / StreamWriter) ---
+async def enviar_quadro_async(writer, tipo, array=None, flags=0, valor=0):
+    """Mesmo formato de 'enviar_quadro', para o coordenador asyncio."""
+    if array is None:
+        writer.write(CABECALHO.pack(MAGICO, tipo, 0, flags, 0, 0, valor, 0))
+    else:
+        array = np.ascontiguousarray(array)
+        if array.ndim == 1:
+            array = array[np.newaxis, :]
+        linhas, colunas = array.shape
+        writer.write(CABECALHO.pack(MAGICO, tipo, CODIGOS_DTYPE[array.dtype], flags, linhas, colunas, valor, array.nbytes))
+        # Cópia proposital: o transporte pode guardar o buffer até enviá-lo,
+        # e a grade de origem é reaproveitada nas gerações seguintes.
+        writer.write(array.tobytes())
+    await writer.drain()
+
+
+async def receber_quadro_async(reader):
+    """
+    Mesmo formato de 'receber_quadro', para o coordenador asyncio.
+    Levanta asyncio.IncompleteReadError se a conexão fechar no meio do quadro.
+    """
+    cabecalho = await reader.readexactly(CABECALHO.size)
+    magico, tipo, codigo_dtype, flags, linhas, colunas, valor, tamanho = CABECALHO.unpack(cabecalho)
+    if magico != MAGICO:
+        raise ConnectionError(f"Quadro inválido: cabeçalho {magico!r}")
+
+    array = None
+    if codigo_dtype and tamanho:
+        dados = await reader.readexactly(tamanho)
+        array = np.frombuffer(dados, dtype=DTYPES[codigo_dtype]).reshape(linhas, colunas)
+    elif codigo_dtype:
+        array = np.empty((linhas, colunas), dtype=DTYPES[codigo_dtype])
+    return tipo, flags, valor, array
@@ -0,0 +1,111 @@
+import re
+from functools import lru_cache
+import numpy as np
+
+
+# --- REGRAS "LIFE-LIKE" NO FORMATO B/S ---
+# "B3/S23" = nasce com 3 vizinhos, sobrevive com 2 ou 3 (o Jogo da Vida). Qualquer
+# outra regra do mesmo tipo cabe no formato: "B36/S23" (HighLife), "B2/S" (Seeds)...
+#
+# A regra vira uma tabela de consulta de 20 entradas, indexada pela soma 3x3 (a célula
+# mais os 8 vizinhos, 0 a 9) e pelo estado da célula:
+#     indice = 2 * soma + viva      ->      proximo_estado = tabela[indice]
+#
+# Consultar a tabela célula a célula (np.take) custa ~25x uma comparação vetorizada no
+# NumPy, então a tabela é "compilada" uma vez em grupos de somas:
+#   ambos    : somas em que a célula fica viva nos dois estados   -> soma == s
+#   so_viva  : só se já estava viva                               -> soma == s & viva
+#   so_morta : só se estava morta                                 -> soma == s & ~viva
+# O B3/S23 compila para {3} em 'ambos' e {4} em 'so_viva': exatamente as operações do
+# caminho fixo, e qualquer outra regra custa uma comparação a mais por grupo.
+
+REGRA_PADRAO = "B3/S23"
+TAMANHO_TABELA = 20
+
+_FORMATO = re.compile(r"^B([0-8]*)/S([0-8]*)$", re.IGNORECASE)
+
+
+def interpretar_regra(regra):
+    """Devolve (nascimentos, sobrevivencias): conjuntos de quantidades de vizinhos."""
+    encontrada = _FORMATO.match(regra.strip())
+    if encontrada is None:
+        raise ValueError(f"Regra inválida: '{regra}'. Use o formato B/S, ex.: B3/S23 ou B36/S23")
+    nascimentos, sobrevivencias = encontrada.groups()
+    return frozenset(map(int, nascimentos)), frozenset(map(int, sobrevivencias))
+
+
+def normalizar_regra(regra):
+    """Forma canônica da regra ('b63/s32' -> 'B36/S23'), usada em comparações e checkpoints."""
+    nascimentos, sobrevivencias = interpretar_regra(regra)
+    return f"B{''.join(map(str, sorted(nascimentos)))}/S{''.join(map(str, sorted(sobrevivencias)))}"
+
+
+def eh_regra_padrao(regra):
+    """True se 'regra' é o Jogo da Vida (B3/S23), o único que os motores fixos calculam."""
+    return normalizar_regra(regra) == REGRA_PADRAO
+
+
+def criar_tabela(regra):
+    """Tabela uint8 de TAMANHO_TABELA entradas: tabela[2 * soma3x3 + viva] = próximo estado."""
+    nascimentos, sobrevivencias = interpretar_regra(regra)
+    tabela = np.zeros(TAMANHO_TABELA, dtype=np.uint8)
+    for soma in range(10):
+        if soma in nascimentos:
+            tabela[2 * soma] = 1          # Morta: a soma 3x3 é só dos vizinhos
+        if soma >= 1 and soma - 1 in sobrevivencias:
+            tabela[2 * soma + 1] = 1      # Viva: desconta a própria célula
+    return tabela
+
+
+class TabelaRegra:
+    """Tabela de uma regra B/S, compilada em grupos de somas (ver o topo do arquivo)."""
+
+    def __init__(self, regra):
+        self.regra = normalizar_regra(regra)
+        self.entradas = criar_tabela(self.regra)
+        self.entradas.setflags(write=False)
+        morta, viva = self.entradas[0::2], self.entradas[1::2]
+        self.ambos = tuple(int(s) for s in np.flatnonzero(morta & viva))
+        self.so_viva = tuple(int(s) for s in np.flatnonzero(viva & ~morta))
+        self.so_morta = tuple(int(s) for s in np.flatnonzero(morta & ~viva))
+        self._grupos = [(s, None) for s in self.ambos] + [(s, 'viva') for s in self.so_viva] \
+            + [(s, 'morta') for s in self.so_morta]
+
+    def aplicar(self, soma, viva, saida, rascunho=None):
+        """
+        Escreve em 'saida' (bool) o próximo estado a partir da soma 3x3 (célula incluída)
+        e de 'viva' (bool). 'rascunho' (bool, mesma forma) evita alocar a cada chamada.
+        """
+        if not self._grupos:
+            saida[...] = False
+            return saida
+        if rascunho is None and len(self._grupos) > 1:
+            rascunho = np.empty(soma.shape, dtype=bool)
+        for k, (s, estado) in enumerate(self._grupos):
+            destino = saida if k == 0 else rascunho # O primeiro grupo escreve direto na saída
+            np.equal(soma, s, out=destino)
+            if estado == 'viva':
+                np.logical_and(destino, viva, out=destino)
+            elif estado == 'morta':
+                np.greater(destino, viva, out=destino) # destino & ~viva
+            if k:
+                np.logical_or(saida, rascunho, out=saida)
+        return saida
+
+    def __repr__(self):
+        return f"TabelaRegra('{self.regra}')"
+
+
+@lru_cache(maxsize=None)
+def _tabela_em_cache(regra):
+    return TabelaRegra(regra)
+
+
+def obter_tabela(regra):
+    """TabelaRegra da regra (uma por regra normalizada, reaproveitada entre chamadas)."""
+    return _tabela_em_cache(normalizar_regra(regra))
+
+
+def tabela_para(regra):
+    """Tabela da regra, ou None para B3/S23 (os núcleos vetorizados mantêm o caminho fixo)."""
+    return None if eh_regra_padrao(regra) else obter_tabela(regra)
@@ -0,0 +1,194 @@
+import os
+import struct
+import zlib
+import numpy as np
+from motor_empacotado import desempacotar_grade
+
+# --- RENDERIZAÇÃO DIRETA (PBM / PNG), SEM MATPLOTLIB ---
+# A grade vira imagem de 1 bit por pixel, escrita uma faixa de linhas por vez:
+# a memória usada depende de LINHAS_POR_FAIXA x colunas, não do tamanho da grade.
+# Cores iguais às das imagens do projeto: célula viva = branco, morta = preto.
+#
+# Fontes aceitas em todas as funções:
+#   - grade int8/bool (linhas x colunas), inclusive np.memmap
+#   - (empacotada, colunas): matriz uint64 de motor_empacotado.py (sem desempacotar)
+#   - nome de um arquivo .ckpt (lido por faixas via np.memmap, sem carregar o arquivo)
+
+LINHAS_POR_FAIXA = 512     # Linhas lidas e escritas de cada vez
+TAMANHO_BLOCO = 4096       # Lado dos blocos em 'salvar_blocos' (múltiplo de 8)
+LADO_MINIMO_ZOOM = 1024    # 'salvar_niveis_zoom' reduz pela metade até o maior lado caber aqui
+NIVEL_COMPRESSAO = 1       # zlib rápido: em imagens de 1 bit os níveis altos quase não comprimem mais
+LIMITE_MATPLOTLIB = 2000 * 2000 # Células: acima disso os scripts usam este módulo em vez do matplotlib
+
+# Inverte a ordem dos bits de cada byte: o empacotamento do projeto é 'little'
+# (coluna 0 no bit 0) e PBM/PNG guardam o pixel mais à esquerda no bit mais alto.
+_INVERTE_BITS = np.array([int(f"{b:08b}"[::-1], 2) for b in range(256)], dtype=np.uint8)
+
+
+# FUNÇÃO 1: FONTES (tudo vira um leitor de faixas)
+def _abrir_fonte(fonte):
+    """
+    Devolve (linhas, colunas, ler_bytes, ler_celulas):
+      ler_bytes(l0, l1)   -> uint8 (l1-l0, ceil(colunas/8)), bit mais alto = coluna mais à esquerda
+      ler_celulas(l0, l1) -> int8  (l1-l0, colunas)
+    """
+    if isinstance(fonte, (str, os.PathLike)):
+        from checkpoint import abrir_checkpoint
+        cabecalho, corpo = abrir_checkpoint(fonte)
+        fonte = (corpo, cabecalho['colunas']) if cabecalho['codificacao'] == 'bits' else corpo
+
+    if isinstance(fonte, tuple):
+        empacotada, colunas = fonte
+        bytes_linha = -(-colunas // 8)
+
+        def ler_bytes(l0, l1):
+            faixa = np.ascontiguousarray(empacotada[l0:l1]).view(np.uint8)[:, :bytes_linha]
+            return _INVERTE_BITS[faixa]
+
+        def ler_celulas(l0, l1):
+            return desempacotar_grade(empacotada[l0:l1], colunas)
+
+        return empacotada.shape[0], colunas, ler_bytes, ler_celulas
+
+    grade = fonte
+    def ler_bytes(l0, l1):
+        return np.packbits(grade[l0:l1] != 0, axis=1)
+
+    def ler_celulas(l0, l1):
+        return np.asarray(grade[l0:l1], dtype=np.int8)
+
+    return grade.shape[0], grade.shape[1], ler_bytes, ler_celulas
+
+
+# FUNÇÃO 2: ESCRITORES EM FLUXO
+class EscritorPNG:
+    """PNG em tons de cinza de 1 bit; as linhas chegam já empacotadas (1 = branco)."""
+
+    def __init__(self, nome_arquivo, largura, altura):
+        self._arquivo = open(nome_arquivo, 'wb')
+        self._compressor = zlib.compressobj(NIVEL_COMPRESSAO)
+        self._arquivo.write(b'\x89PNG\r\n\x1a\n')
+        self._bloco(b'IHDR', struct.pack('>IIBBBBB', largura, altura, 1, 0, 0, 0, 0))
+
+    def _bloco(self, tipo, dados):
+        self._arquivo.write(struct.pack('>I', len(dados)))
+        self._arquivo.write(tipo)
+        self._arquivo.write(dados)
+        self._arquivo.write(struct.pack('>I', zlib.crc32(dados, zlib.crc32(tipo))))
+
+    def escrever_linhas(self, linhas_empacotadas):
+        # Cada linha do PNG começa com o byte de filtro (0 = nenhum)
+        com_filtro = np.zeros((linhas_empacotadas.shape[0], linhas_empacotadas.shape[1] + 1), dtype=np.uint8)
+        com_filtro[:, 1:] = linhas_empacotadas
+        dados = self._compressor.compress(com_filtro.tobytes())
+        if dados:
+            self._bloco(b'IDAT', dados)
+
+    def fechar(self):
+        self._bloco(b'IDAT', self._compressor.flush())
+        self._bloco(b'IEND', b'')
+        self._arquivo.close()
+
+
+class EscritorPBM:
+    """PBM binário (P4). No PBM o bit 1 é preto, então os bytes são invertidos."""
+
+    def __init__(self, nome_arquivo, largura, altura):
+        self._arquivo = open(nome_arquivo, 'wb')
+        self._arquivo.write(f"P4\n{largura} {altura}\n".encode('ascii'))
+
+    def escrever_linhas(self, linhas_empacotadas):
+        self._arquivo.write(np.invert(linhas_empacotadas).tobytes())
+
+    def fechar(self):
+        self._arquivo.close()
+
+
+def _criar_escritor(nome_arquivo, largura, altura):
+    """Escolhe o formato pela extensão (.png ou .pbm)."""
+    extensao = os.path.splitext(nome_arquivo)[1].lower()
+    if extensao == '.png':
+        return EscritorPNG(nome_arquivo, largura, altura)
+    if extensao == '.pbm':
+        return EscritorPBM(nome_arquivo, largura, altura)
+    raise ValueError(f"Formato '{extensao}' não suportado (use .png ou .pbm)")
+
+
+# FUNÇÃO 3: IMAGEM INTEIRA
+def salvar_imagem(fonte, nome_arquivo, linhas_por_faixa=LINHAS_POR_FAIXA):
+    """Grava a grade inteira, 1 pixel por célula, uma faixa de linhas por vez."""
+    linhas, colunas, ler_bytes, _ = _abrir_fonte(fonte)
+    escritor = _criar_escritor(nome_arquivo, colunas, linhas)
+    try:
+        for l0 in range(0, linhas, linhas_por_faixa):
+            escritor.escrever_linhas(ler_bytes(l0, min(l0 + linhas_por_faixa, linhas)))
+    finally:
+        escritor.fechar()
+    print(f"✅ Imagem {colunas}x{linhas} salva em '{nome_arquivo}'")
+
+
+# FUNÇÃO 4: BLOCOS (mosaico)
+def salvar_blocos(fonte, pasta, tamanho_bloco=TAMANHO_BLOCO, formato='png'):
+    """
+    Corta a grade em blocos de 'tamanho_bloco' x 'tamanho_bloco' e grava cada um em
+    'pasta/bloco_<linha>_<coluna>.<formato>'. Lê uma faixa de blocos por vez.
+    """
+    if tamanho_bloco % 8:
+        raise ValueError("tamanho_bloco precisa ser múltiplo de 8 (blocos alinhados em bytes)")
+    linhas, colunas, ler_bytes, _ = _abrir_fonte(fonte)
+    os.makedirs(pasta, exist_ok=True)
+    bytes_bloco = tamanho_bloco // 8
+    num_blocos = 0
+    for bi, l0 in enumerate(range(0, linhas, tamanho_bloco)):
+        faixa = ler_bytes(l0, min(l0 + tamanho_bloco, linhas))
+        for bj, c0 in enumerate(range(0, colunas, tamanho_bloco)):
+            largura = min(tamanho_bloco, colunas - c0)
+            escritor = _criar_escritor(os.path.join(pasta, f"bloco_{bi}_{bj}.{formato}"), largura, faixa.shape[0])
+            escritor.escrever_linhas(np.ascontiguousarray(faixa[:, bj * bytes_bloco:bj * bytes_bloco + -(-largura // 8)]))
+            escritor.fechar()
+            num_blocos += 1
+    print(f"✅ {num_blocos} blocos de até {tamanho_bloco}x{tamanho_bloco} salvos em '{pasta}'")
+
+
+# FUNÇÃO 5: VISÃO GERAL (max-pooling) E NÍVEIS DE ZOOM
+def _reduzir_metade(celulas):
+    """Max-pooling 2x2: o pixel fica vivo se qualquer uma das 4 células estiver viva."""
+    linhas, colunas = celulas.shape
+    if linhas % 2 or colunas % 2:
+        acolchoada = np.zeros((linhas + linhas % 2, colunas + colunas % 2), dtype=celulas.dtype)
+        acolchoada[:linhas, :colunas] = celulas
+        celulas = acolchoada
+    pares = celulas[0::2] | celulas[1::2]
+    # Dois pixels vizinhos (uint8) lidos como um uint16: diferente de zero se algum estiver vivo
+    return (pares.view(np.uint16) != 0).view(np.uint8)
+
+
+def salvar_niveis_zoom(fonte, prefixo, num_niveis=None, lado_minimo=LADO_MINIMO_ZOOM, formato='png'):
+    """
+    Grava visões gerais reduzidas por max-pooling: 'prefixo_zoom2', 'prefixo_zoom4', ...
+    Cada nível sai do anterior (2x2 -> 1), então o custo total é pouco mais que o do
+    primeiro nível, e todos são gravados numa ÚNICA passada pela fonte. Sem 'num_niveis',
+    reduz até o maior lado caber em 'lado_minimo'. Devolve a lista de arquivos gravados.
+    """
+    linhas, colunas, _, ler_celulas = _abrir_fonte(fonte)
+    if num_niveis is None:
+        num_niveis = 1
+        while -(-max(linhas, colunas) // (2 ** num_niveis)) > lado_minimo:
+            num_niveis += 1
+    fatores = [2 ** k for k in range(1, num_niveis + 1)]
+    # A faixa precisa ser múltipla do maior fator para nenhum bloco ficar partido entre faixas
+    passo = fatores[-1] * max(1, LINHAS_POR_FAIXA // fatores[-1])
+
+    nomes = [f"{prefixo}_zoom{f}.{formato}" for f in fatores]
+    escritores = [_criar_escritor(nome, -(-colunas // f), -(-linhas // f)) for nome, f in zip(nomes, fatores)]
+    try:
+        for l0 in range(0, linhas, passo):
+            nivel = ler_celulas(l0, min(l0 + passo, linhas)).view(np.uint8)
+            for escritor in escritores:
+                nivel = _reduzir_metade(nivel)
+                escritor.escrever_linhas(np.packbits(nivel, axis=1))
+    finally:
+        for escritor in escritores:
+            escritor.fechar()
+    print(f"✅ Níveis de zoom {', '.join(f'1:{f}' for f in fatores)} salvos com o prefixo '{prefixo}'")
+    return nomes
@@ -1,17 +1,53 @@
 import numpy as np
 import time
 import socket
-import pickle
 import threading
 import os
 import sys
+import multiprocessing as mp
+import asyncio
+import itertools
+from motor_vetorizado import dividir_faixas
+from instrumentacao import criar_rastreador, RASTREADOR_NULO
+from checkpoint import salvar_checkpoint, talvez_salvar_checkpoint
+from historico import criar_gravador, GRAVADOR_NULO
+from ciclos import criar_detector, DETECTOR_NULO
+from estatisticas import criar_serie, juntar_faixas, SERIE_NULA
+from codificacao import decodificar_resultado
+from protocolo import (
+    INICIO, PASSO, RESULTADO, FIM, FATIA, CONTADORES, RECUSADO, HALO_ACIMA, HALO_ABAIXO, PEDIR_CONTADORES,
+    configurar_socket, enviar_quadro, receber_quadro, esperar_quadro, enviar_quadro_async, receber_quadro_async,
+    esperar_codificado, tamanho_quadro, conferir_ola, texto_para_payload,
+)
 
 # --- PARÂMETROS GLOBAIS ---
 TAMANHO_GRADE = 100 
 NUM_GERACOES = 200 
 HOST = '127.0.0.1' 
 PORT = 65432
-GRID_FILE = "grade_distribuida_final.pickle" # Arquivo para salvar o estado final
+GRID_FILE = "grade_distribuida_final.ckpt" # Arquivo para salvar o estado final (formato .ckpt)
+INTERVALO_CHECKPOINT = 0 # Modos 1:1 e async: checkpoint em GRID_FILE a cada N gerações (0 = desligado)
+GRAVAR_HISTORICO = False # Modos 1:1 e async: grava todas as gerações em ARQUIVO_HISTORICO
+ARQUIVO_HISTORICO = "historico_servidor.hist"
+DETECTAR_CICLOS = False  # Modos 1:1 e async: para ao detectar estabilização/ciclo e salta para a última geração
+ESTATISTICAS = False     # Grava população, nascimentos, mortes e blocos ativos por geração em ARQUIVO_ESTATISTICAS
+ARQUIVO_ESTATISTICAS = "estatisticas_distribuida.csv" # .csv ou .bin; no modo faixas os clientes contam e o servidor soma
+REGRA = "B3/S23" # Regra B/S da simulação: passada aos clientes locais, exigida no OLA dos externos e gravada nos checkpoints
+
+# Modo de distribuição: "faixas" (N clientes, troca de halos), "async" (coordenador asyncio
+# com blocos redistribuíveis) ou "1:1" (grade inteira por geração)
+MODO = "faixas"
+NUM_CLIENTES = 4
+GERACOES_POR_TROCA = 0       # Modo faixas: gerações por ida e volta na rede (k); 0 = automático
+PROFUNDIDADE_MAXIMA = 16     # Modo faixas: maior k (e profundidade das bordas no modo automático)
+RODADAS_CALIBRACAO = 5       # Modo faixas automático: rodadas com k = 1 medindo latência x cálculo
+BLOCOS_POR_CLIENTE = 2       # Modo async: blocos por geração = NUM_CLIENTES * BLOCOS_POR_CLIENTE
+TIMEOUT_TRABALHADOR = 5.0    # Modo async: segundos até um trabalhador ser considerado perdido
+INICIAR_CLIENTES_LOCAIS = True # Se True, o próprio servidor lança os NUM_CLIENTES localmente
+
+# Instrumentação opcional: tempo por fase e bytes trafegados (trace do Chrome + tabela)
+INSTRUMENTAR = False
+TRACE_FILE = "trace_servidor.json"
 
 
 # --- FUNÇÕES BÁSICAS ---
@@ -33,48 +69,52 @@ def salvar_tempo_em_arquivo(algoritmo, tempo):
         print(f"❌ ERRO ao salvar o tempo: {e}")
 
 
+# --- SESSÃO: ACEITA O CLIENTE E CONFERE O HANDSHAKE ---
+def aceitar_cliente(s):
+    """
+    Aceita conexões até uma mandar um OLA válido (mesma versão do protocolo e mesma REGRA).
+    As outras recebem um RECUSADO com o motivo e são fechadas.
+    """
+    while True:
+        conn, addr = s.accept()
+        configurar_socket(conn)
+        try:
+            motivo = conferir_ola(receber_quadro(conn), REGRA)
+        except ConnectionError as e:
+            motivo = str(e)
+        if motivo is None:
+            return conn, addr
+        print(f"[SERVIDOR] Cliente {addr} recusado ({motivo}).", file=sys.stderr)
+        with conn:
+            try:
+                enviar_quadro(conn, RECUSADO, texto_para_payload(motivo))
+            except OSError:
+                pass
+
+
 # --- FUNÇÃO DE COMUNICAÇÃO (Worker Handler para 1 Cliente) ---
-# A função foi simplificada e os prints de comunicação removidos/comentados.
-def handle_client(conn, addr, grade_atual, nova_grade, tamanho):
-    """Lida com a conexão do cliente, envia o trabalho e recebe o resultado."""
-    # print(f"\n[SERVIDOR] Conexão estabelecida com o Cliente em {addr}") # Silenciado
-    
-    # 1. PREPARAR E ENVIAR DADOS: Envia a grade inteira, pois é 1:1
-    dados_para_enviar = {
-        'grade_fatia': grade_atual, 
-        'tamanho': tamanho,
-        # O cliente calculará a grade inteira (0 a tamanho)
-        'linha_inicio': 0, 
-        'linha_fim': tamanho
-    }
-    
-    data = pickle.dumps(dados_para_enviar)
-    
-    # Envia o tamanho dos dados e depois os dados
-    conn.sendall(len(data).to_bytes(8, byteorder='big')) 
-    conn.sendall(data) 
-    
-    # 2. RECEBER RESULTADO (A grade completa calculada pelo cliente)
-    tamanho_resposta_bytes = conn.recv(8)
-    tamanho_resposta = int.from_bytes(tamanho_resposta_bytes, byteorder='big')
-    
-    dados_recebidos = b''
-    while len(dados_recebidos) < tamanho_resposta:
-        pacote = conn.recv(tamanho_resposta - len(dados_recebidos))
-        if not pacote: break
-        dados_recebidos += pacote
-    
-    nova_grade_completa = pickle.loads(dados_recebidos)
-    
-    # 3. MENSAGEM DE COMUNICAÇÃO MANUAL SOLICITADA - BLOCO REMOVIDO/SILENCIADO
-    
-    return nova_grade_completa
+# A conexão é a mesma em todas as gerações: um quadro PASSO com a grade, um RESULTADO de volta.
+def handle_client(conn, addr, grade_atual, nova_grade, tamanho, rastreador=RASTREADOR_NULO, geracao=None):
+    """Envia a grade atual ao cliente e recebe o resultado direto em 'nova_grade'."""
+    # 1. ENVIAR DADOS: a grade inteira, pois é 1:1 (buffer cru, sem pickle)
+    with rastreador.fase("enviar", geracao):
+        rastreador.contar_bytes("enviados", enviar_quadro(conn, PASSO, grade_atual))
+
+    # 2. RECEBER RESULTADO (a grade completa calculada pelo cliente, codificada contra a grade enviada)
+    # O tempo desta fase inclui o cálculo feito pelo cliente.
+    with rastreador.fase("receber", geracao):
+        _, recebidos = esperar_codificado(conn, RESULTADO, nova_grade, grade_atual)
+    rastreador.contar_bytes("recebidos", recebidos)
+    return nova_grade
 
 
 # --- FUNÇÃO PRINCIPAL DO SERVIDOR (Loop de Gerações) ---
 def simular_jogo_da_vida_servidor(tamanho, num_geracoes):
-    start_time = time.time()
+    rastreador = criar_rastreador("servidor 1:1", INSTRUMENTAR)
+    detector = criar_detector(DETECTAR_CICLOS)
     grade_atual = inicializar_grade(tamanho)
+    # Buffer de destino pré-alocado: recebe o resultado e troca de papel com grade_atual
+    nova_grade = np.zeros((tamanho, tamanho), dtype=np.int8)
     
     print(f"\n--- Servidor: Início da Simulação Distribuída (1 Cliente, {num_geracoes} gerações) ---")
     
@@ -82,38 +122,386 @@ def simular_jogo_da_vida_servidor(tamanho, num_geracoes):
     with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
         s.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1) 
         s.bind((HOST, PORT))
-        
-        # Loop principal das gerações
-        for geracao in range(num_geracoes):
-            # Mantém apenas o print de progresso
-            #print(f"Servidor: Geração {geracao + 1}/{num_geracoes}. Aguardando Cliente...")
-            s.listen(1) # Espera 1 cliente
-            
-            # BLOQUEIA AQUI: Espera pela conexão do Cliente.
-            conn, addr = s.accept() 
-            
-            # Cria a nova grade de destino
-            nova_grade = np.zeros((tamanho, tamanho), dtype=np.int8)
-            
-            # Lida com a comunicação e obtém o resultado da nova geração
-            grade_atual = handle_client(conn, addr, grade_atual, nova_grade, tamanho)
-            
-            conn.close() # Fecha a conexão após cada geração
+        s.listen(1) # Espera 1 cliente
+
+        # BLOQUEIA AQUI uma única vez: a sessão dura a simulação inteira.
+        with rastreador.fase("aceitar"):
+            conn, addr = aceitar_cliente(s)
+        start_time = time.time()
+
+        with conn, criar_gravador(ARQUIVO_HISTORICO, tamanho, tamanho, GRAVAR_HISTORICO) as gravador, \
+                criar_serie(ARQUIVO_ESTATISTICAS, ESTATISTICAS) as serie:
+            gravador.registrar(0, grade_atual)
+            detector.observar(0, grade_atual)
+            # Loop principal das gerações
+            for geracao in range(num_geracoes):
+                resultado = handle_client(conn, addr, grade_atual, nova_grade, tamanho, rastreador, geracao)
+                grade_atual, nova_grade = resultado, grade_atual
+                serie.registrar(geracao + 1, nova_grade, grade_atual) # O servidor tem as duas grades inteiras
+                talvez_salvar_checkpoint(GRID_FILE, grade_atual, geracao + 1, INTERVALO_CHECKPOINT, regra=REGRA)
+                gravador.registrar(geracao + 1, grade_atual)
+                if detector.observar(geracao + 1, grade_atual):
+                    break
+
+            enviar_quadro(conn, FIM)
 
     end_time = time.time()
     tempo_total = end_time - start_time
+    grade_atual = detector.avancar_ate(num_geracoes, grade_atual)
     
     # 2. Salva o tempo e a grade final
     salvar_tempo_em_arquivo("Distribuida (1:1 Socket)", tempo_total)
+    rastreador.imprimir_resumo()
+    rastreador.salvar_trace(TRACE_FILE)
     
-    with open(GRID_FILE, 'wb') as f:
-        pickle.dump(grade_atual, f)
+    salvar_checkpoint(GRID_FILE, grade_atual, num_geracoes, REGRA)
         
     print(f"\n[FIM] Servidor: Simulação concluída. Tempo: {tempo_total:.4f}s.")
     print(f"[FIM] Grade final salva em '{GRID_FILE}'. Execute o 'analisador_final.py'.")
 
 
-if __name__ == "__main__":
+# --- MODO FAIXAS: DECOMPOSIÇÃO DE DOMÍNIO COM TROCA DE HALOS ---
+def escolher_geracoes_por_troca(latencia, tempo_por_linha, limite):
+    """
+    k que minimiza o custo por geração de uma troca a cada k gerações:
+        custo(k) = latencia / k + tempo_por_linha * (linhas da faixa + k - 1)
+    (cada troca paga uma latência; cada geração recalcula em média k - 1 linhas de halo
+    a mais). O mínimo fica em k = sqrt(latencia / tempo_por_linha), limitado a [1, limite].
+    """
+    if tempo_por_linha <= 0:
+        return limite
+    return int(min(max(round((max(latencia, 0.0) / tempo_por_linha) ** 0.5), 1), limite))
+
+
+def registrar_contadores_faixas(serie, conexoes, geracao, rastreador=RASTREADOR_NULO):
+    """
+    Recebe o quadro CONTADORES de cada cliente (uma linha por geração da troca:
+    população, nascimentos, mortes e atividade por bloco de colunas da faixa) e registra
+    a soma. O mapa de atividade tem uma linha por faixa.
+    """
+    por_cliente = []
+    for conn in conexoes:
+        _, _, _, contadores = esperar_quadro(conn, CONTADORES)
+        rastreador.contar_bytes("recebidos", tamanho_quadro(contadores))
+        por_cliente.append(contadores.astype(np.int64))
+    contadores = np.stack(por_cliente, axis=1) # geracoes x clientes x (3 + blocos de colunas)
+    for passo, linhas in enumerate(contadores):
+        serie.registrar_contadores(geracao + passo + 1, *juntar_faixas(linhas))
+
+
+def simular_jogo_da_vida_servidor_faixas(tamanho, num_geracoes, num_clientes, geracoes_por_troca=None):
+    """
+    Divide o tabuleiro em faixas de linhas, uma por cliente conectado.
+    Cada cliente guarda a sua faixa durante toda a simulação; a cada troca o servidor
+    só repassa as linhas de borda (halos) entre vizinhos. O tráfego por geração é
+    proporcional ao perímetro das faixas, não à área da grade.
+    Bloqueio temporal: com halos de k linhas cada cliente avança k gerações sozinho antes
+    da próxima troca (uma ida e volta a cada k gerações, com k - 1 linhas recalculadas em
+    redundância). 'geracoes_por_troca' = k fixo; 0 = automático (mede latência x cálculo
+    nas RODADAS_CALIBRACAO primeiras trocas com k = 1).
+    Como o servidor só guarda as bordas, não há checkpoint periódico, histórico nem detecção de ciclos neste modo:
+    a grade completa só existe (e é salva) depois de recolher as faixas no FIM. As estatísticas
+    (ESTATISTICAS) são contadas por cada cliente na própria faixa e somadas aqui.
+    """
+    rastreador = criar_rastreador("servidor faixas", INSTRUMENTAR)
+    grade_inicial = inicializar_grade(tamanho)
+    faixas = dividir_faixas(tamanho, num_clientes)
+    num_clientes = len(faixas)
+
+    if geracoes_por_troca is None:
+        geracoes_por_troca = GERACOES_POR_TROCA
+    automatico = geracoes_por_troca <= 0
+    # Uma faixa precisa ter pelo menos k linhas para servir de halo de k linhas à vizinha
+    limite = max(1, min(PROFUNDIDADE_MAXIMA, min(fim - inicio for inicio, fim in faixas)))
+    k = 1 if automatico else min(geracoes_por_troca, limite)
+    profundidade = limite if automatico else k # Linhas de borda que cada cliente devolve
+
+    descricao_k = "automático" if automatico else str(k)
+    print(f"\n--- Servidor: Início da Simulação Distribuída ({num_clientes} clientes em faixas, {num_geracoes} gerações, "
+          f"k = {descricao_k}) ---")
+
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s, criar_serie(ARQUIVO_ESTATISTICAS, ESTATISTICAS) as serie:
+        s.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        s.bind((HOST, PORT))
+        s.listen(num_clientes)
+        pedir_contadores = PEDIR_CONTADORES if ESTATISTICAS else 0
+
+        # 1. Aceita todos os clientes uma única vez (conexões persistentes)
+        conexoes = []
+        with rastreador.fase("aceitar"):
+            while len(conexoes) < num_clientes:
+                conn, addr = aceitar_cliente(s)
+                conexoes.append(conn)
+
+        start_time = time.time()
+
+        # 2. Distribui as faixas: cada cliente recebe só a sua parte (flags = profundidade das bordas)
+        with rastreador.fase("distribuir"):
+            for conn, (linha_inicio, linha_fim) in zip(conexoes, faixas):
+                rastreador.contar_bytes("enviados", enviar_quadro(
+                    conn, INICIO, grade_inicial[linha_inicio:linha_fim], flags=profundidade, valor=linha_inicio))
+
+        # Bordas de cada faixa: linhas [0, p) = as p primeiras, [p, 2p) = as p últimas
+        p = profundidade
+        bordas = np.empty((num_clientes, 2 * p, tamanho), dtype=np.int8)
+        for c, (linha_inicio, linha_fim) in enumerate(faixas):
+            bordas[c, :p] = grade_inicial[linha_inicio:linha_inicio + p]
+            bordas[c, p:] = grade_inicial[linha_fim - p:linha_fim]
+        halos = np.zeros((2 * k, tamanho), dtype=np.int8)
+        maior_faixa = max(fim - inicio for inicio, fim in faixas)
+
+        # 3. Loop de trocas: envia halos de g linhas a todos (g gerações), depois recolhe as novas bordas
+        geracao = 0
+        trocas = 0
+        latencia_calibracao = calculo_calibracao = 0.0
+        while geracao < num_geracoes:
+            g = min(k, num_geracoes - geracao)
+            if halos.shape[0] != 2 * g:
+                halos = np.zeros((2 * g, tamanho), dtype=np.int8)
+            inicio_troca = time.perf_counter()
+            with rastreador.fase("enviar_halos", geracao):
+                for c, conn in enumerate(conexoes):
+                    flags = pedir_contadores
+                    if c > 0:
+                        halos[:g] = bordas[c - 1, 2 * p - g:]
+                        flags |= HALO_ACIMA
+                    if c < num_clientes - 1:
+                        halos[g:] = bordas[c + 1, :g]
+                        flags |= HALO_ABAIXO
+                    rastreador.contar_bytes("enviados", enviar_quadro(conn, PASSO, halos, flags=flags, valor=g))
+            # O tempo desta fase inclui o cálculo dos clientes
+            calculo = 0.0
+            with rastreador.fase("receber_bordas", geracao):
+                for c, conn in enumerate(conexoes):
+                    # Codificadas contra as bordas da troca anterior: decodifica no lugar
+                    microssegundos, recebidos = esperar_codificado(conn, RESULTADO, bordas[c], bordas[c])
+                    calculo = max(calculo, microssegundos / 1e6)
+                    rastreador.contar_bytes("recebidos", recebidos)
+            duracao_troca = time.perf_counter() - inicio_troca
+            if pedir_contadores:
+                registrar_contadores_faixas(serie, conexoes, geracao, rastreador)
+            geracao += g
+            trocas += 1
+
+            if automatico and trocas <= RODADAS_CALIBRACAO:
+                # Com k = 1: o que passa do cálculo do cliente mais lento é latência (rede + servidor)
+                latencia_calibracao += (duracao_troca - calculo) / RODADAS_CALIBRACAO
+                calculo_calibracao += calculo / maior_faixa / RODADAS_CALIBRACAO
+                if trocas == RODADAS_CALIBRACAO:
+                    k = escolher_geracoes_por_troca(latencia_calibracao, calculo_calibracao, limite)
+                    print(f"[SERVIDOR] Calibração: latência {1e6 * latencia_calibracao:.0f} µs, "
+                          f"cálculo {1e6 * calculo_calibracao:.2f} µs/linha -> k = {k} gerações por troca")
+
+        print(f"[SERVIDOR] {num_geracoes} gerações em {trocas} trocas com os clientes.")
+
+        # 4. Fim: recolhe as faixas finais direto na grade
+        grade_atual = np.zeros((tamanho, tamanho), dtype=np.int8)
+        with rastreador.fase("recolher"):
+            for conn, (linha_inicio, linha_fim) in zip(conexoes, faixas):
+                enviar_quadro(conn, FIM)
+                _, recebidos = esperar_codificado(conn, FATIA, grade_atual[linha_inicio:linha_fim])
+                rastreador.contar_bytes("recebidos", recebidos)
+                conn.close()
+
+    end_time = time.time()
+    tempo_total = end_time - start_time
+
+    salvar_tempo_em_arquivo("Distribuida (Faixas + Halo)", tempo_total)
+    rastreador.imprimir_resumo()
+    rastreador.salvar_trace(TRACE_FILE)
+
+    salvar_checkpoint(GRID_FILE, grade_atual, num_geracoes, REGRA)
+
+    print(f"\n[FIM] Servidor: Simulação concluída. Tempo: {tempo_total:.4f}s.")
+    print(f"[FIM] Grade final salva em '{GRID_FILE}'. Execute o 'analisador_final.py'.")
+    return tempo_total
+
+
+# --- MODO ASYNC: COORDENADOR asyncio COM REGISTRO DE TRABALHADORES ---
+class CoordenadorAsync:
+    """
+    Mantém o registro dos trabalhadores conectados e distribui os blocos de linhas de
+    cada geração para todos ao mesmo tempo. Cada bloco vai com uma linha de halo em
+    cima e embaixo, então qualquer trabalhador pode calculá-lo: se um trabalhador
+    estourar o tempo ou cair no meio da geração, ele sai do registro e o bloco é
+    reenviado a outro. Os trabalhadores são clientes comuns do modo 1:1.
+    """
+
+    def __init__(self, timeout=TIMEOUT_TRABALHADOR, rastreador=RASTREADOR_NULO):
+        self.timeout = timeout
+        self.rastreador = rastreador
+        self.trabalhadores = {}         # id -> (reader, writer, addr)
+        self.livres = asyncio.Queue()   # ids dos trabalhadores ociosos
+        self._ids = itertools.count()
+        self.blocos_reatribuidos = 0
+
+    async def registrar(self, reader, writer):
+        """Callback do asyncio.start_server: handshake e entrada no registro."""
+        addr = writer.get_extra_info('peername')
+        configurar_socket(writer.get_extra_info('socket'))
+        try:
+            quadro = await asyncio.wait_for(receber_quadro_async(reader), self.timeout)
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+            writer.close()
+            return
+        motivo = conferir_ola(quadro, REGRA)
+        if motivo is not None:
+            print(f"[SERVIDOR] Cliente {addr} recusado ({motivo}).", file=sys.stderr)
+            try:
+                await enviar_quadro_async(writer, RECUSADO, texto_para_payload(motivo))
+            except (ConnectionError, OSError):
+                pass
+            writer.close()
+            return
+        id_trabalhador = next(self._ids)
+        self.trabalhadores[id_trabalhador] = (reader, writer, addr)
+        self.livres.put_nowait(id_trabalhador)
+
+    def descartar(self, id_trabalhador, motivo):
+        """Remove do registro um trabalhador lento ou desconectado."""
+        reader, writer, addr = self.trabalhadores.pop(id_trabalhador)
+        writer.close()
+        print(f"[SERVIDOR] Trabalhador {addr} removido ({motivo}). Bloco será reenviado.", file=sys.stderr)
+
+    async def esperar_trabalhadores(self, quantidade):
+        """Espera até 'quantidade' trabalhadores estarem registrados."""
+        while len(self.trabalhadores) < quantidade:
+            await asyncio.sleep(0.01)
+
+    async def _trocar(self, reader, writer, bloco, linha_inicio):
+        """Uma ida e volta: PASSO com o bloco, RESULTADO com o bloco calculado."""
+        await enviar_quadro_async(writer, PASSO, bloco, valor=linha_inicio)
+        self.rastreador.contar_bytes("enviados", tamanho_quadro(bloco))
+        tipo, codigo, _, payload = await receber_quadro_async(reader)
+        if tipo != RESULTADO:
+            raise ConnectionError(f"quadro inesperado {tipo}")
+        self.rastreador.contar_bytes("recebidos", tamanho_quadro(payload))
+        # O cliente codifica o resultado contra o próprio bloco que recebeu
+        return decodificar_resultado(codigo, payload, np.empty(bloco.shape, dtype=np.int8), bloco)
+
+    async def calcular_bloco(self, grade_atual, nova_grade, linha_inicio, linha_fim):
+        """Calcula as linhas [linha_inicio, linha_fim) em algum trabalhador livre (com reenvio)."""
+        tamanho = grade_atual.shape[0]
+        topo = max(linha_inicio - 1, 0)
+        base = min(linha_fim + 1, tamanho)
+        deslocamento = linha_inicio - topo
+
+        while True:
+            try:
+                id_trabalhador = await asyncio.wait_for(self.livres.get(), self.timeout)
+            except asyncio.TimeoutError:
+                raise ConnectionError("Nenhum trabalhador disponível para continuar a simulação")
+            if id_trabalhador not in self.trabalhadores:
+                continue
+            reader, writer, _ = self.trabalhadores[id_trabalhador]
+            try:
+                resultado = await asyncio.wait_for(
+                    self._trocar(reader, writer, grade_atual[topo:base], linha_inicio), self.timeout)
+            except asyncio.TimeoutError:
+                self.descartar(id_trabalhador, "tempo esgotado")
+                self.blocos_reatribuidos += 1
+                continue
+            except (asyncio.IncompleteReadError, ConnectionError, OSError) as e:
+                self.descartar(id_trabalhador, f"conexão perdida: {e}")
+                self.blocos_reatribuidos += 1
+                continue
+
+            # As linhas de halo voltam calculadas com borda errada: só o miolo é aproveitado
+            nova_grade[linha_inicio:linha_fim] = resultado[deslocamento:deslocamento + linha_fim - linha_inicio]
+            self.livres.put_nowait(id_trabalhador)
+            return
+
+    async def encerrar(self):
+        """Envia FIM a todos os trabalhadores e fecha as conexões."""
+        for reader, writer, addr in self.trabalhadores.values():
+            try:
+                await enviar_quadro_async(writer, FIM)
+            except (ConnectionError, OSError):
+                pass
+            writer.close()
+        self.trabalhadores.clear()
+
+
+async def _simular_servidor_async(tamanho, num_geracoes, num_clientes, num_blocos, rastreador,
+                                  gravador=GRAVADOR_NULO, detector=DETECTOR_NULO, serie=SERIE_NULA):
+    grade_atual = inicializar_grade(tamanho)
+    nova_grade = np.zeros((tamanho, tamanho), dtype=np.int8)
+    blocos = dividir_faixas(tamanho, num_blocos)
+
+    coordenador = CoordenadorAsync(rastreador=rastreador)
+    servidor = await asyncio.start_server(coordenador.registrar, HOST, PORT, reuse_address=True)
+    async with servidor:
+        with rastreador.fase("aceitar"):
+            await coordenador.esperar_trabalhadores(num_clientes)
+        start_time = time.time()
+        gravador.registrar(0, grade_atual)
+        detector.observar(0, grade_atual)
+
+        for geracao in range(num_geracoes):
+            # Todos os blocos da geração em voo ao mesmo tempo
+            with rastreador.fase("geracao", geracao):
+                await asyncio.gather(*(
+                    coordenador.calcular_bloco(grade_atual, nova_grade, linha_inicio, linha_fim)
+                    for linha_inicio, linha_fim in blocos
+                ))
+            grade_atual, nova_grade = nova_grade, grade_atual
+            serie.registrar(geracao + 1, nova_grade, grade_atual)
+            talvez_salvar_checkpoint(GRID_FILE, grade_atual, geracao + 1, INTERVALO_CHECKPOINT, regra=REGRA)
+            gravador.registrar(geracao + 1, grade_atual)
+            if detector.observar(geracao + 1, grade_atual):
+                break
+
+        tempo_total = time.time() - start_time
+        await coordenador.encerrar()
+
+    if coordenador.blocos_reatribuidos:
+        print(f"[SERVIDOR] Blocos reatribuídos durante a simulação: {coordenador.blocos_reatribuidos}")
+    return grade_atual, tempo_total
+
+
+def simular_jogo_da_vida_servidor_async(tamanho, num_geracoes, num_clientes, num_blocos=None):
+    """
+    Coordenador asyncio: N trabalhadores 1:1 atendidos ao mesmo tempo, com timeout por
+    trabalhador e reenvio do bloco quando um deles cai no meio da geração.
+    """
+    num_blocos = num_blocos or num_clientes * BLOCOS_POR_CLIENTE
+    print(f"\n--- Servidor: Início da Simulação Distribuída (async, {num_clientes} clientes, {num_blocos} blocos, {num_geracoes} gerações) ---")
+
+    rastreador = criar_rastreador("servidor async", INSTRUMENTAR)
+    detector = criar_detector(DETECTAR_CICLOS)
+    with criar_gravador(ARQUIVO_HISTORICO, tamanho, tamanho, GRAVAR_HISTORICO) as gravador, \
+            criar_serie(ARQUIVO_ESTATISTICAS, ESTATISTICAS) as serie:
+        grade_atual, tempo_total = asyncio.run(_simular_servidor_async(
+            tamanho, num_geracoes, num_clientes, num_blocos, rastreador, gravador, detector, serie))
+    grade_atual = detector.avancar_ate(num_geracoes, grade_atual)
+
+    salvar_tempo_em_arquivo("Distribuida (Async)", tempo_total)
+    rastreador.imprimir_resumo()
+    rastreador.salvar_trace(TRACE_FILE)
+
+    salvar_checkpoint(GRID_FILE, grade_atual, num_geracoes, REGRA)
+
+    print(f"\n[FIM] Servidor: Simulação concluída. Tempo: {tempo_total:.4f}s.")
+    print(f"[FIM] Grade final salva em '{GRID_FILE}'. Execute o 'analisador_final.py'.")
+    return tempo_total
+
+
+def iniciar_clientes_locais(num_clientes, host=HOST, port=PORT, modo=MODO, instrumentar=INSTRUMENTAR, regra=REGRA):
+    """Lança 'num_clientes' processos cliente nesta máquina."""
+    from cliente_distribuido import cliente_worker, cliente_worker_faixas
+    alvo = cliente_worker_faixas if modo == "faixas" else cliente_worker
+    opcoes = {'instrumentar': instrumentar, 'regra': regra}
+    processos = []
+    for _ in range(num_clientes):
+        processo = mp.Process(target=alvo, args=(host, port), kwargs=opcoes, daemon=True)
+        processo.start()
+        processos.append(processo)
+    return processos
+
+
+def executar_servidor(modo=MODO, tamanho=TAMANHO_GRADE, num_geracoes=NUM_GERACOES, num_clientes=NUM_CLIENTES,
+                      iniciar_clientes=INICIAR_CLIENTES_LOCAIS):
+    """Prepara os arquivos de saída e roda o servidor no modo escolhido."""
     if os.path.exists(GRID_FILE):
         os.remove(GRID_FILE)
     
@@ -121,5 +509,22 @@ if __name__ == "__main__":
     if not os.path.exists("tempos_comparacao.txt"):
         with open("tempos_comparacao.txt", 'w') as f:
             f.write("")
-            
-    simular_jogo_da_vida_servidor(TAMANHO_GRADE, NUM_GERACOES)
+
+    if modo == "faixas":
+        # Nunca há mais faixas que linhas: só sobe clientes para as faixas que existem
+        num_clientes = len(dividir_faixas(tamanho, num_clientes))
+        if iniciar_clientes:
+            iniciar_clientes_locais(num_clientes, HOST, PORT, modo, INSTRUMENTAR, REGRA)
+        return simular_jogo_da_vida_servidor_faixas(tamanho, num_geracoes, num_clientes, GERACOES_POR_TROCA)
+    elif modo == "async":
+        if iniciar_clientes:
+            iniciar_clientes_locais(num_clientes, HOST, PORT, modo, INSTRUMENTAR, REGRA)
+        return simular_jogo_da_vida_servidor_async(tamanho, num_geracoes, num_clientes)
+    else:
+        if iniciar_clientes:
+            iniciar_clientes_locais(1, HOST, PORT, modo, INSTRUMENTAR, REGRA)
+        return simular_jogo_da_vida_servidor(tamanho, num_geracoes)
+
+
+if __name__ == "__main__":
+    executar_servidor()
@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+from checkpoint import (CABECALHOS, MAGICO, TAMANHO_CABECALHO, carregar_checkpoint, ler_bloco, ler_cabecalho,
+                        retomar_ou_inicializar, salvar_checkpoint)
+from motor_empacotado import empacotar_grade
+
+
+@pytest.fixture
+def grade():
+    return np.random.default_rng(7).integers(0, 2, size=(37, 130), dtype=np.int8)
+
+
+@pytest.mark.parametrize("empacotado", [True, False])
+def test_ida_e_volta(tmp_path, grade, empacotado):
+    arquivo = str(tmp_path / "g.ckpt")
+    salvar_checkpoint(arquivo, grade, 42, "b63/s32", empacotado=empacotado)
+    lida, cabecalho = carregar_checkpoint(arquivo)
+    np.testing.assert_array_equal(lida, grade)
+    assert (cabecalho['geracao'], cabecalho['regra']) == (42, "B36/S23")
+    np.testing.assert_array_equal(ler_bloco(arquivo, 5, 20, 60, 129), grade[5:20, 60:129])
+
+
+def test_regra_longa_sem_cortes(tmp_path, grade):
+    arquivo = str(tmp_path / "g.ckpt")
+    salvar_checkpoint(arquivo, grade, 1, "B012345678/S012345678")
+    assert ler_cabecalho(arquivo)['regra'] == "B012345678/S012345678"
+
+
+def test_le_a_versao_1(tmp_path, grade):
+    arquivo = tmp_path / "v1.ckpt"
+    cabecalho = CABECALHOS[1].pack(MAGICO, 1, 1, *grade.shape, 9, b"B3/S23")
+    arquivo.write_bytes(cabecalho + empacotar_grade(grade).tobytes())
+    assert len(cabecalho) == TAMANHO_CABECALHO
+    lida, info = carregar_checkpoint(str(arquivo))
+    np.testing.assert_array_equal(lida, grade)
+    assert (info['geracao'], info['regra']) == (9, "B3/S23")
+
+
+def test_retomada_confere_a_regra(tmp_path, grade):
+    arquivo = str(tmp_path / "g.ckpt")
+    salvar_checkpoint(arquivo, grade, 10, "B36/S23")
+    lida, geracao, regra = retomar_ou_inicializar(arquivo, 0, None, "b63/s32")
+    assert (geracao, regra) == (10, "B36/S23")
+    np.testing.assert_array_equal(lida, grade)
+    with pytest.raises(ValueError, match="B36/S23"):
+        retomar_ou_inicializar(arquivo, 0, None, "B3/S23")
+
+
+def test_sem_checkpoint_comeca_do_zero():
+    grade, geracao, regra = retomar_ou_inicializar(None, 4, lambda t: np.zeros((t, t), dtype=np.int8), "B3/S23")
+    assert grade.shape == (4, 4) and geracao == 0 and regra == "B3/S23"
@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+import ciclos
+from ciclos import DetectorCiclos
+from motor_vetorizado import proxima_geracao_vetorizada
+
+
+def pulsar():
+    grade = np.zeros((17, 17), dtype=np.int8) # Oscilador de período 3
+    for a in (2, 7, 9, 14):
+        for b in (4, 5, 6, 10, 11, 12):
+            grade[a, b] = grade[b, a] = 1
+    return grade
+
+
+def rodar(detector, grade, num_geracoes):
+    detector.observar(0, grade)
+    for geracao in range(1, num_geracoes + 1):
+        grade = proxima_geracao_vetorizada(grade, grade.shape[0])
+        if detector.observar(geracao, grade):
+            break
+    return detector.avancar_ate(num_geracoes, grade)
+
+
+def referencia(grade, num_geracoes):
+    for _ in range(num_geracoes):
+        grade = proxima_geracao_vetorizada(grade, grade.shape[0])
+    return grade
+
+
+@pytest.mark.parametrize("semente", [1, 2, 7, 9])
+def test_salto_igual_a_simular_ate_o_fim(semente):
+    grade = np.random.default_rng(semente).integers(0, 2, size=(40, 40), dtype=np.int8)
+    detector = DetectorCiclos()
+    np.testing.assert_array_equal(rodar(detector, grade, 500), referencia(grade, 500))
+    assert detector.periodo is not None
+
+
+@pytest.mark.parametrize("num_geracoes", [20, 21, 22, 23])
+def test_periodo_e_geracao_detectada(num_geracoes):
+    detector = DetectorCiclos()
+    np.testing.assert_array_equal(rodar(detector, pulsar(), num_geracoes), referencia(pulsar(), num_geracoes))
+    assert detector.periodo == 3
+    assert detector.geracao_detectada == 6 # Hash da geração 3 repete o da 0; a grade 6 confirma
+
+
+def test_periodo_acima_da_janela_nao_e_detectado():
+    detector = DetectorCiclos(periodo_maximo=2)
+    rodar(detector, pulsar(), 30)
+    assert detector.periodo is None
+
+
+def test_colisao_de_hash_nao_vira_ciclo(monkeypatch):
+    monkeypatch.setattr(ciclos, "hash_grade", lambda empacotada: 0) # Todas as grades colidem
+    grade = np.random.default_rng(7).integers(0, 2, size=(40, 40), dtype=np.int8)
+    detector = DetectorCiclos()
+    np.testing.assert_array_equal(rodar(detector, grade, 500), referencia(grade, 500))
@@ -0,0 +1,114 @@
+import socket
+import numpy as np
+import pytest
+import codificacao
+from codificacao import BITS, CRUA, ESPARSA, XOR, CodificadorResultados, decodificar_resultado
+from historico import codificar_delta
+from motor_empacotado import empacotar_grade
+from protocolo import RESULTADO, enviar_codificado, enviar_quadro, esperar_codificado
+
+CODIFICACOES = [CRUA, BITS, XOR, ESPARSA]
+
+
+def payload_na_codificacao(codigo, nova, referencia):
+    """O payload que o cliente mandaria para 'nova' se escolhesse 'codigo'."""
+    if codigo == CRUA:
+        return nova
+    if codigo == BITS:
+        return empacotar_grade(nova)
+    mudou = np.not_equal(nova, referencia)
+    if codigo == XOR:
+        return np.frombuffer(codificar_delta(empacotar_grade(mudou)), dtype=np.uint8)[np.newaxis, :]
+    return np.flatnonzero(mudou).astype('<u4')[np.newaxis, :]
+
+
+def grades(fracao_mudancas, linhas=40, colunas=70, semente=0):
+    """(referencia, nova) com ~fracao_mudancas das células trocadas; 70 colunas não fecham uma palavra de 64."""
+    rng = np.random.default_rng(semente)
+    referencia = rng.integers(0, 2, size=(linhas, colunas), dtype=np.int8)
+    nova = referencia ^ (rng.random((linhas, colunas)) < fracao_mudancas).astype(np.int8)
+    return referencia, nova
+
+
+@pytest.fixture
+def par():
+    a, b = socket.socketpair()
+    yield a, b
+    a.close()
+    b.close()
+
+
+@pytest.mark.parametrize("codigo", CODIFICACOES)
+@pytest.mark.parametrize("fracao", [0.0, 0.001, 0.02, 0.5])
+def test_ida_e_volta_pelo_socket(par, codigo, fracao):
+    a, b = par
+    referencia, nova = grades(fracao)
+    enviar_quadro(a, RESULTADO, payload_na_codificacao(codigo, nova, referencia), flags=codigo, valor=11)
+    saida = np.full_like(nova, 7)
+    valor, _ = esperar_codificado(b, RESULTADO, saida, referencia)
+    assert valor == 11
+    np.testing.assert_array_equal(saida, nova)
+
+
+@pytest.mark.parametrize("fracao", [0.0, 0.001, 0.02, 0.5])
+def test_codificador_escolhe_o_menor(par, fracao):
+    a, b = par
+    referencia, nova = grades(fracao)
+    codificador = CodificadorResultados()
+    codigo, payload = codificador.codificar(nova, referencia)
+    for outro in (BITS, XOR, ESPARSA):
+        assert payload.nbytes <= payload_na_codificacao(outro, nova, referencia).nbytes
+
+    enviar_codificado(a, RESULTADO, nova, codificador, referencia)
+    saida = np.zeros_like(nova)
+    esperar_codificado(b, RESULTADO, saida, referencia)
+    np.testing.assert_array_equal(saida, nova)
+
+
+def test_esparsa_so_enderecada_por_uint32():
+    assert codificacao.LIMITE_CELULAS_ESPARSA == np.iinfo('<u4').max + 1
+
+
+def test_faixa_grande_demais_nao_vai_em_esparsa(monkeypatch):
+    referencia, nova = grades(0.001)
+    assert CodificadorResultados().codificar(nova, referencia)[0] == ESPARSA
+    # Encolhe o limite em vez de alocar 2**32 células: a faixa passa a não caber em uint32
+    monkeypatch.setattr(codificacao, "LIMITE_CELULAS_ESPARSA", nova.size - 1)
+    codigo, payload = CodificadorResultados().codificar(nova, referencia)
+    assert codigo != ESPARSA
+    np.testing.assert_array_equal(decodificar_resultado(codigo, payload, np.zeros_like(nova), referencia), nova)
+
+
+def test_resultado_sem_mudancas(par):
+    a, b = par
+    referencia, _ = grades(0.0)
+    codificador = CodificadorResultados()
+    for _ in range(3): # Vários quadros vazios seguidos não podem dessincronizar a sessão
+        enviar_codificado(a, RESULTADO, referencia.copy(), codificador, referencia, valor=1)
+    for _ in range(3):
+        saida = np.zeros_like(referencia)
+        assert esperar_codificado(b, RESULTADO, saida, referencia)[0] == 1
+        np.testing.assert_array_equal(saida, referencia)
+    assert codificador.quadros[ESPARSA] == 3
+
+
+@pytest.mark.parametrize("codigo", [XOR, ESPARSA])
+def test_decodifica_no_lugar(codigo):
+    referencia, nova = grades(0.05)
+    saida = referencia.copy()
+    decodificar_resultado(codigo, payload_na_codificacao(codigo, nova, referencia), saida, referencia=saida)
+    np.testing.assert_array_equal(saida, nova)
+
+
+def test_sem_referencia_vai_em_bits():
+    _, nova = grades(0.5)
+    codigo, payload = CodificadorResultados().codificar(nova)
+    assert codigo == BITS
+    np.testing.assert_array_equal(decodificar_resultado(codigo, payload, np.zeros_like(nova)), nova)
+
+
+@pytest.mark.parametrize("codigo", [XOR, ESPARSA])
+def test_diferencas_exigem_referencia(codigo):
+    referencia, nova = grades(0.05)
+    with pytest.raises(ValueError):
+        decodificar_resultado(codigo, payload_na_codificacao(codigo, nova, referencia), np.zeros_like(nova))
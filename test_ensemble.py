@@ -0,0 +1,38 @@
+import numpy as np
+from ensemble import inicializar_lote, simular_lote
+from motor_vetorizado import proxima_geracao_vetorizada
+
+
+def geracao_em_que_todos_estabilizam(sementes, tamanho, num_geracoes, periodo_maximo):
+    """Referência tabuleiro a tabuleiro: a primeira geração em que todos repetem uma das anteriores."""
+    historicos = [[grade] for grade in inicializar_lote(sementes, tamanho)]
+    for geracao in range(1, num_geracoes + 1):
+        for historico in historicos:
+            historico.append(proxima_geracao_vetorizada(historico[-1], tamanho))
+        if all(any(np.array_equal(h[-1], h[-1 - p]) for p in range(1, min(periodo_maximo, geracao) + 1))
+               for h in historicos):
+            return geracao
+    return num_geracoes
+
+
+def test_lote_que_estabiliza_cedo_conta_so_as_geracoes_calculadas():
+    sementes = np.arange(8)
+    resultado = simular_lote(sementes, 8, 200, periodo_maximo=2)
+    assert resultado['periodos'].all()
+    assert resultado['geracoes_calculadas'] == geracao_em_que_todos_estabilizam(sementes, 8, 200, 2)
+    assert resultado['geracoes_calculadas'] < 200
+    assert resultado['populacoes'].shape == (8, 201)
+
+
+def test_lote_que_nao_estabiliza_calcula_todas():
+    resultado = simular_lote(np.arange(4), 40, 10)
+    assert resultado['geracoes_calculadas'] == 10
+
+
+def test_curvas_iguais_a_simular_cada_tabuleiro():
+    sementes = np.arange(5)
+    resultado = simular_lote(sementes, 8, 60)
+    for i, grade in enumerate(inicializar_lote(sementes, 8)):
+        for geracao in range(61):
+            assert resultado['populacoes'][i, geracao] == grade.sum()
+            grade = proxima_geracao_vetorizada(grade, 8)
@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+from estatisticas import (ContagemFaixa, SerieEstatisticas, arquivo_atividade, contar_transicao, juntar_faixas,
+                          ler_estatisticas, linha_da_faixa)
+from motor_vetorizado import calcular_faixa_vetorizada
+from motores import obter_motor
+
+
+def sopa(linhas, colunas, semente=0):
+    return np.random.default_rng(semente).integers(0, 2, size=(linhas, colunas), dtype=np.int8)
+
+
+@pytest.mark.parametrize("calculadas, janela", [((0, 700), (0, 700)), ((13, 600), (40, 590)), ((3, 47), (3, 47))])
+def test_contagem_faixa_igual_a_comparar_as_grades(calculadas, janela):
+    grade = sopa(700, 530)
+    nova = np.zeros_like(grade)
+    contagem = ContagemFaixa(*janela, grade.shape[1], tamanho_bloco=128)
+    calcular_faixa_vetorizada(grade, nova, *calculadas, contagem=contagem)
+    esperado = contar_transicao(grade[slice(*janela)], nova[slice(*janela)], 128)
+    obtido = contagem.concluir()
+    assert obtido[:3] == esperado[:3]
+    np.testing.assert_array_equal(obtido[3], esperado[3])
+    assert contagem.concluir()[:3] == (0, 0, 0) # Zerada para a próxima geração
+
+
+@pytest.mark.parametrize("motor, regra", [("vetorizado", "B3/S23"), ("vetorizado", "B36/S23"), ("blocos", "B3/S23"),
+                                          ("tabela", "B2/S")])
+def test_contadores_dos_motores(motor, regra):
+    calcular = obter_motor(motor, regra)
+    calcular.ativar_contadores()
+    grade = sopa(300, 270, 1)
+    for _ in range(6):
+        nova = calcular(grade, grade.shape[0]).copy()
+        esperado = contar_transicao(grade, nova)
+        assert calcular.contadores[:3] == esperado[:3]
+        assert calcular.contadores[3].sum() == esperado[3].sum()
+        grade = nova
+
+
+def test_juntar_faixas():
+    grade = sopa(90, 300, 2)
+    nova = obter_motor("vetorizado")(grade, 90)
+    linhas = []
+    for inicio, fim in [(0, 40), (40, 90)]:
+        contagem = ContagemFaixa(inicio, fim, 300)
+        calcular_faixa_vetorizada(grade, np.zeros_like(grade), inicio, fim, contagem=contagem)
+        linhas.append(linha_da_faixa(contagem.concluir()))
+    populacao, nascimentos, mortes, atividade = juntar_faixas(linhas)
+    assert (populacao, nascimentos, mortes) == contar_transicao(grade, nova)[:3]
+    assert atividade.shape == (2, 2)
+
+
+@pytest.mark.parametrize("extensao", [".csv", ".bin"])
+def test_serie_ida_e_volta(tmp_path, extensao):
+    nome = str(tmp_path / ("serie" + extensao))
+    grade = sopa(64, 64, 3)
+    calcular = obter_motor("vetorizado")
+    esperado = []
+    with SerieEstatisticas(nome) as serie:
+        serie.acompanhar(calcular)
+        for geracao in range(1, 6):
+            nova = calcular(grade, 64)
+            serie.registrar(geracao, grade, nova, calcular)
+            esperado.append(contar_transicao(grade, nova)[:3])
+            grade = nova
+    lida = ler_estatisticas(nome)
+    np.testing.assert_array_equal(lida['geracao'], np.arange(1, 6))
+    np.testing.assert_array_equal(np.stack([lida['populacao'], lida['nascimentos'], lida['mortes']], axis=1), esperado)
+    assert np.load(arquivo_atividade(nome)).sum() == lida['nascimentos'].sum() + lida['mortes'].sum()
@@ -0,0 +1,88 @@
+import pytest
+import autoajuste
+import jogo_da_vida
+
+
+@pytest.fixture
+def chamadas(monkeypatch):
+    """Troca os executores da CLI por um registro do que seria rodado."""
+    registro = []
+    for nome in ("executar_sequencial", "executar_threads", "executar_processos"):
+        monkeypatch.setattr(jogo_da_vida, nome, lambda args, *config, nome=nome: registro.append((nome, config)))
+    return registro
+
+
+@pytest.fixture
+def perfil(tmp_path):
+    """Perfil desta máquina com a faixa de 100 (até 128) já medida."""
+    medicoes = [
+        {'modo': "sequencial", 'motor': "vetorizado", 'tamanho_bloco': None, 'ns_por_celula': 3.0},
+        {'modo': "sequencial", 'motor': "blocos", 'tamanho_bloco': 256, 'ns_por_celula': 2.0},
+        {'modo': "threads", 'motor': "vetorizado", 'trabalhadores': 4, 'escalonamento': "faixas", 'ns_por_celula': 1.5},
+        {'modo': "processos", 'trabalhadores': 2, 'ns_por_celula': 1.0},
+    ]
+    arquivo = str(tmp_path / "perfil.json")
+    perfil = autoajuste.carregar_perfil(arquivo)
+    perfil['configuracoes'][autoajuste.chave_perfil(100, "B3/S23")] = {**medicoes[-1], 'medicoes': medicoes}
+    autoajuste.salvar_perfil(perfil, arquivo)
+    return arquivo
+
+
+def rodar(*argv):
+    assert jogo_da_vida.main(list(argv)) == 0
+
+
+def test_sem_perfil_valem_os_padroes(chamadas, tmp_path):
+    sem_perfil = str(tmp_path / "nao_existe.json")
+    rodar("sequencial", "--perfil", sem_perfil)
+    rodar("sequencial", "--perfil", sem_perfil, "--regra", "B36/S23")
+    rodar("paralelo", "--perfil", sem_perfil)
+    rodar("paralelo", "--perfil", sem_perfil, "--processos")
+    assert chamadas == [
+        ("executar_sequencial", ("vetorizado", None)),
+        ("executar_sequencial", ("tabela", None)),
+        ("executar_threads", (None, "vetorizado", "roubo")),
+        ("executar_processos", (None,)),
+    ]
+    assert not (tmp_path / "nao_existe.json").exists()
+
+
+def test_perfil_e_o_padrao(chamadas, perfil):
+    rodar("sequencial", "--perfil", perfil)
+    rodar("paralelo", "--perfil", perfil)
+    rodar("paralelo", "--perfil", perfil, "--processos")
+    rodar("auto", "--perfil", perfil)
+    assert chamadas == [
+        ("executar_sequencial", ("blocos", 256)),
+        ("executar_threads", (4, "vetorizado", "faixas")),
+        ("executar_processos", (2,)),
+        ("executar_processos", (2,)),
+    ]
+
+
+def test_opcoes_explicitas_vencem_o_perfil(chamadas, perfil):
+    rodar("sequencial", "--perfil", perfil, "--motor", "classico")
+    rodar("paralelo", "--perfil", perfil, "--motor", "tabela", "--trabalhadores", "3")
+    rodar("paralelo", "--perfil", perfil, "--escalonamento", "roubo")
+    rodar("paralelo", "--perfil", perfil, "--processos", "--trabalhadores", "5")
+    assert chamadas == [
+        ("executar_sequencial", ("classico", None)),
+        ("executar_threads", (3, "tabela", "faixas")),
+        ("executar_threads", (4, "vetorizado", "roubo")),
+        ("executar_processos", (5,)),
+    ]
+
+
+def test_perfil_de_outra_faixa_nao_vale(chamadas, perfil):
+    rodar("sequencial", "--perfil", perfil, "--tamanho", "1000")
+    assert chamadas == [("executar_sequencial", ("vetorizado", None))]
+
+
+def test_auto_sequencial_avisa_que_nao_instrumenta(chamadas, monkeypatch, capsys):
+    sequencial = {'modo': "sequencial", 'motor': "blocos", 'tamanho_bloco': 256}
+    monkeypatch.setattr(autoajuste, "obter_configuracao", lambda *args: sequencial)
+    rodar("auto")
+    assert "--instrumentar" not in capsys.readouterr().out
+    rodar("auto", "--instrumentar")
+    assert "--instrumentar não tem efeito" in capsys.readouterr().out
+    assert chamadas == [("executar_sequencial", ("blocos", 256))] * 2
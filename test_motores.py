@@ -0,0 +1,98 @@
+import numpy as np
+import pytest
+from cliente_distribuido import calcular_proxima_geracao
+from jogo_da_vida_sequencial import proxima_geracao
+from motor_hashlife import simular_hashlife
+from motor_vetorizado import contar_vizinhos_vetorizado, proxima_geracao_vetorizada
+from motores import MOTORES, MOTORES_COM_BLOCO, MOTORES_COM_REGRA, obter_motor
+from regras import interpretar_regra, tabela_para
+
+FORMAS = [(1, 1), (3, 3), (64, 64), (100, 100), (130, 130), (37, 90), (90, 37)]
+
+
+def sopa(forma, densidade=0.5, semente=0):
+    return (np.random.default_rng(semente).random(forma) < densidade).astype(np.int8)
+
+
+def regra_celula_a_celula(grade, regra):
+    """Referência direta da regra B/S: conjuntos de nascimento e sobrevivência sobre a contagem."""
+    nascimento, sobrevivencia = interpretar_regra(regra)
+    vivos = contar_vizinhos_vetorizado(grade)
+    nasce = np.isin(vivos, list(nascimento)) & (grade == 0)
+    sobrevive = np.isin(vivos, list(sobrevivencia)) & (grade == 1)
+    return (nasce | sobrevive).astype(np.int8)
+
+
+@pytest.mark.parametrize("forma", [(1, 1), (3, 3), (20, 20), (9, 23)])
+def test_vetorizado_igual_ao_laco_classico(forma):
+    for semente in range(3):
+        grade = sopa(forma, semente=semente)
+        esperado = proxima_geracao_vetorizada(grade, forma[0])
+        if forma[0] == forma[1]:
+            np.testing.assert_array_equal(proxima_geracao(grade, forma[0]), esperado)
+        np.testing.assert_array_equal(calcular_proxima_geracao(grade, forma[0]), esperado)
+
+
+def test_padroes_conhecidos():
+    grade = np.zeros((5, 5), dtype=np.int8)
+    grade[2, 1:4] = 1 # Pisca-pisca
+    vertical = proxima_geracao_vetorizada(grade, 5)
+    assert vertical[1:4, 2].all() and vertical.sum() == 3
+    np.testing.assert_array_equal(proxima_geracao_vetorizada(vertical, 5), grade)
+    bloco = np.zeros((4, 4), dtype=np.int8)
+    bloco[1:3, 1:3] = 1
+    np.testing.assert_array_equal(proxima_geracao_vetorizada(bloco, 4), bloco)
+    canto = np.ones((2, 2), dtype=np.int8) # Borda fixa: o bloco no canto também é estável
+    np.testing.assert_array_equal(proxima_geracao_vetorizada(canto, 2), canto)
+
+
+@pytest.mark.parametrize("nome", sorted(MOTORES))
+@pytest.mark.parametrize("forma", FORMAS)
+@pytest.mark.parametrize("densidade", [0.1, 0.5])
+def test_motor_igual_ao_vetorizado(nome, forma, densidade):
+    calcular = obter_motor(nome)
+    grade = sopa(forma, densidade, semente=forma[0] * forma[1])
+    for _ in range(8): # Vários passos: os motores com estado reaproveitam buffers e blocos ativos
+        esperado = proxima_geracao_vetorizada(grade, forma[0])
+        obtido = calcular(grade, forma[0]).copy()
+        np.testing.assert_array_equal(obtido, esperado)
+        grade = obtido
+
+
+@pytest.mark.parametrize("nome", MOTORES_COM_BLOCO)
+@pytest.mark.parametrize("tamanho_bloco", [16, 50, 256])
+def test_lado_do_bloco_nao_muda_o_resultado(nome, tamanho_bloco):
+    calcular = obter_motor(nome, tamanho_bloco=tamanho_bloco)
+    grade = sopa((130, 97), semente=3)
+    for _ in range(5):
+        esperado = proxima_geracao_vetorizada(grade, 130)
+        grade = calcular(grade, 130).copy()
+        np.testing.assert_array_equal(grade, esperado)
+
+
+@pytest.mark.parametrize("nome", MOTORES_COM_REGRA)
+@pytest.mark.parametrize("regra", ["B3/S23", "B36/S23", "B2/S", "B/S012345678", "B1357/S1357"])
+def test_regras_igual_a_referencia(nome, regra):
+    calcular = obter_motor(nome, regra)
+    grade = sopa((70, 45), semente=5)
+    for _ in range(6):
+        esperado = regra_celula_a_celula(grade, regra)
+        np.testing.assert_array_equal(calcular(grade, 70), esperado)
+        np.testing.assert_array_equal(proxima_geracao_vetorizada(grade, 70, tabela_para(regra)), esperado)
+        grade = esperado
+
+
+@pytest.mark.parametrize("nome", sorted(set(MOTORES) - set(MOTORES_COM_REGRA)))
+def test_motores_fixos_recusam_outras_regras(nome):
+    with pytest.raises(ValueError, match="B3/S23"):
+        obter_motor(nome, "B36/S23")
+
+
+def test_hashlife_longe_da_borda():
+    grade = np.zeros((128, 128), dtype=np.int8)
+    grade[40:60, 40:60] = sopa((20, 20), semente=9) # Fica longe da borda nas gerações medidas
+    esperado = grade
+    for _ in range(16):
+        esperado = proxima_geracao_vetorizada(esperado, 128)
+    obtido, _ = simular_hashlife(grade, 16)
+    np.testing.assert_array_equal(obtido, esperado)
@@ -0,0 +1,80 @@
+import threading
+import multiprocessing
+import time
+import numpy as np
+import pytest
+import jogo_da_vida_paralelo
+import jogo_da_vida_processos
+from jogo_da_vida_paralelo import PoolThreads
+from jogo_da_vida_processos import PoolProcessos
+from motor_vetorizado import proxima_geracao_vetorizada
+
+
+def sopa(tamanho=48, semente=0):
+    return np.random.default_rng(semente).integers(0, 2, size=(tamanho, tamanho), dtype=np.int8)
+
+
+def falhar(*args, **kwargs):
+    raise ValueError("falha no cálculo")
+
+
+@pytest.mark.parametrize("escalonamento", ["faixas", "roubo"])
+def test_threads_avancam_como_o_vetorizado(escalonamento):
+    grade = sopa()
+    with PoolThreads(grade, 3, escalonamento=escalonamento) as pool:
+        for _ in range(5):
+            pool.passo()
+            grade = proxima_geracao_vetorizada(grade, grade.shape[0])
+            np.testing.assert_array_equal(pool.grade, grade)
+
+
+@pytest.mark.parametrize("escalonamento", ["faixas", "roubo"])
+def test_falha_numa_thread_chega_ao_passo(monkeypatch, escalonamento):
+    with PoolThreads(sopa(), 3, escalonamento=escalonamento) as pool:
+        pool.passo()
+        monkeypatch.setattr(jogo_da_vida_paralelo, "calcular_faixa_vetorizada", falhar)
+        if pool.escalonador is not None:
+            monkeypatch.setattr(pool.escalonador, "executar", falhar)
+        with pytest.raises(ValueError, match="falha no cálculo"):
+            pool.passo()
+    assert all(not thread.is_alive() for thread in threading.enumerate() if thread.daemon)
+
+
+def test_thread_lenta_estoura_o_timeout(monkeypatch):
+    monkeypatch.setattr(jogo_da_vida_paralelo, "TIMEOUT_BARREIRA", 0.2)
+    liberar = threading.Event()
+    with PoolThreads(sopa(), 2, escalonamento="roubo") as pool:
+        monkeypatch.setattr(pool.escalonador, "executar", lambda *args: liberar.wait(5))
+        with pytest.raises(threading.BrokenBarrierError):
+            pool.passo()
+        liberar.set()
+
+
+def test_processos_avancam_como_o_vetorizado():
+    grade = sopa()
+    with PoolProcessos(grade, 2) as pool:
+        for _ in range(5):
+            pool.passo()
+            grade = proxima_geracao_vetorizada(grade, grade.shape[0])
+            np.testing.assert_array_equal(pool.grade, grade)
+
+
+# Os trabalhadores herdam o módulo alterado pelo monkeypatch só quando nascem por fork
+so_fork = pytest.mark.skipif(multiprocessing.get_start_method() != "fork", reason="precisa do início por fork")
+
+
+@so_fork
+def test_falha_num_processo_chega_ao_passo(monkeypatch):
+    monkeypatch.setattr(jogo_da_vida_processos, "calcular_faixa_vetorizada", falhar)
+    with PoolProcessos(sopa(), 2) as pool:
+        with pytest.raises(RuntimeError, match="processo trabalhador"):
+            pool.passo()
+
+
+@so_fork
+def test_processo_lento_estoura_o_timeout(monkeypatch):
+    monkeypatch.setattr(jogo_da_vida_processos, "TIMEOUT_BARREIRA", 0.5)
+    monkeypatch.setattr(jogo_da_vida_processos, "calcular_faixa_vetorizada", lambda *args: time.sleep(5))
+    with PoolProcessos(sopa(), 2) as pool:
+        with pytest.raises(RuntimeError, match="processo trabalhador"):
+            pool.passo()
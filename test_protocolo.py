@@ -0,0 +1,124 @@
+import asyncio
+import socket
+import numpy as np
+import pytest
+from protocolo import (CABECALHO, DTYPES, INICIO, OLA, RECUSADO, RESULTADO, VERSAO, conferir_ola, enviar_ola,
+                       enviar_quadro, enviar_quadro_async, esperar_quadro, receber_quadro, receber_quadro_async,
+                       texto_para_payload)
+
+
+@pytest.fixture
+def par():
+    a, b = socket.socketpair()
+    yield a, b
+    a.close()
+    b.close()
+
+
+class EscritorFalso:
+    """Só o que 'enviar_quadro_async' usa de um StreamWriter."""
+
+    def __init__(self):
+        self.dados = bytearray()
+
+    def write(self, dados):
+        self.dados += dados
+
+    async def drain(self):
+        pass
+
+
+def receber_async(dados):
+    async def ler():
+        reader = asyncio.StreamReader()
+        reader.feed_data(bytes(dados))
+        reader.feed_eof()
+        return await receber_quadro_async(reader)
+    return asyncio.run(ler())
+
+
+@pytest.mark.parametrize("dtype", [d for d in DTYPES.values() if d is not None])
+def test_ida_e_volta_de_cada_dtype(par, dtype):
+    a, b = par
+    array = np.arange(3 * 7, dtype=dtype).reshape(3, 7)
+    enviados = enviar_quadro(a, RESULTADO, array, flags=5, valor=2**40)
+    assert enviados == CABECALHO.size + array.nbytes
+    tipo, flags, valor, recebido = receber_quadro(b)
+    assert (tipo, flags, valor) == (RESULTADO, 5, 2**40)
+    assert recebido.dtype == dtype
+    np.testing.assert_array_equal(recebido, array)
+
+
+def test_quadro_so_com_cabecalho(par):
+    a, b = par
+    enviar_quadro(a, INICIO, flags=3, valor=9)
+    assert receber_quadro(b) == (INICIO, 3, 9, None)
+
+
+def test_payload_vazio_vai_so_com_cabecalho(par):
+    a, b = par
+    vazio = np.empty((1, 0), dtype='<u4')
+    assert enviar_quadro(a, RESULTADO, vazio) == CABECALHO.size
+    enviar_quadro(a, INICIO) # O próximo quadro não pode ser lido como payload do anterior
+    _, _, _, recebido = esperar_quadro(b, RESULTADO)
+    assert recebido.shape == (1, 0) and recebido.dtype == np.dtype('<u4')
+    assert receber_quadro(b)[0] == INICIO
+
+
+def test_recebe_na_saida_dada(par):
+    a, b = par
+    saida = np.zeros((4, 5), dtype=np.int8)
+    enviar_quadro(a, RESULTADO, np.ones((4, 5), dtype=np.int8))
+    _, _, _, recebido = receber_quadro(b, saida)
+    assert recebido is saida and saida.all()
+
+
+def test_conexao_fechada(par):
+    a, b = par
+    a.close()
+    assert receber_quadro(b) is None
+    with pytest.raises(ConnectionError):
+        esperar_quadro(b, RESULTADO)
+
+
+@pytest.mark.parametrize("array", [np.arange(12, dtype=np.uint8).reshape(3, 4), np.empty((1, 0), dtype='<u4')])
+def test_ida_e_volta_async(array):
+    escritor = EscritorFalso()
+    asyncio.run(enviar_quadro_async(escritor, RESULTADO, array, flags=2, valor=7))
+    tipo, flags, valor, recebido = receber_async(escritor.dados)
+    assert (tipo, flags, valor) == (RESULTADO, 2, 7)
+    assert recebido.shape == array.shape and recebido.dtype == array.dtype
+    np.testing.assert_array_equal(recebido, array)
+
+
+def test_formatos_sincrono_e_async_iguais(par):
+    a, b = par
+    array = np.arange(6, dtype=np.int8).reshape(2, 3)
+    escritor = EscritorFalso()
+    asyncio.run(enviar_quadro_async(escritor, RESULTADO, array))
+    enviar_quadro(a, RESULTADO, array)
+    assert b.recv(len(escritor.dados) + 1) == bytes(escritor.dados)
+
+
+def test_ola_leva_a_regra(par):
+    a, b = par
+    enviar_ola(a, "b63/s32")
+    quadro = receber_quadro(b)
+    assert conferir_ola(quadro, "B36/S23") is None
+    assert "B3/S23" in conferir_ola(quadro, "B3/S23")
+
+
+def test_ola_de_outra_versao_ou_sem_regra(par):
+    a, b = par
+    enviar_quadro(a, OLA, valor=VERSAO - 1)
+    assert "protocolo" in conferir_ola(receber_quadro(b), "B3/S23")
+    enviar_quadro(a, OLA, valor=VERSAO)
+    assert conferir_ola(receber_quadro(b), "B3/S23") is not None
+    assert conferir_ola(None, "B3/S23") is not None
+
+
+def test_recusa_chega_como_erro(par):
+    a, b = par
+    enviar_quadro(a, RECUSADO, texto_para_payload("regra errada"))
+    with pytest.raises(ConnectionError, match="regra errada"):
+        receber_quadro(b)
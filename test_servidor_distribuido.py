@@ -0,0 +1,65 @@
+import socket
+import numpy as np
+import pytest
+import servidor_distribuido
+from checkpoint import carregar_checkpoint
+from motor_vetorizado import proxima_geracao_vetorizada
+from regras import tabela_para
+
+TAMANHO = 60
+GERACOES = 23 # Não é múltiplo de k: a última rodada avança menos gerações
+
+
+def porta_livre():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+@pytest.fixture
+def servidor(tmp_path, monkeypatch):
+    """Servidor com clientes locais numa porta própria, gravando tudo num diretório temporário."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(servidor_distribuido, "PORT", porta_livre())
+    return servidor_distribuido
+
+
+def rodar_e_comparar(servidor, modo, num_clientes, regra="B3/S23", tamanho=TAMANHO):
+    np.random.seed(11)
+    grade = servidor.inicializar_grade(tamanho)
+    np.random.seed(11) # O servidor sorteia a mesma grade inicial
+    servidor.executar_servidor(modo, tamanho, GERACOES, num_clientes)
+    for _ in range(GERACOES):
+        grade = proxima_geracao_vetorizada(grade, tamanho, tabela_para(regra))
+    final, cabecalho = carregar_checkpoint(servidor.GRID_FILE)
+    np.testing.assert_array_equal(final, grade)
+    assert cabecalho['geracao'] == GERACOES
+
+
+@pytest.mark.parametrize("geracoes_por_troca", [1, 2, 5, 0])
+def test_faixas_com_k_geracoes_por_troca_igual_ao_sequencial(servidor, monkeypatch, geracoes_por_troca):
+    monkeypatch.setattr(servidor, "GERACOES_POR_TROCA", geracoes_por_troca)
+    rodar_e_comparar(servidor, "faixas", 3)
+
+
+def test_faixas_com_outra_regra(servidor, monkeypatch):
+    monkeypatch.setattr(servidor, "GERACOES_POR_TROCA", 4)
+    monkeypatch.setattr(servidor, "REGRA", "B36/S23")
+    rodar_e_comparar(servidor, "faixas", 2, "B36/S23")
+
+
+def test_faixas_com_mais_clientes_que_linhas(servidor, monkeypatch):
+    lancados = []
+    iniciar = servidor.iniciar_clientes_locais
+    def espiao(num_clientes, *args):
+        lancados.append(num_clientes)
+        return iniciar(num_clientes, *args)
+    monkeypatch.setattr(servidor, "iniciar_clientes_locais", espiao)
+    # 6 clientes para 4 linhas: só 4 faixas existem, e nenhum cliente sobra esperando
+    rodar_e_comparar(servidor, "faixas", 6, tamanho=4)
+    assert lancados == [4]
+
+
+@pytest.mark.parametrize("modo, num_clientes", [("async", 3), ("1:1", 1)])
+def test_outros_modos_igual_ao_sequencial(servidor, modo, num_clientes):
+    rodar_e_comparar(servidor, modo, num_clientes)